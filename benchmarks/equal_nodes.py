@@ -0,0 +1,63 @@
+"""
+Measure how long :func:`~testfixtures.compare` spends on parts of large, nested
+structures that turn out to be equal.
+
+When two containers aren't equal as a whole, or have no ``__eq__`` of their own,
+every element within them is handed off for comparison, even though almost all of
+those elements are usually equal. Each scenario here has a single difference at the
+end of a large structure, so the time taken is dominated by elements that are equal,
+which should cost little more than checking their equality.
+
+Run with::
+
+  python benchmarks/equal_nodes.py
+"""
+from argparse import ArgumentParser
+from timeit import repeat
+from typing import Any, Callable
+
+from testfixtures import compare
+from testfixtures.comparers import RenderLimits
+
+
+def rows(size: int, last: Any) -> list[dict[str, Any]]:
+    rows: list[dict[str, Any]] = [
+        {'id': i, 'name': f'name {i}', 'values': [i, i + 1, i + 2]} for i in range(size)
+    ]
+    rows[-1]['values'][-1] = last
+    return rows
+
+
+def scenarios(size: int) -> dict[str, Callable[[], Any]]:
+    # Keep the failure messages small, so the timings are dominated by comparing
+    # the elements rather than describing the difference:
+    limits = RenderLimits(max_items=5)
+    x_rows, y_rows = rows(size, 'x'), rows(size, 'y')
+    x_ints, y_ints = [*range(size), 'x'], [*range(size), 'y']
+    x_mapping = {f'key {i}': i for i in range(size)}
+    y_mapping = {**x_mapping, f'key {size}': size}
+    return {
+        'ints': lambda: compare(x_ints, y_ints, raises=False, render_limits=limits),
+        'dicts': lambda: compare(x_rows, y_rows, raises=False, render_limits=limits),
+        'strict dicts': lambda: compare(
+            x_rows, y_rows, raises=False, render_limits=limits, strict=True
+        ),
+        'dict values': lambda: compare(
+            x_mapping, y_mapping, raises=False, render_limits=limits
+        ),
+    }
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--size', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    for name, scenario in scenarios(args.size).items():
+        best = min(repeat(scenario, number=1, repeat=args.repeat))
+        print(f'{name + ":":15} {best * 1000:8.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Measure how long ``import testfixtures`` takes in a fresh interpreter.
+
+The comparers for numpy, pandas, polars, Arrow and Django are only registered once
+those libraries have been imported, so ``import testfixtures`` on its own should
+be much cheaper than importing it alongside all of them, which is what
+registering them eagerly used to cost.
+
+Run with::
+
+  python benchmarks/startup.py
+"""
+import sys
+from argparse import ArgumentParser
+from importlib.util import find_spec
+from statistics import median
+from subprocess import check_output
+
+OPTIONAL_LIBRARIES = 'numpy', 'pandas', 'polars', 'pyarrow', 'django.db.models'
+
+TIMING = '''
+from time import perf_counter
+start = perf_counter()
+{imports}
+print(perf_counter() - start)
+'''
+
+
+def time_imports(*modules: str, repeat: int) -> float:
+    source = TIMING.format(imports='\n'.join(f'import {m}' for m in modules))
+    if 'django.db.models' in modules:
+        source = 'import django\nfrom django.conf import settings\nsettings.configure()\n' + source
+    return median(
+        float(check_output([sys.executable, '-c', source]))
+        for _ in range(repeat)
+    )
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    installed = [m for m in OPTIONAL_LIBRARIES if find_spec(m.split('.')[0]) is not None]
+    alone = time_imports('testfixtures', repeat=args.repeat)
+    eager = time_imports(*installed, 'testfixtures', repeat=args.repeat)
+    print(f'import testfixtures:                  {alone * 1000:8.1f}ms')
+    print(f'import testfixtures + {len(installed)} libraries: {eager * 1000:8.1f}ms')
+    print(f'saving when libraries are unused:     {(eager - alone) * 1000:8.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,257 @@
+"""
+Time :func:`~testfixtures.compare` across a range of large values, both equal and
+unequal, and check the timings against stored baselines.
+
+Timings are divided by the time taken by a fixed, pure Python calibration loop, so that
+baselines recorded on one machine remain roughly meaningful on another. Scenarios for
+attrs, numpy, pandas and polars are skipped if those libraries aren't installed.
+
+Run with::
+
+  python benchmarks/suite.py
+
+Record new baselines after an intentional change in performance with::
+
+  python benchmarks/suite.py --save
+
+Fail if any scenario has become more than 20% slower than its baseline with::
+
+  python benchmarks/suite.py --check --threshold 0.2
+"""
+import json
+import sys
+from argparse import ArgumentParser
+from collections import namedtuple
+from dataclasses import dataclass
+from importlib.util import find_spec
+from pathlib import Path
+from timeit import repeat
+from typing import Any, Callable, NamedTuple
+
+from testfixtures import MappingComparison, SequenceComparison, compare
+from testfixtures.comparers import RenderLimits
+from testfixtures.mock import call
+
+BASELINES = Path(__file__).with_name('baselines.json')
+
+Point = namedtuple('Point', 'x y z')
+
+
+@dataclass
+class Record:
+    id: int
+    name: str
+    values: list[int]
+
+
+# Records with the same fields declared in different ways, which are compared strictly
+# so that each record is compared field by field:
+
+class PlainRow:
+    def __init__(self, id: int, name: str, score: float) -> None:
+        self.id, self.name, self.score = id, name, score
+
+
+@dataclass
+class DataclassRow:
+    id: int
+    name: str
+    score: float
+
+
+@dataclass(slots=True)
+class SlottedRow:
+    id: int
+    name: str
+    score: float
+
+
+class NamedTupleRow(NamedTuple):
+    id: int
+    name: str
+    score: float
+
+
+def calibration() -> None:
+    total = 0
+    for i in range(200_000):
+        total += i % 7
+    {str(i): i for i in range(20_000)}
+
+
+def pair(make: Callable[[int], Any], size: int, change: Callable[[Any], None]) -> tuple[Any, Any]:
+    x, y = make(size), make(size)
+    change(y)
+    return x, y
+
+
+def scenarios(size: int) -> dict[str, Callable[[], Any]]:
+    # Keep the failure messages small, so the timings are dominated by comparing
+    # the values rather than describing the difference:
+    limits = RenderLimits(max_items=5, max_chars=1000)
+
+    def equal(x: Any, y: Any, **kw: Any) -> Callable[[], Any]:
+        return lambda: compare(x, y, **kw)
+
+    def unequal(x: Any, y: Any, **kw: Any) -> Callable[[], Any]:
+        return lambda: compare(x, y, raises=False, render_limits=limits, **kw)
+
+    def last(obj: Any, value: Any) -> None:
+        obj[-1] = value
+
+    dicts = lambda n: {f'key {i}': i for i in range(n)}
+    lists = lambda n: list(range(n))
+    json_ = lambda n: {'rows': [
+        {'id': i, 'name': f'name {i}', 'tags': ['a', 'b'], 'meta': {'score': i / 3}}
+        for i in range(n)
+    ]}
+    points = lambda n: [Point(i, i + 1, i + 2) for i in range(n)]
+    records = lambda n: [Record(i, f'name {i}', [i, i + 1]) for i in range(n)]
+    text = lambda n: '\n'.join(f'line {i}: some text' for i in range(n))
+    sets = lambda n: set(range(n))
+    calls = lambda n: [call.method(i, key=f'value {i}') for i in range(n)]
+
+    def change_dict(d: dict) -> None:
+        d['key 0'] = -1
+
+    def change_json(d: dict) -> None:
+        d['rows'][-1]['meta']['score'] = -1
+
+    def change_text(t: str) -> str:
+        return t.replace(f'line {size - 1}:', 'changed:')
+
+    def change_set(s: set) -> None:
+        s.discard(0)
+        s.add(-1)
+
+    result: dict[str, Callable[[], Any]] = {
+        'dict equal': equal(*pair(dicts, size, lambda d: None), strict=True),
+        'dict unequal': unequal(*pair(dicts, size, change_dict)),
+        'list equal': equal(*pair(lists, size, lambda d: None), strict=True),
+        'list unequal': unequal(*pair(lists, size, lambda l: last(l, -1))),
+        'json equal': equal(*pair(json_, size, lambda d: None), strict=True),
+        'json unequal': unequal(*pair(json_, size, change_json), strict=True),
+        'namedtuple unequal': unequal(*pair(
+            points, size, lambda l: last(l, Point(0, 0, 0))
+        )),
+        'dataclass equal': equal(*pair(records, size, lambda d: None)),
+        'dataclass unequal': unequal(*pair(
+            records, size, lambda l: last(l, Record(-1, '', []))
+        )),
+        'text unequal': unequal(text(size), change_text(text(size))),
+        'set unequal': unequal(*pair(sets, size, change_set)),
+        'call list unequal': unequal(*pair(
+            calls, size, lambda l: last(l, call.method(-1))
+        )),
+        'SequenceComparison ordered': equal(
+            SequenceComparison(*lists(size)), lists(size)
+        ),
+        'SequenceComparison unordered': equal(
+            SequenceComparison(*lists(size), ordered=False), lists(size)[::-1]
+        ),
+        'MappingComparison partial': equal(
+            MappingComparison(dicts(size // 2), partial=True), dicts(size)
+        ),
+    }
+
+    rows: dict[str, Callable[..., Any]] = {
+        'plain class': PlainRow,
+        'dataclass': DataclassRow,
+        'slotted dataclass': SlottedRow,
+        'namedtuple': NamedTupleRow,
+    }
+    if find_spec('attrs') is not None:
+        import attrs
+
+        @attrs.define
+        class AttrsRow:
+            id: int
+            name: str
+            score: float
+
+        rows['attrs'] = AttrsRow
+
+    for row_name, row in rows.items():
+        result[f'{row_name} rows unequal'] = unequal(*pair(
+            lambda n, row=row: [row(i, f'name {i}', i / 3) for i in range(n)],
+            size,
+            lambda l, row=row: last(l, row(size - 1, f'name {size - 1}', -1.0)),
+        ), strict=True)
+
+    if find_spec('numpy') is not None:
+        import numpy as np
+        array_x, array_y = np.arange(size * 100), np.arange(size * 100)
+        array_z = array_y.copy()
+        array_z[-1] = -1
+        result['ndarray equal'] = equal(array_x, array_y)
+        result['ndarray unequal'] = unequal(array_x, array_z)
+
+    if find_spec('pandas') is not None:
+        import pandas as pd
+        frame_x = pd.DataFrame({'a': range(size * 10), 'b': [float(i) for i in range(size * 10)]})
+        frame_y = frame_x.copy()
+        frame_z = frame_x.copy()
+        frame_z.loc[size * 10 - 1, 'b'] = -1.0
+        result['DataFrame equal'] = equal(frame_x, frame_y)
+        result['DataFrame unequal'] = unequal(frame_x, frame_z)
+        result['DataFrame keyed unequal'] = unequal(frame_x, frame_z.iloc[::-1], key_columns='a')
+
+    if find_spec('polars') is not None:
+        import polars as pl
+        lazy_x = pl.LazyFrame({'a': range(size * 10), 'b': [float(i) for i in range(size * 10)]})
+        lazy_y = lazy_x.with_columns(
+            pl.when(pl.col('a') == size * 10 - 1).then(-1.0).otherwise(pl.col('b')).alias('b')
+        )
+        result['LazyFrame unequal'] = unequal(lazy_x, lazy_y)
+        result['LazyFrame keyed unequal'] = unequal(lazy_x, lazy_y, key_columns='a')
+
+    return result
+
+
+def time(scenario: Callable[[], Any], repeat_: int) -> float:
+    return min(repeat(scenario, number=1, repeat=repeat_))
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--size', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--save', action='store_true',
+                        help='Store the timings as the new baselines.')
+    parser.add_argument('--check', action='store_true',
+                        help='Exit with an error if any scenario is slower than its baseline '
+                             'by more than the threshold.')
+    parser.add_argument('--threshold', type=float, default=0.2)
+    parser.add_argument('scenarios', nargs='*', help='Only run scenarios with these names.')
+    args = parser.parse_args()
+
+    unit = time(calibration, args.repeat)
+    baselines = json.loads(BASELINES.read_text()) if BASELINES.exists() else {}
+    results = {}
+    regressions = []
+    for name, scenario in scenarios(args.size).items():
+        if args.scenarios and name not in args.scenarios:
+            continue
+        relative = results[name] = time(scenario, args.repeat) / unit
+        baseline = baselines.get(name)
+        if baseline is None:
+            change = ''
+        else:
+            ratio = relative / baseline - 1
+            change = f'{ratio:+7.1%}'
+            if ratio > args.threshold:
+                regressions.append(name)
+                change += ' REGRESSION'
+        print(f'{name + ":":32} {relative * unit * 1000:9.1f}ms {relative:8.3f} units {change}')
+
+    if args.save:
+        baselines.update((name, round(value, 4)) for name, value in results.items())
+        BASELINES.write_text(json.dumps(baselines, indent=2, sort_keys=True) + '\n')
+    if args.check and regressions:
+        print(f'{len(regressions)} scenario(s) regressed by more than {args.threshold:.0%}:',
+              ', '.join(regressions), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Measure how long :func:`~testfixtures.diff` takes to describe differences between
+large multi-line strings, using each of the differs.
+
+:func:`~testfixtures.comparers.difflib_differ` is quadratic in the worst case, which is
+hit when many lines are changed throughout large strings, such as log files.
+:func:`~testfixtures.comparers.patience_differ` should take roughly linear time for
+all of these scenarios.
+
+Run with::
+
+  python benchmarks/text_diff.py
+"""
+from argparse import ArgumentParser
+from random import Random
+from timeit import repeat
+
+from testfixtures.comparers import Differ, diff, difflib_differ, patience_differ
+
+
+def scenarios(lines: int) -> dict[str, tuple[str, str]]:
+    chooser = Random(0)
+    log = [f'INFO request {i} took {chooser.randint(1, 500)}ms' for i in range(lines)]
+    edited = list(log)
+    for _ in range(50):
+        edited[chooser.randrange(len(edited))] = 'ERROR request failed'
+    alternate = [line if i % 2 else 'changed' for i, line in enumerate(log)]
+    return {
+        'few changes': ('\n'.join(log), '\n'.join(edited)),
+        'every other line': ('\n'.join(log), '\n'.join(alternate)),
+    }
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--lines', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    differs: dict[str, Differ] = {'difflib': difflib_differ, 'patience': patience_differ}
+    for name, (x, y) in scenarios(args.lines).items():
+        for differ_name, differ in differs.items():
+            best = min(repeat(lambda: diff(x, y, differ=differ), number=1, repeat=args.repeat))
+            print(f'{name + ", " + differ_name + ":":30} {best * 1000:8.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -17,8 +17,8 @@ from testfixtures.comparing import compare, register
 from testfixtures.comparison import (
     Comparison, TextComparison, StringComparison, RoundComparison,
     RangeComparison, ReprComparison, StrComparison, SequenceComparison, Subset,
-    Permutation, MappingComparison, like, repr_like, str_like, sequence,
-    contains, unordered, mapping
+    Permutation, MappingComparison, Match, StatefulComparison, like, repr_like,
+    str_like, sequence, contains, unordered, mapping
 )
 from testfixtures.command import Command, Run
 from testfixtures.datetime import mock_datetime, mock_date, mock_time
@@ -53,6 +53,7 @@ __all__ = [
     'LogCapture',
     'LoggingSource',
     'MappingComparison',
+    'Match',
     'OutputCapture',
     'Permutation',
     'RangeComparison',
@@ -66,6 +67,7 @@ __all__ = [
     'ShouldRaise',
     'ShouldNotWarn',
     'ShouldWarn',
+    'StatefulComparison',
     'Subset',
     'StrComparison',
     'StringComparison',
@@ -0,0 +1,248 @@
+"""
+Tools for helping to test applications that use Apache Arrow.
+"""
+from typing import TYPE_CHECKING, Any, Iterator, Sequence
+
+import pyarrow as pyarrow
+import pyarrow.compute as compute
+from pyarrow import Array, ArrowNotImplementedError, ChunkedArray, RecordBatch, Schema, Table
+
+if TYPE_CHECKING:
+    from .comparing import CompareContext
+
+# The number of ranges of differing rows listed for each column:
+RANGES_SHOWN = 5
+# The tolerances used for floating point values when not comparing strictly, matching
+# those used for numpy arrays:
+REL_TOL = 1e-05
+ABS_TOL = 1e-08
+
+
+def compare_table(x: Table, y: Table, context: 'CompareContext') -> str | None:
+    """
+    Returns a textual description of the differences between two
+    :class:`pyarrow.Table` instances.
+
+    The schemas are checked first. Columns are then compared a chunk at a time
+    using Arrow compute kernels, without converting their values to Python objects,
+    and the ranges of rows that differ in each column are reported.
+
+    When ``strict=True`` is passed to :func:`~testfixtures.compare`, floating
+    point values must be exactly equal, and the nullability and metadata of fields
+    and the metadata of the schemas must also match. Otherwise, :data:`REL_TOL`
+    and :data:`ABS_TOL` apply to floating point values.
+    """
+    return _compare_columns(x, y, context, 'Table')
+
+
+def compare_record_batch(
+        x: RecordBatch, y: RecordBatch, context: 'CompareContext'
+) -> str | None:
+    """
+    Returns a textual description of the differences between two
+    :class:`pyarrow.RecordBatch` instances, in the same way as
+    :func:`compare_table`.
+    """
+    return _compare_columns(x, y, context, 'RecordBatch')
+
+
+def compare_chunked_array(
+        x: ChunkedArray, y: ChunkedArray, context: 'CompareContext'
+) -> str | None:
+    """
+    Returns a textual description of the differences between two
+    :class:`pyarrow.ChunkedArray` instances.
+
+    The types are checked first. The values are then compared a chunk at a time
+    using Arrow compute kernels, and the ranges of rows that differ are reported,
+    regardless of how the two arrays are divided into chunks. Floating point values
+    are compared using the same tolerances as :func:`compare_table`.
+    """
+    lines: list[str] = []
+    if x.type != y.type:
+        lines.extend(('', f'types differ: {context.label("x", str(x.type))} != '
+                          f'{context.label("y", str(y.type))}'))
+    else:
+        lines.extend(_describe_lengths(x, y, context))
+        lines.extend(_describe_values('values differ', x, y, context))
+    if not lines:
+        return None
+    return '\n'.join(['ChunkedArray not as expected:', *lines])
+
+
+def _compare_columns(
+        x: Table | RecordBatch, y: Table | RecordBatch, context: 'CompareContext', kind: str
+) -> str | None:
+    lines = _describe_schemas(x.schema, y.schema, context)
+    if not lines:
+        lines.extend(_describe_lengths(x, y, context))
+        for i, name in enumerate(x.schema.names):
+            lines.extend(_describe_values(
+                f'values differ in {name!r}', x.column(i), y.column(i), context
+            ))
+    if not lines:
+        return None
+    return '\n'.join([f'{kind} not as expected:', *lines])
+
+
+def _describe_schemas(x: Schema, y: Schema, context: 'CompareContext') -> list[str]:
+    # Columns are only compared once the fields of both schemas line up.
+    lines: list[str] = []
+    x_label = context.x_label or 'first'
+    y_label = context.y_label or 'second'
+    if x.names != y.names:
+        x_names, y_names = set(x.names), set(y.names)
+        for first, second, names in (x_label, y_label, x_names - y_names), (
+                y_label, x_label, y_names - x_names
+        ):
+            if names:
+                lines.extend(('', f'columns in {first} but not {second}:',
+                              context.safe_repr(context.sorted_by_repr(names))))
+        if not lines:
+            lines.extend(('', 'column order differs:',
+                          f'{context.label("x", repr(x.names))} != '
+                          f'{context.label("y", repr(y.names))}'))
+        return lines
+    types = []
+    fields = []
+    for x_field, y_field in zip(x, y):
+        if x_field.type != y_field.type:
+            types.append(f'{x_field.name!r}: {context.label("x", str(x_field.type))} != '
+                         f'{context.label("y", str(y_field.type))}')
+        elif context.strict and not x_field.equals(y_field, check_metadata=True):
+            fields.append(f'{x_field.name!r}: {context.label("x", _field(x_field))} != '
+                          f'{context.label("y", _field(y_field))}')
+    if types:
+        lines.extend(('', 'types differ:', *types))
+    if fields:
+        lines.extend(('', 'fields differ:', *fields))
+    if context.strict and x.metadata != y.metadata:
+        lines.extend(('', 'schema metadata differs:',
+                      f'{context.label("x", repr(x.metadata))} != '
+                      f'{context.label("y", repr(y.metadata))}'))
+    return lines
+
+
+def _field(field: Any) -> str:
+    nullable = '' if field.nullable else ' not null'
+    return f'{field.type}{nullable}, metadata={field.metadata!r}'
+
+
+def _describe_lengths(x: Any, y: Any, context: 'CompareContext') -> list[str]:
+    if len(x) == len(y):
+        return []
+    return ['', f'row counts differ: {context.label("x", str(len(x)))} != '
+                f'{context.label("y", str(len(y)))}']
+
+
+def _chunks(column: Array | ChunkedArray) -> Sequence[Array]:
+    if isinstance(column, ChunkedArray):
+        return column.chunks
+    return [column]
+
+
+def _aligned(
+        x: Sequence[Array], y: Sequence[Array], length: int
+) -> Iterator[tuple[int, Array, Array]]:
+    # Yield the offset of each run of rows that falls within a single chunk of both
+    # columns, along with zero-copy slices of those chunks.
+    x_index = y_index = x_start = y_start = offset = 0
+    while offset < length:
+        x_chunk, y_chunk = x[x_index], y[y_index]
+        size = min(len(x_chunk) - x_start, len(y_chunk) - y_start, length - offset)
+        if size:
+            yield offset, x_chunk.slice(x_start, size), y_chunk.slice(y_start, size)
+        offset += size
+        x_start += size
+        y_start += size
+        if x_start == len(x_chunk):
+            x_index += 1
+            x_start = 0
+        if y_start == len(y_chunk):
+            y_index += 1
+            y_start = 0
+
+
+def _mismatched(x: Array, y: Array, tolerant: bool) -> Array | None:
+    # A boolean array that is true where two slices of the same type differ, treating
+    # nulls as equal to each other and NaN as equal to NaN, or None if they're equal.
+    # When tolerant, floating point values that are close enough are also equal.
+    if x.equals(y):
+        return None
+    try:
+        different = compute.not_equal(x, y)
+    except ArrowNotImplementedError:
+        # Nested types don't have comparison kernels, so compare each value instead:
+        return pyarrow.array([not x_value.equals(y_value) for x_value, y_value in zip(x, y)])
+    different = compute.or_(
+        compute.fill_null(different, False),
+        compute.xor(compute.is_null(x), compute.is_null(y)),
+    )
+    if pyarrow.types.is_floating(x.type):
+        both_nan = compute.fill_null(compute.and_(compute.is_nan(x), compute.is_nan(y)), False)
+        different = compute.and_not(different, both_nan)
+        if tolerant:
+            close = compute.and_(
+                compute.less_equal(
+                    compute.abs(compute.subtract(x, y)),
+                    compute.add(compute.multiply(compute.abs(y), REL_TOL), ABS_TOL),
+                ),
+                compute.and_(compute.is_finite(x), compute.is_finite(y)),
+            )
+            different = compute.and_not(different, compute.fill_null(close, False))
+    return different
+
+
+def _describe_values(
+        heading: str, x: Array | ChunkedArray, y: Array | ChunkedArray, context: 'CompareContext'
+) -> list[str]:
+    # Describe the ranges of rows in which two columns of the same type differ, along
+    # with the values in the first row that differs.
+    rows = 0
+    ranges: list[list[int]] = []
+    range_count = 0
+    last = -2
+    first = None
+    tolerant = not context.strict
+    for offset, x_slice, y_slice in _aligned(_chunks(x), _chunks(y), min(len(x), len(y))):
+        mismatched = _mismatched(x_slice, y_slice, tolerant)
+        if mismatched is None:
+            continue
+        indices = compute.indices_nonzero(mismatched)
+        count = len(indices)
+        if not count:
+            continue
+        if first is None:
+            position = indices[0].as_py()
+            first = offset + position, x_slice[position].as_py(), y_slice[position].as_py()
+        rows += count
+        # The positions within indices of the last row of each range of consecutive rows:
+        ends = compute.indices_nonzero(compute.not_equal(
+            indices[1:], compute.add(indices[:-1], 1)
+        ))
+        range_count += len(ends) + 1
+        for i in range(min(len(ends) + 1, RANGES_SHOWN + 1)):
+            start = offset + (indices[ends[i - 1].as_py() + 1] if i else indices[0]).as_py()
+            end = offset + indices[ends[i].as_py() if i < len(ends) else count - 1].as_py()
+            if start == last + 1:
+                range_count -= 1
+                if ranges and ranges[-1][1] == last:
+                    ranges[-1][1] = end
+            elif len(ranges) < RANGES_SHOWN:
+                ranges.append([start, end])
+            last = end
+        last = offset + indices[count - 1].as_py()
+
+    if first is None:
+        return []
+    rendered = [str(start) if start == end else f'{start}-{end}' for start, end in ranges]
+    if range_count > len(ranges):
+        rendered.append(f'<{range_count - len(ranges)} more>')
+    row, x_value, y_value = first
+    return [
+        '',
+        f'{heading} at {"row" if rows == 1 else "rows"} {", ".join(rendered)} '
+        f'({rows} of {min(len(x), len(y))}):',
+        f'[{row}]: {context.label("x", context.safe_repr(x_value))} != '
+        f'{context.label("y", context.safe_repr(y_value))}',
+    ]
@@ -1,20 +1,34 @@
 import re
-from collections import defaultdict
+import sys
+from bisect import bisect_left
+from collections import Counter, defaultdict, deque
+from dataclasses import dataclass, fields, is_dataclass
 from datetime import datetime
-from difflib import unified_diff
+from difflib import SequenceMatcher
 from functools import partial as partial_type
+from heapq import nsmallest
+from itertools import islice, zip_longest
+from operator import attrgetter, itemgetter
 from pathlib import Path
 from pprint import pformat
+from time import perf_counter
 from typing import (
     Any,
+    Callable,
+    Collection,
+    Generator,
     Iterable,
+    Iterator,
     List,
     Mapping,
+    NamedTuple,
     Pattern,
     Sequence,
+    TypeAlias,
     TypeVar,
     TYPE_CHECKING,
 )
+from weakref import WeakKeyDictionary
 
 from testfixtures import not_there
 from testfixtures.mock import parent_name, _Call
@@ -23,9 +37,18 @@ from testfixtures.resolve import type_name
 if TYPE_CHECKING:
     from .comparing import CompareContext
 
+# The comparers for containers are implemented as generators that yield each pair of
+# elements that CompareContext._known_equal can't vouch for, along with the breadcrumb
+# and key to pass to CompareContext.different, and are sent back the result.
+# CompareContext drives these from an explicit stack, so the depth of nesting they
+# can handle is not limited by Python's recursion limit.
+Steps = Generator[tuple[Any, Any, str, Any], 'bool | str | None', 'str | None']
+
 
 __all__ = [
     'AlreadySeen',
+    'RenderLimits',
+    'compare_buffer',
     'compare_bytes',
     'compare_call',
     'compare_dict',
@@ -43,7 +66,9 @@ __all__ = [
     'compare_with_fold',
     'compare_with_type',
     'diff',
+    'difflib_differ',
     'merge_ignored_attributes',
+    'patience_differ',
     'safe_pformat',
     'safe_repr',
     'sorted_by_repr',
@@ -53,14 +78,139 @@ __all__ = [
 ]
 
 
-def safe_repr(obj: Any) -> str:
+@dataclass(frozen=True)
+class RenderLimits:
+    """
+    Limits on how much of an object is rendered when describing it in a failure message.
+    Where a limit is reached, a marker is rendered in place of whatever was left out.
+
+    :param max_chars: The maximum number of characters to render for the object as a whole,
+                      and for any string or bytes it contains.
+
+    :param max_depth: The maximum depth to which nested lists, tuples, dicts and sets are
+                      rendered. Containers below this are rendered as ``[...]``, ``(...)``
+                      or ``{...}``.
+
+    :param max_items: The maximum number of items rendered for each list, tuple, dict or set.
+
+    Subclasses of these, such as named tuples and :class:`~collections.OrderedDict`, are
+    also limited, and are rendered as their base type when anything has been left out.
+    """
+    max_chars: int | None = None
+    max_depth: int | None = None
+    max_items: int | None = None
+
+
+class _Elided:
+
+    def __init__(self, text: str = '...') -> None:
+        self.text = text
+
+    def __repr__(self) -> str:
+        return self.text
+
+    # Sort after everything else when pprint sorts dict keys and set items:
+    def __lt__(self, other: Any) -> bool:
+        return False
+
+    def __gt__(self, other: Any) -> bool:
+        return True
+
+
+_elided = _Elided()
+
+_DEPTH_MARKERS: dict[type, str] = {
+    list: '[...]', tuple: '(...)', dict: '{...}', set: '{...}', frozenset: '{...}'
+}
+
+
+def _limited(obj: Any, limits: RenderLimits, depth: int = 0) -> Any:
+    # Return a copy of obj that is no bigger than the limits allow, so rendering
+    # a huge structure doesn't take time and memory proportional to its size.
+    # Subclasses of the built-in containers are copied as their base type when
+    # anything in them has to be left out, and returned unchanged otherwise.
+    type_ = type(obj)
+    if isinstance(obj, (str, bytes)):
+        max_chars = limits.max_chars
+        if max_chars is not None and len(obj) > max_chars:
+            return _Elided(f'{obj[:max_chars]!r}<{len(obj) - max_chars} more characters>')
+        return obj
+    base = type_
+    marker = _DEPTH_MARKERS.get(type_)
+    if marker is None:
+        if isinstance(obj, _Call):
+            # rendered in a way that doesn't reflect its contents as a tuple
+            return obj
+        for base, marker in _DEPTH_MARKERS.items():
+            if isinstance(obj, base):
+                break
+        else:
+            return obj
+    if limits.max_depth is not None and depth >= limits.max_depth:
+        return _Elided(marker)
+    max_items = limits.max_items
+    extra = 0 if max_items is None else len(obj) - max_items
+    depth += 1
+    if base is dict:
+        limited_dict = {}
+        unchanged = extra <= 0
+        for k, v in islice(obj.items(), max_items):
+            limited_k, limited_v = _limited(k, limits, depth), _limited(v, limits, depth)
+            unchanged = unchanged and limited_k is k and limited_v is v
+            limited_dict[limited_k] = limited_v
+        if unchanged:
+            return obj
+        if extra > 0:
+            limited_dict[_Elided(f'<{extra} more>')] = _elided
+        return limited_dict
+    if max_items is not None and extra > 0 and (base is set or base is frozenset):
+        # Iteration order depends on hashing, so pick the smallest items rather than the
+        # first ones, and render them here in order with the marker last:
+        try:
+            chosen = nsmallest(max_items, obj)
+        except TypeError:
+            chosen = nsmallest(max_items, obj, key=safe_repr)
+        text = '{' + ', '.join(
+            safe_repr(_limited(item, limits, depth)) for item in chosen
+        ) + f', <{extra} more>}}'
+        return _Elided(text if base is set else f'frozenset({text})')
+    items = list(islice(obj, max_items))
+    limited = [_limited(item, limits, depth) for item in items]
+    if extra <= 0 and all(l is i for l, i in zip(limited, items)):
+        return obj
+    if extra > 0:
+        limited.append(_Elided(f'<{extra} more>'))
+    return base(limited)
+
+
+def _truncated(text: str, limits: RenderLimits | None) -> str:
+    max_chars = None if limits is None else limits.max_chars
+    if max_chars is not None and len(text) > max_chars:
+        return f'{text[:max_chars]}<{len(text) - max_chars} more characters>'
+    return text
+
+
+def safe_repr(obj: Any, limits: RenderLimits | None = None) -> str:
     """
     A fault-tolerant version of :func:`repr`.
 
     :exc:`KeyboardInterrupt` and :exc:`SystemExit` are not caught.
+
+    :param limits: If supplied, the :class:`RenderLimits` to respect.
     """
+    if limits is not None:
+        try:
+            limited = _limited(obj, limits)
+        except RecursionError as e:
+            return _unrepresentable(type(obj), e)
+        text = safe_repr(limited)
+        # A long string will already have been cut short:
+        return text if isinstance(obj, (str, bytes)) else _truncated(text, limits)
     try:
         return repr(obj)
+    except RecursionError as e:
+        # Rendering the contents one by one would fail in the same way:
+        return _unrepresentable(type(obj), e)
     except Exception as e:
         type_ = type(obj)
         cls_name = type_.__name__
@@ -83,18 +233,31 @@ def safe_repr(obj: Any) -> str:
                     return cls_name + '()'
                 return '{' + ', '.join(safe_repr(e) for e in obj) + '}'
             case _:
-                try:
-                    detail = f'{type(e).__name__}: {e}'
-                except:
-                    detail = type(e).__name__
-                return f'<unrepresentable {type_name(type_)}: {detail}>'
+                return _unrepresentable(type_, e)
+
+
+def _unrepresentable(type_: type, e: Exception) -> str:
+    try:
+        detail = f'{type(e).__name__}: {e}'
+    except:
+        detail = type(e).__name__
+    return f'<unrepresentable {type_name(type_)}: {detail}>'
 
 
-def safe_pformat(obj: Any) -> str:
+def safe_pformat(obj: Any, limits: RenderLimits | None = None) -> str:
     """
     A fault-tolerant version of  :func:`pprint.pformat` but tolerant.
     Falls back to :func:`safe_repr` when :func:`~pprint.pformat` fails.
+
+    :param limits: If supplied, the :class:`RenderLimits` to respect.
     """
+    if limits is not None:
+        try:
+            limited = _limited(obj, limits)
+        except RecursionError as e:
+            return _unrepresentable(type(obj), e)
+        text = safe_pformat(limited)
+        return text if isinstance(obj, (str, bytes)) else _truncated(text, limits)
     try:
         return pformat(obj)
     except:
@@ -122,22 +285,198 @@ class AlreadySeen:
             return self.obj == other
 
 
-def diff(x: str, y: str, x_label: str | None = '', y_label: str | None = '') -> str:
+Opcode: TypeAlias = tuple[str, int, int, int, int]
+Differ: TypeAlias = Callable[[Sequence[str], Sequence[str]], Iterable[Opcode]]
+
+#: Inputs with more lines than this in total are diffed with :func:`patience_differ`
+#: rather than :func:`difflib_differ` when no differ is specified.
+DIFFLIB_THRESHOLD = 2_000
+
+
+def difflib_differ(a: Sequence[str], b: Sequence[str]) -> Iterable[Opcode]:
+    """
+    A differ that uses :class:`difflib.SequenceMatcher`, giving the same diffs
+    as :func:`difflib.unified_diff`. Its worst case is quadratic in the number of lines.
+    """
+    return SequenceMatcher(None, a, b).get_opcodes()
+
+
+def _longest_increasing(pairs: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    # Of a list of pairs sorted by their first element, return the longest run
+    # in which the second elements are also increasing.
+    tails: list[int] = []
+    tail_indexes: list[int] = []
+    previous: list[int] = []
+    for index, (_, j) in enumerate(pairs):
+        position = bisect_left(tails, j)
+        if position == len(tails):
+            tails.append(j)
+            tail_indexes.append(index)
+        else:
+            tails[position] = j
+            tail_indexes[position] = index
+        previous.append(tail_indexes[position - 1] if position else -1)
+    run = []
+    index = tail_indexes[-1] if tail_indexes else -1
+    while index >= 0:
+        run.append(pairs[index])
+        index = previous[index]
+    run.reverse()
+    return run
+
+
+def patience_differ(
+        a: Sequence[str], b: Sequence[str], timeout: float = 1, max_region: int = 1_000_000
+) -> Iterable[Opcode]:
+    """
+    A differ that uses the patience algorithm, which anchors the diff on lines that
+    occur exactly once in both sequences. Lines are only hashed once and an explicit stack
+    is used, so the time and space taken grow roughly linearly with the number of lines.
+
+    :param timeout: The number of seconds after which any parts of the sequences
+                    that remain to be diffed are shown as replaced in full.
+
+    :param max_region: Parts of the sequences that contain no unique lines are diffed
+                       using :class:`difflib.SequenceMatcher` if the product of their
+                       lengths is no more than this, and shown as replaced in full
+                       otherwise.
+    """
+    # Hash each line once, so only integers are compared from here on:
+    numbers: dict[str, int] = {}
+    a_ = [numbers.setdefault(line, len(numbers)) for line in a]
+    b_ = [numbers.setdefault(line, len(numbers)) for line in b]
+    deadline = perf_counter() + timeout
+    blocks: list[tuple[int, int, int]] = []
+    regions = [(0, len(a_), 0, len(b_))]
+    while regions:
+        a_lo, a_hi, b_lo, b_hi = regions.pop()
+        start = a_lo
+        while a_lo < a_hi and b_lo < b_hi and a_[a_lo] == b_[b_lo]:
+            a_lo += 1
+            b_lo += 1
+        if a_lo > start:
+            blocks.append((start, b_lo - (a_lo - start), a_lo - start))
+        end = a_hi
+        while a_lo < a_hi and b_lo < b_hi and a_[a_hi - 1] == b_[b_hi - 1]:
+            a_hi -= 1
+            b_hi -= 1
+        if a_hi < end:
+            blocks.append((a_hi, b_hi, end - a_hi))
+        if a_lo == a_hi or b_lo == b_hi or perf_counter() > deadline:
+            continue
+        a_counts = Counter(a_[a_lo:a_hi])
+        b_counts = Counter(b_[b_lo:b_hi])
+        b_positions = {
+            line: j for j, line in enumerate(b_[b_lo:b_hi], b_lo) if b_counts[line] == 1
+        }
+        anchors = _longest_increasing([
+            (i, b_positions[line]) for i, line in enumerate(a_[a_lo:a_hi], a_lo)
+            if a_counts[line] == 1 and line in b_positions
+        ])
+        if anchors:
+            for i, j in anchors:
+                regions.append((a_lo, i, b_lo, j))
+                blocks.append((i, j, 1))
+                a_lo, b_lo = i + 1, j + 1
+            regions.append((a_lo, a_hi, b_lo, b_hi))
+        elif (a_hi - a_lo) * (b_hi - b_lo) <= max_region:
+            matcher = SequenceMatcher(None, a_[a_lo:a_hi], b_[b_lo:b_hi], autojunk=False)
+            for i, j, size in matcher.get_matching_blocks():
+                if size:
+                    blocks.append((a_lo + i, b_lo + j, size))
+    # Turn the matching blocks into opcodes, in the same way as SequenceMatcher:
+    blocks.sort()
+    merged: list[list[int]] = []
+    for i, j, size in blocks:
+        if merged and merged[-1][0] + merged[-1][2] == i and merged[-1][1] + merged[-1][2] == j:
+            merged[-1][2] += size
+        else:
+            merged.append([i, j, size])
+    merged.append([len(a_), len(b_), 0])
+    opcodes: list[Opcode] = []
+    i = j = 0
+    for block_i, block_j, size in merged:
+        if i < block_i and j < block_j:
+            opcodes.append(('replace', i, block_i, j, block_j))
+        elif i < block_i:
+            opcodes.append(('delete', i, block_i, j, block_j))
+        elif j < block_j:
+            opcodes.append(('insert', i, block_i, j, block_j))
+        i, j = block_i + size, block_j + size
+        if size:
+            opcodes.append(('equal', block_i, i, block_j, j))
+    return opcodes
+
+
+def _grouped(opcodes: list[Opcode], n: int = 3) -> Iterator[list[Opcode]]:
+    # Group opcodes into hunks with n lines of context, as SequenceMatcher does.
+    if not opcodes:
+        opcodes = [('equal', 0, 1, 0, 1)]
+    tag, i1, i2, j1, j2 = opcodes[0]
+    if tag == 'equal':
+        opcodes[0] = tag, max(i1, i2 - n), i2, max(j1, j2 - n), j2
+    tag, i1, i2, j1, j2 = opcodes[-1]
+    if tag == 'equal':
+        opcodes[-1] = tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)
+    group: list[Opcode] = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == 'equal' and i2 - i1 > n * 2:
+            group.append((tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)))
+            yield group
+            group = []
+            i1, j1 = max(i1, i2 - n), max(j1, j2 - n)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == 'equal'):
+        yield group
+
+
+def _unified_range(start: int, stop: int) -> str:
+    length = stop - start
+    if length == 1:
+        return str(start + 1)
+    return f'{start + 1 if length else start},{length}'
+
+
+def diff(
+        x: str,
+        y: str,
+        x_label: str | None = '',
+        y_label: str | None = '',
+        differ: Differ | None = None,
+) -> str:
     """
-    A shorthand function that uses :mod:`difflib` to return a
-    string representing the differences between the two string
-    arguments.
+    A shorthand function that returns a unified diff representing the differences
+    between the two string arguments.
 
     Most useful when comparing multi-line strings.
+
+    :param differ: The function used to find the differences between the lines of
+                   the two strings, such as :func:`difflib_differ` or
+                   :func:`patience_differ`. If not supplied, :func:`difflib_differ`
+                   is used unless there are more than ``DIFFLIB_THRESHOLD`` lines.
     """
-    return '\n'.join(
-        unified_diff(
-            x.split('\n'),
-            y.split('\n'),
-            x_label or 'first',
-            y_label or 'second',
-            lineterm='')
-    )
+    a = x.split('\n')
+    b = y.split('\n')
+    if differ is None:
+        differ = difflib_differ if len(a) + len(b) <= DIFFLIB_THRESHOLD else patience_differ
+    lines: list[str] = []
+    for group in _grouped(list(differ(a, b))):
+        if not lines:
+            lines.append(f'--- {x_label or "first"}')
+            lines.append(f'+++ {y_label or "second"}')
+        first, last = group[0], group[-1]
+        lines.append(
+            f'@@ -{_unified_range(first[1], last[2])} +{_unified_range(first[3], last[4])} @@'
+        )
+        for tag, i1, i2, j1, j2 in group:
+            if tag == 'equal':
+                lines.extend(' ' + line for line in a[i1:i2])
+                continue
+            if tag != 'insert':
+                lines.extend('-' + line for line in a[i1:i2])
+            if tag != 'delete':
+                lines.extend('+' + line for line in b[j1:j2])
+    return '\n'.join(lines)
 
 
 def compare_simple(
@@ -147,9 +486,12 @@ def compare_simple(
     Returns a very simple textual difference between the two supplied objects.
     """
     if x != y:
-        repr_x = safe_repr(x)
-        repr_y = safe_repr(y)
-        if repr_x == repr_y:
+        repr_x = context.safe_repr(x)
+        repr_y = context.safe_repr(y)
+        # Reprs cut short by render limits can match when the full ones don't:
+        if repr_x == repr_y and (
+                context.render_limits is None or context._full_repr(x) == context._full_repr(y)
+        ):
             if type(x) is not type(y):
                 return compare_with_type(x, y, context)
             x_attrs = _extract_attrs(x)
@@ -172,6 +514,27 @@ def compare_simple(
     return None
 
 
+# The names of the slots of each type, or None if it has no __slots__, as walking
+# the __mro__ for every object compared is expensive:
+_slot_names: WeakKeyDictionary[type, tuple[str, ...] | None] = WeakKeyDictionary()
+
+
+def _slots_of(type_: type) -> tuple[str, ...] | None:
+    try:
+        return _slot_names[type_]
+    except KeyError:
+        pass
+    slots: tuple[str, ...] | None = None
+    if getattr(type_, '__slots__', not_there) is not not_there:
+        names = set[str]()
+        for cls in type_.__mro__:
+            cls_slots = getattr(cls, '__slots__', ())
+            names.update((cls_slots,) if isinstance(cls_slots, str) else cls_slots)
+        slots = tuple(names)
+    _slot_names[type_] = slots
+    return slots
+
+
 def _extract_attrs(obj: Any, ignore: Iterable[str] | None = None) -> dict[str, Any] | None:
     try:
         attrs = vars(obj).copy()
@@ -181,11 +544,8 @@ def _extract_attrs(obj: Any, ignore: Iterable[str] | None = None) -> dict[str, A
         if isinstance(obj, BaseException):
             attrs['args'] = obj.args
 
-    has_slots = getattr(obj, '__slots__', not_there) is not not_there
-    if has_slots:
-        slots = set[str]()
-        for cls in type(obj).__mro__:
-            slots.update(getattr(cls, '__slots__', ()))
+    slots = _slots_of(type(obj))
+    if slots is not None:
         if slots and attrs is None:
             attrs = {}
         for n in slots:
@@ -202,6 +562,68 @@ def _extract_attrs(obj: Any, ignore: Iterable[str] | None = None) -> dict[str, A
     return attrs
 
 
+class _FieldPlan(NamedTuple):
+    # Sorted as the keys of the attributes would be when describing differences:
+    names: tuple[str, ...]
+    # Gets the values of the fields, in the same order as their names, as a tuple:
+    values: Callable[[Any], tuple]
+    # The names of the fields kept in each instance's __dict__, if it has one:
+    dict_names: frozenset[str] | None
+
+
+# How to get the fields declared by each dataclass or attrs class, or None for other types:
+_field_plans: WeakKeyDictionary[type, _FieldPlan | None] = WeakKeyDictionary()
+
+
+def _field_plan(type_: type) -> _FieldPlan | None:
+    try:
+        return _field_plans[type_]
+    except KeyError:
+        pass
+    plan = None
+    if is_dataclass(type_):
+        names = {field.name for field in fields(type_)}
+    else:
+        names = {field.name for field in getattr(type_, '__attrs_attrs__', ())}
+    # Only use the fields when they are exactly what _extract_attrs would return,
+    # which includes any __weakref__ slot:
+    slots = set(_slots_of(type_) or ())
+    if names and not issubclass(type_, BaseException) and slots - names <= {'__weakref__'}:
+        dict_names = frozenset(names - slots)
+        names |= slots
+        ordered = sorted(names, key=repr)
+        if type_.__dictoffset__ == 0:
+            if not dict_names:
+                plan = _FieldPlan(tuple(ordered), _values_getter(ordered), None)
+        else:
+            plan = _FieldPlan(tuple(ordered), _values_getter(ordered), dict_names)
+    _field_plans[type_] = plan
+    return plan
+
+
+def _values_getter(names: Sequence[str]) -> Callable[[Any], tuple]:
+    if len(names) == 1:
+        get = attrgetter(names[0])
+        return lambda obj: (get(obj),)
+    return attrgetter(*names)
+
+
+def _field_values(x: Any, y: Any) -> tuple[tuple[str, ...], tuple, tuple] | None:
+    # The names and values of the declared fields of two objects of the same type,
+    # or None if they can't stand in for the objects' attributes.
+    plan = _field_plan(type(x))
+    if plan is None:
+        return None
+    dict_names = plan.dict_names
+    if dict_names is not None and not (vars(x).keys() == dict_names == vars(y).keys()):
+        return None
+    try:
+        return plan.names, plan.values(x), plan.values(y)
+    except AttributeError:
+        # a slot that hasn't been set
+        return None
+
+
 def merge_ignored_attributes(
     *ignored: Iterable[str] | Mapping[type, Iterable[str]] | str | None
 ) -> Mapping[type, set[str]]:
@@ -246,6 +668,22 @@ def _attrs_to_ignore(
     return ignored
 
 
+def _cached_attrs_to_ignore(
+        ignore_attributes: Iterable[str] | Mapping[type, Iterable[str]],
+        obj: Any,
+        context: 'CompareContext',
+) -> set[str]:
+    # The options for a comparison don't change while it is in progress, so the
+    # attributes to ignore only need working out once for each type:
+    key = id(ignore_attributes), type(obj)
+    cached = context._ignored_attributes.get(key)
+    if cached is None:
+        cached = context._ignored_attributes[key] = (
+            ignore_attributes, _attrs_to_ignore(ignore_attributes, obj)
+        )
+    return cached[1]
+
+
 def compare_object(
         x: object,
         y: object,
@@ -265,18 +703,52 @@ def compare_object(
        specify attributes that should be ignored for all types.
 
     """
+    return context._run(_object_steps(x, y, context, ignore_attributes))
+
+
+def _object_steps(
+        x: object,
+        y: object,
+        context: 'CompareContext',
+        ignore_attributes: Iterable[str] | Mapping[type, Iterable[str]] = ()
+) -> Steps:
     if type(x) is not type(y) or isinstance(x, type):
         return compare_simple(x, y, context)
-    x_attrs = _extract_attrs(x, _attrs_to_ignore(ignore_attributes, x))
-    y_attrs = _extract_attrs(y, _attrs_to_ignore(ignore_attributes, y))
+    ignored = _cached_attrs_to_ignore(ignore_attributes, x, context)
+    # The declared fields of dataclasses and attrs classes can be compared without
+    # extracting the attributes into dicts:
+    values = None if ignored else _field_values(x, y)
+    if values is not None:
+        return (yield from _field_steps(x, context, 'attributes ', *values))
+    x_attrs = _extract_attrs(x, ignored)
+    y_attrs = _extract_attrs(y, ignored)
     if x_attrs is None or y_attrs is None or not (x_attrs and y_attrs):
         return compare_simple(x, y, context)
     if not context.qualified_equals(x_attrs, y_attrs):
-        return _compare_mapping(x_attrs, y_attrs, context, x,
-                                'attributes ', '.%s')
+        return (yield from _mapping_steps(x_attrs, y_attrs, context, x,
+                                          'attributes ', '.%s'))
     return None
 
 
+def _field_steps(
+        obj_for_class: Any, context: 'CompareContext', prefix: str,
+        names: tuple[str, ...], x_values: tuple, y_values: tuple, breadcrumb: str = '.%s',
+) -> Steps:
+    if context.qualified_equals(x_values, y_values):
+        return None
+    same = []
+    diffs = []
+    known_equal = context._known_equal
+    for name, x_value, y_value in zip(names, x_values, y_values):
+        if not known_equal(x_value, y_value) and (yield x_value, y_value, breadcrumb, name):
+            diffs.append(_describe_values(context, name, x_value, y_value))
+        else:
+            same.append(name)
+    if not diffs:
+        return None
+    return _describe_mapping(context, obj_for_class, prefix, same, diffs)
+
+
 def compare_exception(
         x: BaseException, y: BaseException, context: 'CompareContext'
 ) -> str | None:
@@ -314,29 +786,136 @@ def compare_sequence(
     Returns a textual description of the differences between the two
     supplied sequences.
     """
+    return context._run(_sequence_steps(x, y, context, prefix))
+
+
+# Sequences of ints or floats with at least this many elements are checked using numpy,
+# if something else has imported it, rather than one element at a time:
+VECTORISE_THRESHOLD = 10_000
+
+
+def _numeric_differences(x: Sequence, y: Sequence) -> Sequence[int] | None:
+    # The positions at which two long sequences of ints or floats may differ, or None if
+    # they can't be checked in one pass.
+    if min(len(x), len(y)) < VECTORISE_THRESHOLD or 'numpy' not in sys.modules:
+        return None
+    from .numpy import _numeric_differences
+    positions = _numeric_differences(x, y)
+    return None if positions is None else positions.tolist()
+
+
+def _common_values(x: dict, y: dict) -> tuple[list[Any], tuple, tuple] | None:
+    # The keys two large dicts have in common, along with their values in each, or None
+    # if they can't be checked using numpy, in which case there's no point building them.
+    if min(len(x), len(y)) < VECTORISE_THRESHOLD or 'numpy' not in sys.modules:
+        return None
+    if type(next(iter(x.values()))) not in (int, float):
+        return None
+    keys = list(x) if x.keys() == y.keys() else [key for key in x if key in y]
+    if len(keys) < 2:
+        return None
+    values = itemgetter(*keys)
+    return keys, values(x), values(y)
+
+
+def _numerically_equal(x: Any, y: Any) -> bool | None:
+    # Whether two large containers of the same type, holding only ints or only floats,
+    # are equal, or None if that can't be found out in one pass.
+    if type(x) is dict:
+        if x.keys() != y.keys():
+            return False
+        common = _common_values(x, y)
+        positions = None if common is None else _numeric_differences(*common[1:])
+    elif len(x) != len(y):
+        return False
+    else:
+        positions = _numeric_differences(x, y)
+    return None if positions is None else not positions
+
+
+def _sequence_steps(
+        x: Sequence, y: Sequence, context: 'CompareContext', prefix: bool = True,
+        start: int = 0,
+) -> Steps:
+    # Elements before start are already known to be the same.
     l_x = len(x)
     l_y = len(y)
-    i = 0
-    while i < l_x and i < l_y:
-        if context.different(x[i], y[i], '[%i]' % i):
-            break
-        i += 1
+    i = start
+    known_equal = context._known_equal
+    positions = _numeric_differences(x, y) if start == 0 else None
+    if positions is not None:
+        # Only elements at these positions can differ:
+        i = min(l_x, l_y)
+        for position in positions:
+            x_item, y_item = x[position], y[position]
+            if (not known_equal(x_item, y_item) and
+                    (yield x_item, y_item, '[%i]', position)):
+                i = position
+                break
+    else:
+        while i < l_x and i < l_y:
+            x_item, y_item = x[i], y[i]
+            if not known_equal(x_item, y_item) and (yield x_item, y_item, '[%i]', i):
+                break
+            i += 1
 
     if l_x == l_y and i == l_x:
         return None
 
     header = 'sequence not as expected:\n\n' if prefix else ''
-    same = safe_pformat(x[:i])
+    same = context.safe_pformat(x[:i])
     x_label = context.x_label or 'first'
     y_label = context.y_label or 'second'
     return (
         f'{header}same:\n{same}\n\n'
-        f'{x_label}:\n{safe_pformat(x[i:])}\n\n'
-        f'{y_label}:\n{safe_pformat(y[i:])}'
+        f'{x_label}:\n{context.safe_pformat(x[i:])}\n\n'
+        f'{y_label}:\n{context.safe_pformat(y[i:])}'
     )
 
 
-def compare_generator(x: Iterable, y: Iterable, context: 'CompareContext') -> str | None:
+def _take(first: Any, iterator: Iterator, count: int) -> tuple[Any, ...]:
+    if first is not_there:
+        return ()
+    items = [first, *islice(iterator, max(count - 1, 0))]
+    if next(iterator, not_there) is not not_there:
+        items.append(_elided)
+    return tuple(items)
+
+
+def _compare_streaming(
+        x: Iterator, y: Iterator, context: 'CompareContext', window: int
+) -> str | None:
+    same = deque[Any](maxlen=window)
+    i = 0
+    for x_item, y_item in zip_longest(x, y, fillvalue=not_there):
+        if x_item is not_there or y_item is not_there:
+            break
+        checkpoint = context._checkpoint()
+        if context.different(x_item, y_item, '[%i]', i):
+            break
+        # These items are about to be discarded, so their ids may be re-used:
+        context._rollback(checkpoint)
+        same.append(x_item)
+        i += 1
+    else:
+        return None
+
+    same_items = tuple(same)
+    if i > len(same_items):
+        same_items = (_elided, *same_items)
+    x_label = context.x_label or 'first'
+    y_label = context.y_label or 'second'
+    return (
+        f'sequence not as expected:\n\n'
+        f'same:\n{context.safe_pformat(same_items)}\n\n'
+        f'{x_label}:\n{context.safe_pformat(_take(x_item, x, window))}\n\n'
+        f'{y_label}:\n{context.safe_pformat(_take(y_item, y, window))}'
+    )
+
+
+def compare_generator(
+        x: Iterable, y: Iterable, context: 'CompareContext', streaming: int | None = None
+) -> str | None:
     """
     Returns a textual description of the differences between the two
     supplied generators.
@@ -344,7 +923,16 @@ def compare_generator(x: Iterable, y: Iterable, context: 'CompareContext') -> st
     This is done by first unwinding each of the generators supplied
     into tuples and then passing those tuples to
     :func:`compare_sequence`.
+
+    :param streaming:
+      If supplied, the generators are instead compared item by item as they
+      are consumed, stopping at the first difference. Only this many items
+      either side of that difference are kept for the failure message, with
+      ``...`` marking where items have been left out.
     """
+    if streaming is not None:
+        return _compare_streaming(iter(x), iter(y), context, streaming)
+
     x = tuple(x)
     y = tuple(y)
 
@@ -362,17 +950,46 @@ def compare_tuple(x: tuple, y: tuple, context: 'CompareContext') -> str | None:
     The presence of a ``_fields`` attribute on a tuple is used to
     decide whether or not it is a :func:`~collections.namedtuple`.
     """
+    return context._run(_tuple_steps(x, y, context))
+
+
+def _tuple_steps(x: tuple, y: tuple, context: 'CompareContext', start: int = 0) -> Steps:
     x_fields = getattr(x, '_fields', None)
     y_fields = getattr(y, '_fields', None)
     if x_fields and y_fields:
         if x_fields == y_fields:
-            return _compare_mapping(dict(zip(x_fields, x)),
-                                    dict(zip(y_fields, y)),
-                                    context,
-                                    x)
+            if type(x_fields) is tuple and len(x) == len(y) == len(x_fields):
+                names, values = _tuple_field_plan(x_fields)
+                return (yield from _field_steps(
+                    x, context, '', names, values(x), values(y), '[%r]'
+                ))
+            return (yield from _mapping_steps(dict(zip(x_fields, x)),
+                                              dict(zip(y_fields, y)),
+                                              context,
+                                              x))
         else:
             return compare_with_type(x, y, context)
-    return compare_sequence(x, y, context)
+    return (yield from _sequence_steps(x, y, context, start=start))
+
+
+# The fields of each shape of named tuple, sorted as they are described, along with how to
+# get their values in that order:
+_tuple_field_plans: dict[tuple[str, ...], tuple[tuple[str, ...], Callable[[tuple], tuple]]] = {}
+
+
+def _tuple_field_plan(
+        fields_: tuple[str, ...]
+) -> tuple[tuple[str, ...], Callable[[tuple], tuple]]:
+    plan = _tuple_field_plans.get(fields_)
+    if plan is None:
+        order = sorted(range(len(fields_)), key=lambda i: repr(fields_[i]))
+        values: Callable[[tuple], tuple]
+        if len(order) == 1:
+            values = lambda obj: obj[:1]
+        else:
+            values = itemgetter(*order)
+        plan = _tuple_field_plans[fields_] = tuple(fields_[i] for i in order), values
+    return plan
 
 
 def compare_dict(x: dict, y: dict, context: 'CompareContext') -> str | None:
@@ -380,7 +997,19 @@ def compare_dict(x: dict, y: dict, context: 'CompareContext') -> str | None:
     Returns a textual description of the differences between the two
     supplied dictionaries.
     """
-    return _compare_mapping(x, y, context, x)
+    return context._run(_dict_steps(x, y, context))
+
+
+def _dict_steps(
+        x: dict, y: dict, context: 'CompareContext', differing: Collection[Any] | None = None
+) -> Steps:
+    common = None if differing is not None else _common_values(x, y)
+    if common is not None:
+        keys, x_values, y_values = common
+        positions = _numeric_differences(x_values, y_values)
+        if positions is not None:
+            differing = {keys[i] for i in positions}
+    return (yield from _mapping_steps(x, y, context, x, differing=differing))
 
 
 Item = TypeVar('Item')
@@ -395,24 +1024,56 @@ def _compare_mapping(
         prefix: str = '', breadcrumb: str = '[%r]',
         check_y_not_x: bool = True
 ) -> str | None:
+    return context._run(_mapping_steps(
+        x, y, context, obj_for_class, prefix, breadcrumb, check_y_not_x
+    ))
+
 
+def _mapping_steps(
+        x: Mapping, y: Mapping, context: 'CompareContext', obj_for_class: Any,
+        prefix: str = '', breadcrumb: str = '[%r]',
+        check_y_not_x: bool = True, differing: Collection[Any] | None = None
+) -> Steps:
+    # If differing is supplied, values for other keys are already known to be the same.
     x_keys = set(x.keys())
     y_keys = set(y.keys())
     x_not_y = x_keys - y_keys
     y_not_x = y_keys - x_keys
+    if differing is not None and not (differing or x_not_y or (check_y_not_x and y_not_x)):
+        return None
     same = []
     diffs = []
-    for key in sorted_by_repr(x_keys.intersection(y_keys)):
-        if context.different(x[key], y[key], breadcrumb % (key, )):
-            labelled_x = context.label('x', safe_pformat(x[key]))
-            labelled_y = context.label('y', safe_pformat(y[key]))
-            diffs.append(f'{safe_repr(key)}: {labelled_x} != {labelled_y}')
+    known_equal = context._known_equal
+    for key in context.sorted_by_repr(x_keys.intersection(y_keys)):
+        if differing is not None and key not in differing:
+            same.append(key)
+            continue
+        x_value, y_value = x[key], y[key]
+        if not known_equal(x_value, y_value) and (yield x_value, y_value, breadcrumb, key):
+            diffs.append(_describe_values(context, key, x_value, y_value))
         else:
             same.append(key)
 
     if not (x_not_y or (check_y_not_x and y_not_x) or diffs):
         return None
+    return _describe_mapping(
+        context, obj_for_class, prefix, same, diffs,
+        [(key, x[key]) for key in context.sorted_by_repr(x_not_y)],
+        [(key, y[key]) for key in context.sorted_by_repr(y_not_x)],
+    )
+
+
+def _describe_values(context: 'CompareContext', key: Any, x_value: Any, y_value: Any) -> str:
+    labelled_x = context.label('x', context.safe_pformat(x_value))
+    labelled_y = context.label('y', context.safe_pformat(y_value))
+    return f'{context.safe_repr(key)}: {labelled_x} != {labelled_y}'
+
 
+def _describe_mapping(
+        context: 'CompareContext', obj_for_class: Any, prefix: str,
+        same: list[Any], diffs: list[str],
+        x_not_y: Sequence[tuple[Any, Any]] = (), y_not_x: Sequence[tuple[Any, Any]] = (),
+) -> str:
     if obj_for_class is not_there:
         lines = []
     else:
@@ -423,25 +1084,34 @@ def _compare_mapping(
             same = sorted(same)
         except TypeError:
             pass
-        lines.extend(('', f'{prefix}same:', safe_repr(same)))
+        lines.extend(('', f'{prefix}same:', context.safe_repr(same)))
 
     x_label = context.x_label or 'first'
     y_label = context.y_label or 'second'
 
     if x_not_y:
         lines.extend(('', f'{prefix}in {x_label} but not {y_label}:'))
-        for key in sorted_by_repr(x_not_y):
-            lines.append(f'{safe_repr(key)}: {safe_pformat(x[key])}')
+        for key, value in x_not_y:
+            lines.append(f'{context.safe_repr(key)}: {context.safe_pformat(value)}')
     if y_not_x:
         lines.extend(('', f'{prefix}in {y_label} but not {x_label}:'))
-        for key in sorted_by_repr(y_not_x):
-            lines.append(f'{safe_repr(key)}: {safe_pformat(y[key])}')
+        for key, value in y_not_x:
+            lines.append(f'{context.safe_repr(key)}: {context.safe_pformat(value)}')
     if diffs:
         lines.extend(('', f"{prefix or 'values '}differ:"))
         lines.extend(diffs)
     return '\n'.join(lines)
 
 
+# The generators CompareContext uses in place of calling these comparers:
+_steps_for: dict[Callable[..., str | None], Callable[..., Steps]] = {
+    compare_dict: _dict_steps,
+    compare_object: _object_steps,
+    compare_sequence: _sequence_steps,
+    compare_tuple: _tuple_steps,
+}
+
+
 def compare_set(x: set, y: set, context: 'CompareContext') -> str | None:
     """
     Returns a textual description of the differences between the two
@@ -457,13 +1127,13 @@ def compare_set(x: set, y: set, context: 'CompareContext') -> str | None:
     if x_not_y:
         lines.extend((
             f'in {x_label} but not {y_label}:',
-            safe_pformat(sorted_by_repr(x_not_y)),
+            context.safe_pformat(context.sorted_by_repr(x_not_y)),
             '',
             ))
     if y_not_x:
         lines.extend((
             f'in {y_label} but not {x_label}:',
-            safe_pformat(sorted_by_repr(y_not_x)),
+            context.safe_pformat(context.sorted_by_repr(y_not_x)),
             '',
             ))
     return '\n'.join(lines)+'\n'
@@ -488,6 +1158,33 @@ def split_repr(text: str) -> str:
     return '\n'.join(parts)
 
 
+#: Strings with no newlines that are longer than this are shown as a window of
+#: ``TEXT_WINDOW`` characters either side of where they first differ.
+LONG_LINE_THRESHOLD = 200
+TEXT_WINDOW = 40
+
+
+def _first_difference(x: str, y: str, chunk: int = 4096) -> int:
+    # Find the first chunk that differs without a Python loop over every character:
+    start = 0
+    while x[start:start + chunk] == y[start:start + chunk]:
+        start += chunk
+    x_chunk, y_chunk = x[start:start + chunk], y[start:start + chunk]
+    for index, (x_char, y_char) in enumerate(zip(x_chunk, y_chunk)):
+        if x_char != y_char:
+            return start + index
+    return start + min(len(x_chunk), len(y_chunk))
+
+
+def _window(text: str, start: int, end: int) -> str:
+    window = repr(text[start:end])
+    if start:
+        window = f'<{start} characters>{window}'
+    if end < len(text):
+        window += f'<{len(text) - end} more characters>'
+    return window
+
+
 def compare_text(
         x: str,
         y: str,
@@ -495,6 +1192,7 @@ def compare_text(
         blanklines: bool = True,
         trailing_whitespace: bool = True,
         show_whitespace: bool = False,
+        differ: Differ | None = None,
 ) -> str | None:
     """
     Returns an informative string describing the differences between the two
@@ -512,7 +1210,11 @@ def compare_text(
     :param show_whitespace: If `True`, then whitespace characters in
                             multi-line strings will be replaced with their
                             representations.
+
+    :param differ: The differ passed to :func:`diff` when comparing multi-line strings.
     """
+    if x == y:
+        return None
     if not trailing_whitespace:
         x = trailing_whitespace_re.sub('', x)
         y = trailing_whitespace_re.sub('', y)
@@ -521,29 +1223,136 @@ def compare_text(
         y = strip_blank_lines(y)
     if x == y:
         return None
-    labelled_x = context.label('x', repr(x))
-    labelled_y = context.label('y', repr(y))
     if len(x) > 10 or len(y) > 10:
         if '\n' in x or '\n' in y:
             if show_whitespace:
                 x = split_repr(x)
                 y = split_repr(y)
-            message = '\n' + diff(x, y, context.x_label, context.y_label)
+            message = '\n' + diff(x, y, context.x_label, context.y_label, differ)
+        elif len(x) > LONG_LINE_THRESHOLD or len(y) > LONG_LINE_THRESHOLD:
+            index = _first_difference(x, y)
+            start = max(index - TEXT_WINDOW, 0)
+            end = index + TEXT_WINDOW
+            message = '\n%s\n!=\n%s\n(first difference at character %i)' % (
+                context.label('x', _window(x, start, end)),
+                context.label('y', _window(y, start, end)),
+                index,
+            )
         else:
-            message = '\n%s\n!=\n%s' % (labelled_x, labelled_y)
+            message = '\n%s\n!=\n%s' % (
+                context.label('x', context.safe_repr(x)), context.label('y', context.safe_repr(y))
+            )
     else:
-        message = labelled_x+' != '+labelled_y
+        message = '%s != %s' % (
+            context.label('x', context.safe_repr(x)), context.label('y', context.safe_repr(y))
+        )
     return message
 
 
 def compare_bytes(x: bytes, y: bytes, context: 'CompareContext') -> str | None:
     if x == y:
         return None
-    labelled_x = context.label('x', repr(x))
-    labelled_y = context.label('y', repr(y))
+    if len(x) > HEXDUMP_THRESHOLD or len(y) > HEXDUMP_THRESHOLD:
+        return compare_buffer(x, y, context)
+    labelled_x = context.label('x', context.safe_repr(x))
+    labelled_y = context.label('y', context.safe_repr(y))
     return '\n%s\n!=\n%s' % (labelled_x, labelled_y)
 
 
+#: :class:`bytes` longer than this are described using a hexdump.
+HEXDUMP_THRESHOLD = 256
+#: The number of differing regions in a buffer for which a hexdump is shown.
+HEXDUMP_REGIONS = 3
+#: The maximum number of 16 byte rows shown in the hexdump of each region.
+HEXDUMP_ROWS = 4
+
+_non_zero_re = re.compile(rb'[^\x00]+')
+
+
+def _byte_view(obj: Any) -> memoryview:
+    view = memoryview(obj)
+    if not view.c_contiguous:
+        # Only contiguous buffers can be cast, so this is the only case needing a copy:
+        view = memoryview(view.tobytes())
+    if view.format != 'B' or view.ndim != 1:
+        view = view.cast('B')
+    return view
+
+
+def _differing_regions(
+        x: memoryview, y: memoryview, chunk: int = 65536
+) -> Iterator[tuple[int, int]]:
+    # Yield the start and end of each run of differing bytes. Only a chunk of each buffer
+    # is copied at a time, as comparing bytes is much faster than comparing memoryviews.
+    length = min(len(x), len(y))
+    pending: tuple[int, int] | None = None
+    for start in range(0, length, chunk):
+        end = min(start + chunk, length)
+        x_chunk, y_chunk = x[start:end].tobytes(), y[start:end].tobytes()
+        if x_chunk == y_chunk:
+            continue
+        xor = int.from_bytes(x_chunk) ^ int.from_bytes(y_chunk)
+        for match in _non_zero_re.finditer(xor.to_bytes(end - start)):
+            run = start + match.start(), start + match.end()
+            if pending is not None and pending[1] == run[0]:
+                pending = pending[0], run[1]
+            else:
+                if pending is not None:
+                    yield pending
+                pending = run
+    if len(x) != len(y):
+        if pending is not None and pending[1] == length:
+            pending = pending[0], max(len(x), len(y))
+        else:
+            if pending is not None:
+                yield pending
+            pending = length, max(len(x), len(y))
+    if pending is not None:
+        yield pending
+
+
+def _hexdump(view: memoryview, start: int, end: int) -> str:
+    lines = []
+    for offset in range(start, min(end, len(view)), 16):
+        row = view[offset:offset + 16].tobytes()
+        hex_ = ' '.join(f'{byte:02x}' for byte in row[:8])
+        if len(row) > 8:
+            hex_ += '  ' + ' '.join(f'{byte:02x}' for byte in row[8:])
+        text = ''.join(chr(byte) if 32 <= byte < 127 else '.' for byte in row)
+        lines.append(f'{offset:08x}  {hex_:<48}  |{text}|')
+    return '\n'.join(lines) if lines else '<no bytes>'
+
+
+def compare_buffer(x: Any, y: Any, context: 'CompareContext') -> str | None:
+    """
+    Compare two objects supporting the buffer protocol, such as :class:`bytearray`,
+    :class:`memoryview`, :class:`array.array` or :class:`mmap.mmap`, byte for byte.
+    The number of differing regions is reported along with a hexdump of the first
+    ``HEXDUMP_REGIONS`` of them.
+    """
+    x_view, y_view = _byte_view(x), _byte_view(y)
+    regions = _differing_regions(x_view, y_view)
+    shown = list(islice(regions, HEXDUMP_REGIONS))
+    if not shown:
+        return None
+    count = len(shown) + sum(1 for _ in regions)
+    x_label, y_label = context.x_label or 'first', context.y_label or 'second'
+    lines = [
+        f'{count} differing region{"s" if count > 1 else ""}, the first at offset {shown[0][0]}'
+    ]
+    if len(x_view) != len(y_view):
+        lines.append(f'lengths differ: {len(x_view)} != {len(y_view)}')
+    for start, end in shown:
+        dump_start = max(start // 16 * 16 - 16, 0)
+        dump_end = min(-(-end // 16) * 16 + 16, dump_start + HEXDUMP_ROWS * 16)
+        lines.append(f'\n@@ {start}-{end} @@')
+        lines.append(f'{x_label}:\n{_hexdump(x_view, dump_start, dump_end)}')
+        lines.append(f'{y_label}:\n{_hexdump(y_view, dump_start, dump_end)}')
+    if count > len(shown):
+        lines.append(f'\n<{count - len(shown)} more regions>')
+    return '\n'.join(lines)
+
+
 def compare_call(x: _Call, y: _Call, context: 'CompareContext') -> str | None:
     if x == y:
         return None
@@ -1,11 +1,20 @@
+import os
+import sys
+from array import array
 from collections.abc import Iterable
+from concurrent.futures import Executor, Future
 from contextlib import contextmanager
-from dataclasses import dataclass
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from datetime import datetime, time
 from decimal import Decimal
 from functools import partial as partial_type
+from hashlib import blake2b
 from inspect import signature
+from itertools import chain
+from mmap import mmap
 from pathlib import Path
+from time import perf_counter
 from types import GeneratorType
 from typing import (
     Any,
@@ -19,25 +28,38 @@ from typing import (
 )
 from typing import _GenericAlias as GenericAlias  # type: ignore[attr-defined]
 from unittest.mock import call as unittest_mock_call
+from warnings import warn
+from weakref import WeakKeyDictionary
+import tracemalloc
 
 from testfixtures import not_there, singleton
 from testfixtures.mock import mock_call
+from testfixtures.resolve import type_name
 from .comparers import *
+from .comparers import Steps, _numerically_equal, _steps_for
 
 # Some common types that are immutable, for optimisation purposes within CompareContext
 IMMUTABLE_TYPEs = str, bytes, int, float, tuple, type(None)
 
+# Types whose repr is cheap enough that caching it would cost more than it saves:
+CHEAP_REPR_TYPES = frozenset((str, bytes, int, float, bool, type(None)))
+
 # Container types whose `__eq__` delegates to their elements. When per-type
 # ignore_eq is in play, we can't trust `x == y` on these because nested
 # instances of an ignored type would silently leak through.
 CONTAINER_TYPES = list, tuple, dict, set, frozenset
 
+# Top-level sequences and mappings with fewer items in common than this are always
+# compared serially, even when workers are supplied to compare():
+PARALLEL_THRESHOLD = 10_000
+
 # Things that are iterable, but should not be treated as such.
 UNSAFE_ITERABLES = str, bytes, dict, GenericAlias
 
 
 Comparer = Callable[[Any, Any, 'CompareContext'], str | None]
 Comparers: TypeAlias = dict[type, Comparer]
+Registration = Callable[['Registry'], None]
 
 
 DEFAULT_COMPARERS: Comparers = {
@@ -48,6 +70,10 @@ DEFAULT_COMPARERS: Comparers = {
     tuple: compare_tuple,
     str: compare_text,
     bytes: compare_bytes,
+    bytearray: compare_buffer,
+    memoryview: compare_buffer,
+    array: compare_buffer,
+    mmap: compare_buffer,
     int: compare_simple,
     float: compare_simple,
     Decimal: compare_simple,
@@ -63,13 +89,39 @@ DEFAULT_COMPARERS: Comparers = {
 }
 
 
+_option_names_cache: WeakKeyDictionary[Comparer, frozenset[str]] = WeakKeyDictionary()
+
+
+def _option_names(comparer: Comparer) -> frozenset[str]:
+    # inspect.signature is slow, and the same comparers get passed to compare() repeatedly:
+    try:
+        return _option_names_cache[comparer]
+    except (KeyError, TypeError):
+        pass
+    options = frozenset(tuple(signature(comparer).parameters)[3:])
+    try:
+        _option_names_cache[comparer] = options
+    except TypeError:
+        # can't be weakly referenced, so can't be cached
+        pass
+    return options
+
+
 @dataclass
 class Registry:
     comparers: dict[type, Comparer]
     all_option_names: set[str]
-    options_for: dict[Comparer, set[str]]
+    options_for: dict[Comparer, frozenset[str]]
     ignore_eq_types: set[type]
+    deferred: dict[str, Registration] = field(default_factory=dict)
     original: "Registry | None" = None
+    # The registry an overlay reads through to for anything it doesn't have itself:
+    parent: "Registry | None" = None
+    # The comparer for each pair of types, weakly keyed so that classes created in tests
+    # can still be garbage collected:
+    _dispatch: WeakKeyDictionary[type, WeakKeyDictionary[type, Comparer]] = field(
+        default_factory=WeakKeyDictionary, init=False, repr=False, compare=False
+    )
 
     @staticmethod
     def _shared_mro(x: Any, y: Any) -> Iterable[type]:
@@ -82,10 +134,25 @@ class Registry:
         if strict and type(x) is not type(y):
             return compare_with_type
 
+        # Everything below depends only on the types involved, so cache it:
+        x_type = type(x)
+        by_y_type = self._dispatch.get(x_type)
+        if by_y_type is None:
+            by_y_type = self._dispatch[x_type] = WeakKeyDictionary()
+        y_type = type(y)
+        comparer = by_y_type.get(y_type)
+        if comparer is None:
+            comparer = by_y_type[y_type] = self._lookup(x, y)
+        return comparer
+
+    def _lookup(self, x: Any, y: Any) -> Comparer:
         for class_ in self._shared_mro(x, y):
-            comparer = self.comparers.get(class_)
-            if comparer:
-                return comparer
+            registry: Registry | None = self
+            while registry is not None:
+                comparer = registry.comparers.get(class_)
+                if comparer:
+                    return comparer
+                registry = registry.parent
 
         # fallback for iterables
         if ((isinstance(x, Iterable) and isinstance(y, Iterable)) and not
@@ -95,18 +162,36 @@ class Registry:
 
         return compare_object
 
+    def option_names(self, comparer: Comparer) -> frozenset[str] | None:
+        registry: Registry | None = self
+        while registry is not None:
+            options = registry.options_for.get(comparer)
+            if options is not None:
+                return options
+            registry = registry.parent
+        return None
+
+    def invalid_options(self, names: Iterable[str]) -> set[str]:
+        invalid = set(names)
+        registry: Registry | None = self
+        while invalid and registry is not None:
+            invalid -= registry.all_option_names
+            registry = registry.parent
+        return invalid
+
     def __setitem__(self, key: type, value: Comparer) -> None:
-        options = set(tuple(signature(value).parameters)[3:])
+        options = _option_names(value)
         self.options_for[value] = options
         self.all_option_names |= options
         self.comparers[key] = value
+        self._dispatch.clear()
 
     @classmethod
     def initial(cls, comparers: Comparers | None = None) -> Self:
         registry = cls(
             comparers={},
             all_option_names = {'ignore_attributes'},
-            options_for = {compare_object: {'ignore_attributes'}},
+            options_for = {compare_object: frozenset({'ignore_attributes'})},
             ignore_eq_types = set(),
         )
         for name, value in (DEFAULT_COMPARERS if comparers is None else comparers).items():
@@ -119,14 +204,51 @@ class Registry:
             all_option_names = self.all_option_names.copy(),
             options_for = self.options_for.copy(),
             ignore_eq_types = self.ignore_eq_types.copy(),
+            deferred = self.deferred.copy(),
+            parent = self.parent,
         )
 
     def overlay_with(self, comparers: Comparers) -> Self:
-        registry = self.copy()
+        """
+        Return a registry containing the supplied comparers that reads through
+        to this registry for everything else, without copying it.
+        """
+        registry = type(self)(
+            comparers={},
+            all_option_names=set(),
+            options_for={},
+            ignore_eq_types=self.ignore_eq_types,
+            parent=self,
+        )
         for name, value in comparers.items():
             registry[name] = value
         return registry
 
+    def defer(self, module_name: str, registration: Registration) -> None:
+        """
+        Call ``registration`` with this registry, but only once the named module
+        has been imported by something else.
+        """
+        self.deferred[module_name] = registration
+
+    def resolve_deferred(self) -> None:
+        if not self.deferred:
+            return
+        for module_name in [name for name in self.deferred if name in sys.modules]:
+            # get with a default in case another thread got here first:
+            registration = self.deferred.get(module_name)
+            if registration is None:
+                continue
+            try:
+                registration(self)
+            except ImportError:
+                # the integration can't be used with what's installed, so skip it
+                pass
+            except Exception as e:
+                # a broken integration shouldn't stop anything else being compared:
+                warn(f'Could not register comparers for {module_name}: {e!r}')
+            self.deferred.pop(module_name, None)
+
     def install(self) -> Self:
         global _registry
         self.original = _registry
@@ -141,6 +263,112 @@ class Registry:
 
 _registry = Registry.initial()
 
+# Instances of the built-in types covered by fingerprints, along with the comparers used
+# for them by default. Fingerprints are only used when these are unchanged:
+_FINGERPRINT_SAMPLES: tuple[Any, ...] = [], (), {}, '', b'', 0, False, 0.0, None
+_FINGERPRINT_COMPARERS = tuple(_registry.lookup(s, s, False) for s in _FINGERPRINT_SAMPLES)
+
+_FINGERPRINT_TAGS: dict[type, str] = {list: 'l', tuple: 't', dict: 'd'}
+
+# The repr of an instance of one of these types is only the same as that of an equal
+# instance of the same type, apart from NaN, and never contains a newline:
+_FINGERPRINT_LEAVES = frozenset((str, bytes, int, float, bool, type(None)))
+
+Fingerprints: TypeAlias = dict[int, tuple[Any, str | None]]
+
+
+def _digest(text: str) -> str:
+    return blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+def _children(node: Any) -> Iterable[Any]:
+    return chain.from_iterable(node.items()) if type(node) is dict else node
+
+
+def _fingerprint_leaves(node: Any) -> str | None:
+    # Fingerprint a container that only contains leaves, which is common enough to be
+    # worth doing without visiting each leaf in Python. An empty string is returned if
+    # it contains NaN, and None if it contains anything other than leaves.
+    types = set(map(type, node))
+    if type(node) is dict:
+        types.update(map(type, node.values()))
+    if not types <= _FINGERPRINT_LEAVES:
+        return None
+    if float in types and any(value != value for value in _children(node)):
+        return ''
+    if type(node) is dict:
+        return _digest('d:' + '\n'.join(sorted(map(repr, node.items()))))
+    return _digest(repr(node))
+
+
+def _fingerprint_children(node: Any, fingerprints: Fingerprints) -> str | None:
+    # Fingerprint a container once all the containers in it have been fingerprinted.
+    encodings = []
+    for child in _children(node):
+        type_ = type(child)
+        if type_ in _FINGERPRINT_LEAVES:
+            if type_ is float and child != child:
+                return None
+            encodings.append(repr(child))
+        else:
+            digest = fingerprints[id(child)][1]
+            if digest is None:
+                return None
+            encodings.append('c' + digest)
+    if type(node) is dict:
+        encodings = sorted(
+            encodings[i] + '\n' + encodings[i + 1] for i in range(0, len(encodings), 2)
+        )
+    return _digest(_FINGERPRINT_TAGS[type(node)] + '/' + '\n'.join(encodings))
+
+
+def _fingerprint(obj: list | tuple | dict, fingerprints: Fingerprints) -> str | None:
+    # Return a digest of a tree of dicts, lists, tuples and leaves that is only the same
+    # for another tree that is exactly equal, or None if the tree contains anything else.
+    # The digest of every container in the tree is added to fingerprints, and an explicit
+    # stack is used so the depth of the tree is not limited by the recursion limit.
+    entry = fingerprints.get(id(obj))
+    if entry is not None:
+        return entry[1]
+    # The containers whose children are being fingerprinted, from the root down:
+    in_progress: dict[int, Any] = {}
+    # Each container is visited before and after its children have been fingerprinted:
+    stack: list[tuple[Any, bool]] = [(obj, False)]
+    while stack:
+        node, visited = stack.pop()
+        node_id = id(node)
+        digest: str | None
+        if visited:
+            del in_progress[node_id]
+            digest = _fingerprint_children(node, fingerprints)
+        elif node_id in fingerprints:
+            continue
+        elif node_id in in_progress:
+            # A container that contains itself can't be fingerprinted, nor can any
+            # container that contains it:
+            for container in in_progress.values():
+                fingerprints[id(container)] = container, None
+            break
+        else:
+            digest = _fingerprint_leaves(node)
+            if digest is None:
+                pending = []
+                for child in _children(node):
+                    type_ = type(child)
+                    if type_ in _FINGERPRINT_TAGS:
+                        if id(child) not in fingerprints:
+                            pending.append((child, False))
+                    elif type_ not in _FINGERPRINT_LEAVES:
+                        break
+                else:
+                    in_progress[node_id] = node
+                    stack.append((node, True))
+                    stack.extend(pending)
+                    continue
+            digest = digest or None
+        fingerprints[node_id] = node, digest
+    return fingerprints[id(obj)][1]
+
 
 @contextmanager
 def registry(comparers: Comparers | None = None) -> Iterator[Registry]:
@@ -152,6 +380,109 @@ def registry(comparers: Comparers | None = None) -> Iterator[Registry]:
         _registry.uninstall()
 
 
+@dataclass
+class CompareStats:
+    """
+    Statistics gathered from the calls to :func:`compare` made within
+    :func:`compare_stats`. Times are in seconds, and the time spent in a comparer
+    doesn't include the time spent comparing the elements it hands off.
+    """
+
+    #: The number of pairs of elements handed to a comparer.
+    nodes: int = 0
+    #: The deepest nesting of elements handed to a comparer.
+    max_depth: int = 0
+    #: The number of objects replaced with :class:`~testfixtures.comparers.AlreadySeen`
+    #: markers as they had been seen before.
+    already_seen: int = 0
+    #: The time spent in each comparer.
+    comparer_times: dict[Comparer, float] = field(default_factory=dict)
+    #: The time spent comparing elements of each type.
+    type_times: dict[type, float] = field(default_factory=dict)
+    #: The time spent rendering objects using
+    #: :meth:`~testfixtures.comparison.CompareContext.safe_repr`.
+    repr_time: float = 0.0
+    #: The time spent rendering objects using
+    #: :meth:`~testfixtures.comparison.CompareContext.safe_pformat`.
+    pformat_time: float = 0.0
+    #: The peak memory allocated, in bytes, if ``trace_memory`` was passed to
+    #: :func:`compare_stats`.
+    peak_memory: int | None = None
+
+    def __post_init__(self) -> None:
+        # The comparers and types of the elements currently being compared:
+        self._stack: list[tuple[Comparer, type]] = []
+        self._last = 0.0
+
+    def _charge(self, now: float) -> None:
+        comparer, type_ = self._stack[-1]
+        elapsed = now - self._last
+        self.comparer_times[comparer] = self.comparer_times.get(comparer, 0.0) + elapsed
+        self.type_times[type_] = self.type_times.get(type_, 0.0) + elapsed
+
+    def _push(self, comparer: Comparer, type_: type) -> None:
+        now = perf_counter()
+        if self._stack:
+            self._charge(now)
+        self._stack.append((comparer, type_))
+        self._last = now
+        self.nodes += 1
+        self.max_depth = max(self.max_depth, len(self._stack))
+
+    def _pop(self) -> None:
+        now = perf_counter()
+        self._charge(now)
+        self._stack.pop()
+        self._last = now
+
+    def __str__(self) -> str:
+        lines = [
+            f'nodes: {self.nodes}',
+            f'max depth: {self.max_depth}',
+            f'already seen: {self.already_seen}',
+            f'repr time: {self.repr_time:.6f}',
+            f'pformat time: {self.pformat_time:.6f}',
+        ]
+        if self.peak_memory is not None:
+            lines.append(f'peak memory: {self.peak_memory}')
+        for title, times in ('comparer', self.comparer_times), ('type', self.type_times):
+            lines.append(f'time by {title}:')
+            for obj, time_ in sorted(times.items(), key=lambda item: -item[1]):
+                lines.append(f'  {type_name(obj)}: {time_:.6f}')
+        return '\n'.join(lines)
+
+
+_stats: ContextVar[CompareStats | None] = ContextVar('_stats', default=None)
+
+
+@contextmanager
+def compare_stats(trace_memory: bool = False) -> Iterator[CompareStats]:
+    """
+    A context manager that gathers :class:`CompareStats` for the calls to
+    :func:`compare` made within it.
+
+    :param trace_memory: If ``True``, :mod:`tracemalloc` is used to record the
+                         peak memory allocated within the context manager. If
+                         something else is already tracing, its peak is left
+                         alone, so the peak recorded is an upper bound.
+    """
+    stats = CompareStats()
+    token = _stats.set(stats)
+    started = trace_memory and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    # Memory already allocated when something else started tracing isn't ours:
+    initial = tracemalloc.get_traced_memory()[0] if trace_memory else 0
+    try:
+        yield stats
+    finally:
+        _stats.reset(token)
+        if trace_memory:
+            stats.peak_memory = tracemalloc.get_traced_memory()[1] - initial
+        if started:
+            tracemalloc.stop()
+
+
 @overload
 def register(type_: type, comparer: Comparer) -> None: ...
 @overload
@@ -200,10 +531,14 @@ class CompareContext:
             ignore_eq: bool | type | Iterable[type] = False,
             comparers: Comparers | None = None,
             options: dict[str, Any] | None = None,
+            render_limits: RenderLimits | None = None,
     ):
+        # Any library with a deferred registration must have been imported for
+        # one of its instances to be here, so bind the comparers now:
+        _registry.resolve_deferred()
         self._registry = _registry.overlay_with(comparers) if comparers else _registry
         if options:
-            invalid = set(options) - self._registry.all_option_names
+            invalid = self._registry.invalid_options(options)
             if invalid:
                 raise TypeError(
                     'The following options are not valid: ' + ', '.join(invalid)
@@ -213,17 +548,38 @@ class CompareContext:
         self.recursive: bool = recursive
         self.strict: bool = strict
         self.ignore_eq_all: bool = False
-        self.ignore_eq_types: set[type] = set(self._registry.ignore_eq_types)
+        # Only copied if it needs to be extended:
+        self.ignore_eq_types: set[type] = self._registry.ignore_eq_types
         if ignore_eq is True:
             self.ignore_eq_all = True
         elif ignore_eq is False:
             pass
         elif isinstance(ignore_eq, type):
-            self.ignore_eq_types.add(ignore_eq)
+            self.ignore_eq_types = self.ignore_eq_types | {ignore_eq}
         else:
-            self.ignore_eq_types.update(ignore_eq)
+            self.ignore_eq_types = self.ignore_eq_types | set(ignore_eq)
         self.options: dict[str, Any] = options or {}
-        self.message: str = ''
+        self.render_limits: RenderLimits | None = render_limits
+        # Renderings of objects keyed by their ids. The objects are kept with them so
+        # the ids can't be reused by other objects during the comparison:
+        self._reprs: dict[int, tuple[Any, str]] = {}
+        self._pformats: dict[int, tuple[Any, str]] = {}
+        self._full_reprs = self._reprs if render_limits is None else {}
+        self._stats: CompareStats | None = _stats.get()
+        # The attributes compare_object ignores for each type, keyed by the id of
+        # the ignore_attributes option, which is kept alive alongside them:
+        self._ignored_attributes: dict[tuple[int, type], tuple[Any, set[str]]] = {}
+        # When == can't be used for containers, matching fingerprints show they are equal
+        # without comparing everything in them, provided their contents are compared as usual:
+        self._fingerprints: Fingerprints | None = None
+        if (strict or self.ignore_eq_all or self.ignore_eq_types) and all(
+            self._registry.lookup(sample, sample, strict) is comparer
+            for sample, comparer in zip(_FINGERPRINT_SAMPLES, _FINGERPRINT_COMPARERS)
+        ):
+            self._fingerprints = {}
+        # Parts of the message, with a slot reserved for each pair of elements
+        # currently being compared:
+        self._message: list[str] = []
         self.breadcrumbs: List[str] = []
         self._seen: dict[int, str] = {}
 
@@ -259,6 +615,58 @@ class CompareContext:
             r += ' ('+label+')'
         return r
 
+    @property
+    def message(self) -> str:
+        """
+        The description of the differences found so far.
+        """
+        return ''.join(self._message)
+
+    def safe_repr(self, obj: Any) -> str:
+        """
+        Render the object using :func:`~testfixtures.comparers.safe_repr`, respecting any
+        :class:`~testfixtures.comparers.RenderLimits` passed to :func:`~testfixtures.compare`.
+        """
+        if type(obj) in CHEAP_REPR_TYPES:
+            return safe_repr(obj, self.render_limits)
+        rendered = self._reprs.get(id(obj))
+        if rendered is None:
+            stats = self._stats
+            start = perf_counter() if stats is not None else 0
+            rendered = self._reprs[id(obj)] = obj, safe_repr(obj, self.render_limits)
+            if stats is not None:
+                stats.repr_time += perf_counter() - start
+        return rendered[1]
+
+    def safe_pformat(self, obj: Any) -> str:
+        """
+        Render the object using :func:`~testfixtures.comparers.safe_pformat`, respecting any
+        :class:`~testfixtures.comparers.RenderLimits` passed to :func:`~testfixtures.compare`.
+        """
+        rendered = self._pformats.get(id(obj))
+        if rendered is None:
+            stats = self._stats
+            start = perf_counter() if stats is not None else 0
+            rendered = self._pformats[id(obj)] = obj, safe_pformat(obj, self.render_limits)
+            if stats is not None:
+                stats.pformat_time += perf_counter() - start
+        return rendered[1]
+
+    def _full_repr(self, obj: Any) -> str:
+        if type(obj) in CHEAP_REPR_TYPES:
+            return safe_repr(obj)
+        rendered = self._full_reprs.get(id(obj))
+        if rendered is None:
+            rendered = self._full_reprs[id(obj)] = obj, safe_repr(obj)
+        return rendered[1]
+
+    def sorted_by_repr(self, items: Iterable[Any]) -> list[Any]:
+        """
+        Sort the items using :func:`~testfixtures.comparers.sorted_by_repr`. Each object
+        is only rendered once for the whole comparison, whether to sort it or describe it.
+        """
+        return sorted(items, key=self._full_repr)
+
     def _separator(self) -> str:
         return '\n\nWhile comparing %s: ' % ''.join(self.breadcrumbs[1:])
 
@@ -270,95 +678,266 @@ class CompareContext:
         id_ = id(obj)
         breadcrumb_ = self._seen.get(id_)
         if breadcrumb_ is not None:
+            if self._stats is not None:
+                self._stats.already_seen += 1
             return AlreadySeen(id_, obj, breadcrumb_)
         else:
             self._seen[id_] = breadcrumb
             return obj
 
+    def _checkpoint(self) -> int:
+        return len(self._seen)
+
+    def _rollback(self, checkpoint: int) -> None:
+        # Forget objects seen since the checkpoint, which relies on dicts being ordered:
+        seen = self._seen
+        while len(seen) > checkpoint:
+            seen.popitem()
+
     def qualified_equals(self, x: Any, y: Any) -> bool:
         """
         Determines if two objects are equal, taking ``strict``, ``ignore_eq`` and instances
         of :class:`~testfixtures.comparers.AlreadySeen` into account.
         """
-        pair = x, y
+        # This is called for almost every element compared, so avoids allocating.
         # When either side is an AlreadySeen wrapper for the other (same
         # underlying id), it's the same object we already handled —
         # equal by identity. Skipping __eq__ here keeps that guarantee
         # when __eq__ is broken, strict about unknown operands, or being
         # bypassed via ignore_eq.
-        if any(type(o) is AlreadySeen for o in pair):
-            a, b = (o.id if type(o) is AlreadySeen else id(o) for o in pair)
-            if a == b:
+        x_seen = type(x) is AlreadySeen
+        y_seen = type(y) is AlreadySeen
+        if x_seen or y_seen:
+            if (x.id if x_seen else id(x)) == (y.id if y_seen else id(y)):
                 return True
-        # AlreadySeen.__eq__ delegates to the wrapped object, so let
-        # normal equality run when the wrapper is on the right.
-        if type(y) is AlreadySeen:
-            return x == y
+            # AlreadySeen.__eq__ delegates to the wrapped object, so let
+            # normal equality run when the wrapper is on the right.
+            if y_seen:
+                return x == y
         if self.strict or self.ignore_eq_all:
             return False
         # Containers delegate __eq__ to their elements, so when any
         # ignored type is in play we must block container == as well.
         types = self.ignore_eq_types
-        if types and any(
-            isinstance(o, CONTAINER_TYPES) or not types.isdisjoint(type(o).__mro__)
-            for o in pair
+        if types and (
+            isinstance(x, CONTAINER_TYPES) or not types.isdisjoint(type(x).__mro__) or
+            isinstance(y, CONTAINER_TYPES) or not types.isdisjoint(type(y).__mro__)
         ):
             return False
         return x == y
 
-    def call(self, comparer: Comparer, x: Any, y: Any) -> str | None:
+    def _options(self, comparer: Comparer) -> dict[str, Any]:
         kw = {}
-        option_names = self._registry.options_for.get(comparer)
+        option_names = self._registry.option_names(comparer)
         if option_names:
             for name in option_names:
                 value = self.options.get(name, not_there)
                 if value is not not_there:
                     kw[name] = value
-        return comparer(x, y, self, **kw)
+        return kw
+
+    def call(self, comparer: Comparer, x: Any, y: Any) -> str | None:
+        return comparer(x, y, self, **self._options(comparer))
 
-    def different(self, x: Any, y: Any, breadcrumb: str) -> bool | str | None:
+    def different(
+            self, x: Any, y: Any, breadcrumb: str, key: Any = not_there
+    ) -> bool | str | None:
         """
         Comparers can call this method to :ref:`hand off <custom-comparer-different>`
         comparison of elements within the objects they are currently comparing.
-        """
 
-        x = self._break_loops(x, breadcrumb)
-        y = self._break_loops(y, breadcrumb)
+        If ``key`` is supplied, ``breadcrumb`` is treated as a format string into
+        which it is interpolated, such as ``'[%r]'``, which is only done if the
+        elements turn out to be different.
+        """
+        return self._different(x, y, breadcrumb, key)
 
-        recursed = bool(self.breadcrumbs)
-        self.breadcrumbs.append(breadcrumb)
-        existing_message = self.message
-        self.message = ''
-        current_message = ''
+    def _different(
+            self,
+            x: Any,
+            y: Any,
+            breadcrumb: str,
+            key: Any = not_there,
+            checked: bool = False,
+            hints: dict[str, Any] | None = None,
+    ) -> bool | str | None:
+        outcome = self._enter(x, y, breadcrumb, key, checked, hints)
+        if isinstance(outcome, _Frame):
+            return self._run(outcome.steps, outcome)
+        return outcome
+
+    def _known_equal(self, x: Any, y: Any) -> bool:
+        # Most elements are equal, so check that before doing any bookkeeping.
+        # Objects already seen must be wrapped first, so they are left to _enter.
+        seen = self._seen
+        if seen and (id(x) in seen or id(y) in seen):
+            return False
         try:
+            if self.qualified_equals(x, y):
+                return True
+        except RecursionError:
+            return False
+        # The same object on both sides is quickly found to be equal once it has been seen:
+        fingerprints = self._fingerprints
+        if (fingerprints is None or x is y or
+                type(x) is not type(y) or type(x) not in _FINGERPRINT_TAGS):
+            return False
+        # Large containers of numbers can be checked more quickly than they can be
+        # fingerprinted:
+        equal = _numerically_equal(x, y)
+        if equal is not None:
+            return equal
+        fingerprint = _fingerprint(x, fingerprints)
+        return fingerprint is not None and fingerprint == _fingerprint(y, fingerprints)
+
+    def _enter(
+            self,
+            x: Any,
+            y: Any,
+            breadcrumb: str,
+            key: Any,
+            checked: bool = False,
+            hints: dict[str, Any] | None = None,
+    ) -> '_Frame | bool | str | None':
+        # Start comparing two elements, returning the result if it is known straight away
+        # or a frame for _run to drive if the comparer for them is implemented as steps.
+        # checked is True if _known_equal has already been called for the elements.
+        # hints are passed to the steps, and are only supplied for the comparers that
+        # accept them.
+        if not checked and self._known_equal(x, y):
+            return False
 
-            try:
-                if self.qualified_equals(x, y):
-                    return False
-            except RecursionError:
-                pass
-
-            comparer: Comparer = self._registry.lookup(x, y, self.strict)
-
-            result = self.call(comparer, x, y)
-            specific_comparer = comparer is not compare_simple
-
-            if result:
+        if key is not not_there:
+            # Keys are usually rendered to sort them, so use the same rendering here:
+            if breadcrumb == '[%r]':
+                breadcrumb = f'[{self._full_repr(key)}]'
+            else:
+                breadcrumb = breadcrumb % (key,)
 
-                if specific_comparer and recursed:
-                    current_message = self._separator()
+        x_ = self._break_loops(x, breadcrumb)
+        y_ = self._break_loops(y, breadcrumb)
+        # Wrapped objects, including y if it is the same object as x, need checking again:
+        checked = x_ is x and y_ is y
+        x, y = x_, y_
 
-                if specific_comparer or not recursed:
-                    current_message += result
+        frame = _Frame(bool(self.breadcrumbs), len(self._message))
+        self.breadcrumbs.append(breadcrumb)
+        self._message.append('')
+        result: str | None = None
+        try:
 
-                    if self.recursive:
-                        current_message += self.message
+            if not checked:
+                try:
+                    if self.qualified_equals(x, y):
+                        self._exit(frame, None)
+                        return False
+                except RecursionError:
+                    pass
 
+            comparer: Comparer = self._registry.lookup(x, y, self.strict)
+            frame.comparer = comparer
+            if self._stats is not None:
+                self._stats._push(comparer, type(x))
+            steps = _steps_for.get(comparer)
+            if steps is None:
+                result = self.call(comparer, x, y)
+            else:
+                frame.steps = steps(x, y, self, **self._options(comparer), **(hints or {}))
+                return frame
+
+        except BaseException:
+            self._exit(frame, None)
+            raise
+
+        return self._exit(frame, result)
+
+    def _exit(self, frame: '_Frame', result: str | None) -> str | None:
+        # Finish comparing the two elements for which the frame was entered.
+        slot = frame.slot
+        if slot is None:
             return result
+        if self._stats is not None and hasattr(frame, 'comparer'):
+            self._stats._pop()
+        message = self._message
+        specific_comparer = result and frame.comparer is not compare_simple
+        recursed = frame.recursed
+        if result and (specific_comparer or not recursed):
+            if specific_comparer and recursed:
+                message[slot] = self._separator() + result
+            else:
+                message[slot] = result
+            if not self.recursive:
+                del message[slot + 1:]
+        else:
+            del message[slot:]
+        self.breadcrumbs.pop()
+        return result
+
+    def _run(self, steps: Steps, frame: '_Frame | None' = None) -> str | None:
+        # Drive the steps of a comparer using an explicit stack rather than recursion,
+        # so that the depth of nesting is only limited by memory.
+        if frame is None:
+            frame = _Frame(steps=steps)
+        enter = self._enter
+        stack = [frame]
+        sent: bool | str | None = None
+        error: BaseException | None = None
+        while True:
+            frame = stack[-1]
+            steps = frame.steps
+            try:
+                if error is None:
+                    request = steps.send(sent)
+                else:
+                    request, error = steps.throw(error), None
+                # Keep going with these steps until they need a frame of their own:
+                while True:
+                    try:
+                        outcome = enter(*request, True)
+                    except BaseException as e:
+                        request = steps.throw(e)
+                        continue
+                    if isinstance(outcome, _Frame):
+                        break
+                    request = steps.send(outcome)
+            except StopIteration as stop:
+                stack.pop()
+                result = self._exit(frame, stop.value)
+                if not stack:
+                    return result
+                sent, error = result, None
+                continue
+            except BaseException as e:
+                stack.pop()
+                self._exit(frame, None)
+                if not stack:
+                    raise
+                error = e
+                continue
+            stack.append(outcome)
+            sent = None
+
+
+class _Frame:
+    # The state of comparing two elements using a comparer implemented as steps.
+
+    __slots__ = 'recursed', 'slot', 'comparer', 'steps'
+
+    comparer: Comparer
+    steps: Steps
 
-        finally:
-            self.message = existing_message + current_message
-            self.breadcrumbs.pop()
+    def __init__(
+            self,
+            recursed: bool = False,
+            slot: int | None = None,
+            steps: Steps | None = None,
+    ) -> None:
+        self.recursed = recursed
+        # The index of the part of the message reserved for these elements,
+        # None when not entered using CompareContext.different:
+        self.slot = slot
+        if steps is not None:
+            self.steps = steps
 
 
 def _resolve_lazy(source: Any) -> str:
@@ -372,6 +951,125 @@ def _resolve_lazy(source: Any) -> str:
 unspecified = singleton('unspecified')
 
 
+def _differences(
+        x_items: list[Any], y_items: list[Any], first_only: bool, context_args: dict[str, Any]
+) -> list[int]:
+    # Run in a worker to find the positions at which the two lists differ.
+    context = CompareContext(None, None, recursive=False, **context_args)
+    found = []
+    for i, (x_item, y_item) in enumerate(zip(x_items, y_items)):
+        if context.different(x_item, y_item, ''):
+            found.append(i)
+            if first_only:
+                break
+    return found
+
+
+def _pickled_differences(pickled: bytes) -> list[int]:
+    # Run in a worker process with arguments pickled by the caller, so that anything
+    # that can't be pickled is found before any work is sent.
+    from pickle import loads
+    return _differences(*loads(pickled))
+
+
+def _added_comparers(registry: Registry) -> Comparers:
+    # The comparers in effect for a registry and everything it reads through to that
+    # aren't defaults, so they can be sent to worker processes that may not have them.
+    chain = []
+    registry_: Registry | None = registry
+    while registry_ is not None:
+        chain.append(registry_.comparers)
+        registry_ = registry_.parent
+    comparers: Comparers = {}
+    for level in reversed(chain):
+        comparers.update(level)
+    return {
+        type_: comparer for type_, comparer in comparers.items()
+        if DEFAULT_COMPARERS.get(type_) is not comparer
+    }
+
+
+def _parallel_hints(
+        x: Any,
+        y: Any,
+        context: CompareContext,
+        workers: int | Executor,
+        context_args: dict[str, Any],
+) -> dict[str, Any] | None:
+    # Find where two large top-level sequences or mappings differ by comparing chunks of
+    # them in parallel, returning hints that let their comparer skip everything else.
+    type_ = type(x)
+    if type_ is not type(y) or type_ not in (list, tuple, dict):
+        return None
+    if context._registry.lookup(x, y, context.strict) not in (
+            compare_sequence, compare_tuple, compare_dict
+    ):
+        return None
+
+    keys: list[Any]
+    if type_ is dict:
+        keys = [key for key in x if key in y]
+        count = len(keys)
+    else:
+        count = min(len(x), len(y))
+    if count < PARALLEL_THRESHOLD:
+        return None
+
+    from concurrent.futures import ProcessPoolExecutor
+    from pickle import PicklingError, dumps
+
+    if isinstance(workers, Executor):
+        executor = workers
+        chunks = (os.cpu_count() or 1) * 4
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        chunks = workers * 4
+    in_processes = isinstance(executor, ProcessPoolExecutor)
+    if in_processes:
+        # Worker processes may not have the comparers registered in this one:
+        context_args = dict(
+            context_args,
+            comparers=_added_comparers(context._registry),
+            ignore_eq=context.ignore_eq_all or frozenset(context.ignore_eq_types),
+        )
+    size = -(-count // chunks)
+    futures: list[tuple[int, Future[list[int]]]] = []
+    try:
+        for start in range(0, count, size):
+            end = start + size
+            if type_ is dict:
+                chunk_keys = keys[start:end]
+                x_items = [x[key] for key in chunk_keys]
+                y_items = [y[key] for key in chunk_keys]
+            else:
+                x_items = x[start:end]
+                y_items = y[start:end]
+            args = x_items, y_items, type_ is not dict, context_args
+            if in_processes:
+                try:
+                    pickled = dumps(args)
+                except (PicklingError, AttributeError, TypeError):
+                    # Compare serially instead:
+                    return None
+                futures.append((start, executor.submit(_pickled_differences, pickled)))
+            else:
+                futures.append((start, executor.submit(_differences, *args)))
+        if type_ is dict:
+            return {'differing': {
+                keys[start + i] for start, future in futures for i in future.result()
+            }}
+        for start, future in futures:
+            found = future.result()
+            if found:
+                return {'start': start + found[0]}
+        return {'start': count}
+    finally:
+        for _, future in futures:
+            future.cancel()
+        if executor is not workers:
+            executor.shutdown()
+
+
 def compare(
         *args: Any,
         x: Any = unspecified,
@@ -387,6 +1085,8 @@ def compare(
         strict: bool = False,
         ignore_eq: bool | type | Iterable[type] = False,
         comparers: Comparers | None = None,
+        render_limits: RenderLimits | None = None,
+        workers: int | Executor | None = None,
         **options: Any
 ) -> str | None:
     """
@@ -446,6 +1146,15 @@ def compare(
                       be added to the comparer registry for the duration
                       of this call.
 
+    :param render_limits: If supplied, a :class:`~testfixtures.comparers.RenderLimits`
+                          bounding how much of each object is rendered in the
+                          message of the :class:`AssertionError`.
+
+    :param workers: If supplied, top-level lists, tuples and dicts with at least
+                    ``PARALLEL_THRESHOLD`` items in common are split into chunks
+                    that are compared in parallel. This can either be the number of
+                    processes to use or an :class:`~concurrent.futures.Executor`.
+
     Any other keyword parameters supplied will be passed to the functions
     that end up doing the comparison. See the
     :mod:`API documentation below <testfixtures.comparison>`
@@ -458,9 +1167,20 @@ def compare(
         x_label = x_label or 'expected'
         y_label = y_label or 'actual'
 
-    context = CompareContext(x_label, y_label, recursive, strict, ignore_eq, comparers, options)
+    context = CompareContext(
+        x_label, y_label, recursive, strict, ignore_eq, comparers, options, render_limits
+    )
     x, y = context.extract_args(args, x, y, expected, actual)
-    if not context.different(x, y, ''):
+    hints = None
+    checked = False
+    if workers is not None:
+        if context._known_equal(x, y):
+            return None
+        checked = True
+        hints = _parallel_hints(x, y, context, workers, dict(
+            strict=strict, ignore_eq=ignore_eq, comparers=comparers, options=options
+        ))
+    if not context._different(x, y, '', checked=checked, hints=hints):
         return None
 
     message = context.message
@@ -474,39 +1194,56 @@ def compare(
     return message
 
 
-try:
-    from django.db.models import Model
-    from .django import compare_model
-except ImportError:
-    pass
-else:
-    register(Model, compare_model, ignore_eq=True)
+def _register_deferred(registry: Registry, type_: type, comparer: Comparer) -> None:
+    # Don't clobber a comparer that was explicitly registered before the library was imported:
+    if type_ not in registry.comparers:
+        registry[type_] = comparer
+    registry.ignore_eq_types.add(type_)
 
 
-try:
-    from pandas import DataFrame as PandasDataFrame
-    from .pandas import compare_dataframe as compare_pandas_dataframe
-except ImportError:
-    pass
-else:
-    register(PandasDataFrame, compare_pandas_dataframe, ignore_eq=True)
+def _register_django(registry: Registry) -> None:
+    from django.db.models import Model, QuerySet
+    from .django import compare_model, compare_queryset
+    _register_deferred(registry, Model, compare_model)
+    _register_deferred(registry, QuerySet, compare_queryset)
 
 
-try:
-    from polars import DataFrame as PolarsDataFrame
-    from .polars import compare_dataframe as compare_polars_dataframe
-except ImportError:
-    pass
-else:
-    register(PolarsDataFrame, compare_polars_dataframe, ignore_eq=True)
+def _register_pandas(registry: Registry) -> None:
+    from pandas import DataFrame, Index, Series
+    from .pandas import compare_dataframe, compare_index, compare_series
+    _register_deferred(registry, DataFrame, compare_dataframe)
+    _register_deferred(registry, Series, compare_series)
+    _register_deferred(registry, Index, compare_index)
 
 
-try:
+def _register_polars(registry: Registry) -> None:
+    from polars import DataFrame, LazyFrame, Series
+    from .polars import compare_dataframe, compare_lazyframe, compare_series
+    _register_deferred(registry, DataFrame, compare_dataframe)
+    _register_deferred(registry, LazyFrame, compare_lazyframe)
+    _register_deferred(registry, Series, compare_series)
+
+
+def _register_arrow(registry: Registry) -> None:
+    from pyarrow import ChunkedArray, RecordBatch, Table
+    from .arrow import compare_chunked_array, compare_record_batch, compare_table
+    _register_deferred(registry, Table, compare_table)
+    _register_deferred(registry, RecordBatch, compare_record_batch)
+    _register_deferred(registry, ChunkedArray, compare_chunked_array)
+
+
+def _register_numpy(registry: Registry) -> None:
     from numpy import ndarray
     from numpy.ma import MaskedArray
     from .numpy import compare_masked_array, compare_ndarray
-except ImportError:
-    pass
-else:
-    register(ndarray, compare_ndarray, ignore_eq=True)
-    register(MaskedArray, compare_masked_array, ignore_eq=True)
+    _register_deferred(registry, ndarray, compare_ndarray)
+    _register_deferred(registry, MaskedArray, compare_masked_array)
+
+
+# Importing these libraries is expensive, so their comparers are only registered
+# once something else has imported them:
+_registry.defer('django.db.models', _register_django)
+_registry.defer('pandas', _register_pandas)
+_registry.defer('polars', _register_polars)
+_registry.defer('pyarrow', _register_arrow)
+_registry.defer('numpy', _register_numpy)
@@ -1,9 +1,13 @@
 import re
 from abc import ABC, abstractmethod
-from collections import OrderedDict
+from bisect import bisect_right
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
 from functools import reduce
 from operator import __or__
 from pprint import pformat
+from threading import get_ident
 from types import NotImplementedType
 from typing import (
     Any,
@@ -20,20 +24,64 @@ from testfixtures import not_there, safe_pformat
 from testfixtures.comparers import (
     _extract_attrs, AlreadySeen, _compare_mapping, safe_repr, compare_simple
 )
-from testfixtures.comparing import CompareContext, compare, register
+from testfixtures.comparing import (
+    CompareContext, CompareStats, compare, compare_stats, register
+)
 from testfixtures.resolve import resolve, type_name
 from testfixtures.utils import indent
 
 
+class _PerThread:
+    # A descriptor for state recorded on a comparison when it is used, which is kept
+    # separately for each thread so that a comparison can be shared between them.
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = f'_{name}_by_thread'
+
+    def __get__(self, obj: Any, owner: type | None = None) -> Any:
+        if obj is None:
+            return self
+        return obj.__dict__.get(self.name, {}).get(get_ident(), '')
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        obj.__dict__.setdefault(self.name, {})[get_ident()] = value
+
+
 class StatefulComparison:
     """
     A base class for stateful comparison objects.
+
+    Each comparison records why it failed to match the last object it was compared
+    with, for use in its :func:`repr`, separately for each thread. Use :meth:`match`
+    to get a :class:`Match` for an object without changing the comparison.
     """
 
-    failed: str | None = ''
+    failed = _PerThread()
     expected: Any = None
     name_attrs: Sequence[str] = ()
 
+    def match(self, other: Any) -> 'Match':
+        """
+        Check the supplied object against this comparison, returning a
+        :class:`Match` that is true if it matched.
+
+        Subclasses should implement this. For those that only implement
+        ``__ne__``, it is used instead, which records the result on this
+        comparison as a side effect.
+        """
+        if type(self).__ne__ is StatefulComparison.__ne__:
+            raise NotImplementedError(f'{type(self).__name__} must implement match()')
+        different = self != other
+        return Match(
+            self, self.failed or ('' if not different else 'not equal'),
+            frozenset(getattr(self, 'checked_indices', ())),
+        )
+
+    def __ne__(self, other: Any) -> bool:
+        result = self.match(other)
+        self.failed = result.failed
+        return not result
+
     def __eq__(self, other: Any) -> bool:
         return not(self != other)
 
@@ -46,16 +94,41 @@ class StatefulComparison:
     def body(self) -> str:
         return safe_pformat(self.expected)[1:-1]
 
-    def __repr__(self) -> str:
+    def _render(self, failed: str | None) -> str:
         name = self.name()
-        body = self.failed or self.body()
-        prefix = '<%s%s>' % (name, self.failed and '(failed)' or '')
+        body = failed or self.body()
+        prefix = '<%s%s>' % (name, failed and '(failed)' or '')
         if '\n' in body:
             return '\n'+prefix+'\n'+body.strip('\n')+'\n'+'</%s>' % name
         elif body:
             return prefix + body + '</>'
         return prefix
 
+    def __repr__(self) -> str:
+        return self._render(self.failed)
+
+
+@dataclass(frozen=True, eq=False)
+class Match:
+    """
+    The result of checking an object using the :meth:`~StatefulComparison.match`
+    method of a comparison. It is true if the object matched and its :func:`repr`
+    is that of the comparison after checking the object.
+    """
+
+    #: The comparison that was used.
+    comparison: StatefulComparison
+    #: A description of why the object didn't match, or an empty string if it did.
+    failed: str = ''
+    #: For sequence comparisons, the indices of the actual items that were matched.
+    checked_indices: frozenset[int] = frozenset()
+
+    def __bool__(self) -> bool:
+        return not self.failed
+
+    def __repr__(self) -> str:
+        return self.comparison._render(self.failed)
+
 
 class Comparison(StatefulComparison):
     """
@@ -103,18 +176,17 @@ class Comparison(StatefulComparison):
         self.expected_type = c
         self.expected_attributes = attribute_dict
 
-    def __ne__(self, other: Any) -> bool:
+    def match(self, other: Any) -> 'Match':
 
         if isinstance(other, AlreadySeen):
             other = other.obj
 
         other_type = type(other)
         if self.expected_type is not other_type:
-            self.failed = 'wrong type: ' + type_name(other_type)
-            return True
+            return Match(self, 'wrong type: ' + type_name(other_type))
 
         if self.expected_attributes is None:
-            return False
+            return Match(self)
 
         attribute_names = set(self.expected_attributes.keys())
         actual_attributes: dict[str, Any]
@@ -131,14 +203,13 @@ class Comparison(StatefulComparison):
                 pass
 
         context = CompareContext(x_label='Comparison', y_label='actual')
-        self.failed = _compare_mapping(self.expected_attributes,
-                                       actual_attributes,
-                                       context,
-                                       obj_for_class=not_there,
-                                       prefix='attributes ',
-                                       breadcrumb='.%s',
-                                       check_y_not_x=not self.partial)
-        return bool(self.failed)
+        return Match(self, _compare_mapping(self.expected_attributes,
+                                            actual_attributes,
+                                            context,
+                                            obj_for_class=not_there,
+                                            prefix='attributes ',
+                                            breadcrumb='.%s',
+                                            check_y_not_x=not self.partial) or '')
 
     def name(self) -> str:
         return 'C:' + type_name(self.expected_type)
@@ -156,6 +227,98 @@ class Comparison(StatefulComparison):
         return ''
 
 
+# Types whose instances are compared by value, with hashes that are consistent with
+# their equality, even across types, such as 1 == 1.0 == True:
+_PLAIN_TYPES = frozenset((
+    int, float, complex, bool, str, bytes, type(None), date, datetime, time, timedelta
+))
+
+
+def _key(obj: Any) -> Any:
+    # A hashable key that is equal to the key of another object if, and only if, the
+    # two objects are equal, or not_there if one can't be safely made, such as for
+    # objects with a custom __eq__.
+    type_ = type(obj)
+    if type_ in _PLAIN_TYPES:
+        return obj
+    try:
+        if type_ is tuple:
+            key = tuple(_key(item) for item in obj)
+            return not_there if not_there in key else key
+        if type_ is list:
+            key = tuple(_key(item) for item in obj)
+            return not_there if not_there in key else (list, key)
+        if type_ is dict:
+            items = tuple((_key(k), _key(v)) for k, v in obj.items())
+            if any(not_there in item for item in items):
+                return not_there
+            return dict, frozenset(items)
+        if type_ is set or type_ is frozenset:
+            key = tuple(_key(item) for item in obj)
+            return not_there if not_there in key else (frozenset, frozenset(key))
+    except RecursionError:
+        pass
+    return not_there
+
+
+def _match(expected: Sequence[Any], actual: Sequence[Any], ordered: bool) -> list[int | None]:
+    # Return the index of the actual item matched by each expected item, or None if there
+    # isn't one. Each expected item matches the first unmatched actual item that it is
+    # equal to, which must come after the previous match if ordered is True.
+    # Actual items are bucketed by key, so only those without a key need to be scanned
+    # for expected items that have one, and only those with a key that's not been seen are
+    # compared, just as if every actual item had been checked in turn.
+    buckets: dict[Any, deque[int]] = {}
+    unkeyed = []
+    for a_i, a in enumerate(actual):
+        key = _key(a)
+        if key is not_there:
+            unkeyed.append(a_i)
+        else:
+            bucket = buckets.get(key)
+            if bucket is None:
+                buckets[key] = deque((a_i,))
+            else:
+                bucket.append(a_i)
+
+    taken = [False] * len(actual)
+    last = -1
+    matches: list[int | None] = []
+    for e in expected:
+        found = None
+        key = _key(e)
+        if key is not_there:
+            for a_i in range(last + 1, len(actual)) if ordered else range(len(actual)):
+                if not taken[a_i]:
+                    a = actual[a_i]
+                    if a is e or a == e:
+                        found = a_i
+                        break
+        else:
+            bucket = buckets.get(key)
+            if bucket:
+                while bucket and (taken[bucket[0]] or bucket[0] <= last):
+                    bucket.popleft()
+                if bucket:
+                    found = bucket[0]
+            stop = len(actual) if found is None else found
+            for position in range(bisect_right(unkeyed, last) if ordered else 0, len(unkeyed)):
+                a_i = unkeyed[position]
+                if a_i > stop:
+                    break
+                if not taken[a_i]:
+                    a = actual[a_i]
+                    if a is e or a == e:
+                        found = a_i
+                        break
+        if found is not None:
+            taken[found] = True
+            if ordered:
+                last = found
+        matches.append(found)
+    return matches
+
+
 class SequenceComparison(StatefulComparison):
     """
     An object that can be used in comparisons of expected and actual
@@ -191,12 +354,17 @@ class SequenceComparison(StatefulComparison):
         self.checked_indices = set[int]()
 
     def __ne__(self, other: Any) -> bool:
+        result = self.match(other)
+        self.failed = result.failed
+        self.checked_indices.update(result.checked_indices)
+        return not result
+
+    def match(self, other: Any) -> Match:
         actual: list[Any]
         try:
             actual = original_actual = list(other)
         except TypeError:
-            self.failed = 'bad type'
-            return True
+            return Match(self, 'bad type')
         expected = list(self.expected)
         actual = list(actual)
 
@@ -204,34 +372,31 @@ class SequenceComparison(StatefulComparison):
         matched_expected_indices = []
         matched_actual_indices = []
 
-        missing_from_expected = actual
-        missing_from_expected_indices = actual_indices = list(range(len(actual)))
-
         missing_from_actual = []
         missing_from_actual_indices = []
 
-        start = 0
-        for e_i, e in enumerate(expected):
-            try:
-                i = actual.index(e, start)
-                a_i = actual_indices.pop(i)
-            except ValueError:
-                missing_from_actual.append(e)
+        for e_i, a_i in enumerate(_match(expected, actual, self.ordered)):
+            if a_i is None:
+                missing_from_actual.append(expected[e_i])
                 missing_from_actual_indices.append(e_i)
             else:
-                matched.append(missing_from_expected.pop(i))
+                matched.append(actual[a_i])
                 matched_expected_indices.append(e_i)
                 matched_actual_indices.append(a_i)
-                self.checked_indices.add(a_i)
-                if self.ordered:
-                    start = i
+
+        matched_set = set(matched_actual_indices)
+        missing_from_expected_indices = [
+            a_i for a_i in range(len(actual)) if a_i not in matched_set
+        ]
+        missing_from_expected = [actual[a_i] for a_i in missing_from_expected_indices]
 
         matches_in_order = matched_actual_indices == sorted(matched_actual_indices)
         all_matched = not (missing_from_actual or missing_from_expected)
         partial_match = self.partial and not missing_from_actual
 
+        checked_indices = frozenset(matched_actual_indices)
         if (matches_in_order or not self.ordered) and (all_matched or partial_match):
-            return False
+            return Match(self, checked_indices=checked_indices)
 
         expected_indices = matched_expected_indices+missing_from_actual_indices
         actual_indices = matched_actual_indices
@@ -268,8 +433,7 @@ class SequenceComparison(StatefulComparison):
             add_section('in expected but not actual', missing_from_actual)
             add_section('in actual but not expected', missing_from_expected)
 
-        self.failed = '\n\n'.join(message)
-        return True
+        return Match(self, '\n\n'.join(message), checked_indices)
 
 
 class Subset(SequenceComparison):
@@ -350,25 +514,40 @@ class MappingComparison(StatefulComparison):
             sep = ', '
         return sep.join(parts)
 
-    def __ne__(self, other: Any) -> bool:
+    def match(self, other: Any) -> Match:
         try:
             actual_keys = other.keys()
-            actual_mapping = dict(other.items())
         except AttributeError:
-            self.failed = 'bad type'
-            return True
+            return Match(self, 'bad type')
 
         expected_keys = self.expected.keys()
         expected_mapping = self.expected
 
-        if self.partial:
-            ignored_keys = set(actual_keys) - set(expected_keys)
-            for key in ignored_keys:
-                del actual_mapping[key]
-            # preserve the order:
-            actual_keys = [k for k in actual_keys if k not in ignored_keys]
-        else:
+        ignored_keys: set[Any] | None
+        if self.partial and isinstance(other, Mapping):
+            # Only look up the expected keys, rather than copying what could be a
+            # large mapping. The ignored keys are only needed if there's a failure:
+            actual_mapping = {}
+            for key in expected_keys:
+                value = other.get(key, not_there)
+                if value is not not_there:
+                    actual_mapping[key] = value
             ignored_keys = None
+            if self.ordered:
+                actual_keys = [k for k in actual_keys if k in expected_mapping]
+        else:
+            try:
+                actual_mapping = dict(other.items())
+            except AttributeError:
+                return Match(self, 'bad type')
+            if self.partial:
+                ignored_keys = set(actual_keys) - set(expected_keys)
+                for key in ignored_keys:
+                    del actual_mapping[key]
+                # preserve the order:
+                actual_keys = [k for k in actual_keys if k not in ignored_keys]
+            else:
+                ignored_keys = None
 
         mapping_differences = compare(
             expected=expected_mapping,
@@ -391,6 +570,8 @@ class MappingComparison(StatefulComparison):
 
             message = []
 
+            if self.partial and ignored_keys is None:
+                ignored_keys = set(other.keys()) - set(expected_keys)
             if ignored_keys:
                 message.append('ignored:\n'+pformat(sorted(ignored_keys)))
 
@@ -400,10 +581,8 @@ class MappingComparison(StatefulComparison):
             if key_differences:
                 message.append('wrong key order:\n\n'+key_differences.split('\n\n', 1)[1])
 
-            self.failed = '\n\n'.join(message)
-
-            return True
-        return False
+            return Match(self, '\n\n'.join(message))
+        return Match(self)
 
 
 class TextComparison:
@@ -1,14 +1,16 @@
+from collections import Counter
 from typing import TYPE_CHECKING, Any, Iterable, Sequence
+from weakref import WeakKeyDictionary
 
-from django.db.models import Model, Field
+from django.db.models import Model, Field, QuerySet
 
-from .comparers import _compare_mapping
+from .comparers import Steps, _compare_mapping, _mapping_steps
 
 if TYPE_CHECKING:
     from .comparing import CompareContext
 
 
-def instance_fields(instance: Model) -> Iterable[Field]:
+def instance_fields(instance: Model | type[Model]) -> Iterable[Field]:
     opts = instance._meta
     for name in (
         'concrete_fields',
@@ -21,19 +23,39 @@ def instance_fields(instance: Model) -> Iterable[Field]:
                 yield field
 
 
+# The fields compared for each model class, keyed by the fields ignored and whether
+# non-editable fields are included:
+_field_plans: WeakKeyDictionary[
+    type[Model], dict[tuple[frozenset[str], bool], tuple[Field, ...]]
+] = WeakKeyDictionary()
+
+
+def _field_plan(
+        model: type[Model], exclude: Sequence[str], include_not_editable: bool
+) -> tuple[Field, ...]:
+    plans = _field_plans.get(model)
+    if plans is None:
+        plans = _field_plans[model] = {}
+    key = frozenset(exclude), include_not_editable
+    plan = plans.get(key)
+    if plan is None:
+        plan = plans[key] = tuple(
+            f for f in instance_fields(model)
+            if f.name not in exclude
+            and (include_not_editable or getattr(f, 'editable', False))
+        )
+    return plan
+
+
 def model_to_dict(
         instance: Model,
         exclude: Sequence[str],
         include_not_editable: bool,
 ) -> dict[str, Any]:
-    data = {}
-    for f in instance_fields(instance):
-        if f.name in exclude:
-            continue
-        if not getattr(f, 'editable', False) and not include_not_editable:
-            continue
-        data[f.name] = f.value_from_object(instance)
-    return data
+    return {
+        f.name: f.value_from_object(instance)
+        for f in _field_plan(type(instance), exclude, include_not_editable)
+    }
 
 
 def compare_model(
@@ -62,3 +84,73 @@ def compare_model(
     args.append(context)
     args.append(x)
     return _compare_mapping(*args)
+
+
+def compare_queryset(
+        x: QuerySet,
+        y: QuerySet,
+        context: 'CompareContext',
+        ignore_fields: Sequence[str] = (),
+        non_editable_fields: bool = False,
+) -> str | None:
+    """
+    Returns an informative string describing the differences between the rows
+    returned by two supplied Django querysets for the same model.
+
+    Rather than loading model instances, only the columns for the fields that
+    would be compared by :func:`compare_model` are fetched, using a single query for
+    each queryset. Rows must be returned in the same order by both querysets and are
+    labelled using their primary keys, unless the primary key is ignored, in which
+    case they are labelled with their position. Only fields with a column in the
+    model's table are compared.
+
+    The ``ignore_fields`` and ``non_editable_fields`` parameters are the same as
+    for :func:`compare_model`.
+    """
+    if x.model is not y.model:
+        return (f'{context.label("x", f"QuerySet of {x.model!r}")} != '
+                f'{context.label("y", f"QuerySet of {y.model!r}")}')
+    model = x.model
+    fields = [f for f in _field_plan(model, ignore_fields, non_editable_fields)
+              if f.concrete]
+    pk = model._meta.pk
+    assert pk is not None
+    by_pk = pk.name not in ignore_fields
+    names = [f.name for f in fields if not (by_pk and f is pk)]
+    columns = [f.attname for f in fields if not (by_pk and f is pk)]
+    rows: list[list[tuple[Any, dict[str, Any]]]] = []
+    for queryset in x, y:
+        if by_pk:
+            rows.append([(row[0], dict(zip(names, row[1:])))
+                         for row in queryset.values_list(pk.attname, *columns)])
+        else:
+            rows.append(list(enumerate(
+                dict(zip(names, row)) for row in queryset.values_list(*columns)
+            )))
+    return context._run(_queryset_steps(rows[0], rows[1], context, x))
+
+
+def _queryset_steps(
+        x: list[tuple[Any, dict[str, Any]]],
+        y: list[tuple[Any, dict[str, Any]]],
+        context: 'CompareContext',
+        obj_for_class: QuerySet,
+) -> Steps:
+    x_label = context.x_label or 'first'
+    y_label = context.y_label or 'second'
+    for label, rows in (x_label, x), (y_label, y):
+        counts = Counter(key for key, _ in rows)
+        if len(counts) < len(rows):
+            duplicated = context.sorted_by_repr(key for key, count in counts.items() if count > 1)
+            return f'keys in {label} are not unique: {context.safe_repr(duplicated)}'
+    x_rows, y_rows = dict(x), dict(y)
+    message = yield from _mapping_steps(x_rows, y_rows, context, obj_for_class)
+    x_order = [key for key in x_rows if key in y_rows]
+    y_order = [key for key in y_rows if key in x_rows]
+    if x_order == y_order:
+        return message
+    lines = [message or f'{obj_for_class.__class__.__name__} not as expected:']
+    lines.extend(('', 'ordering differs:',
+                  f'{x_label}: {context.safe_repr(x_order)}',
+                  f'{y_label}: {context.safe_repr(y_order)}'))
+    return '\n'.join(lines)
@@ -371,11 +371,9 @@ class LogCapture:
                 expected, actual=actual, recursive=self.recursive_check, raises=False
             )
         else:
-            expected_ = SequenceComparison(
+            result = SequenceComparison(
                 *expected, ordered=False, partial=False, recursive=self.recursive_check
-            )
-            if expected_ != actual:
-                result = expected_.failed
+            ).match(actual).failed or None
         if result and raises:
             raise AssertionError(result)
         return result
@@ -448,14 +446,14 @@ class LogCapture:
         """
         __tracebackhide__ = True
         actual = self.actual()
-        expected_ = SequenceComparison(
+        result = SequenceComparison(
             *expected, ordered=order_matters, partial=True, recursive=self.recursive_check
-        )
-        if expected_ != actual:
+        ).match(actual)
+        if not result:
             if raises:
-                raise AssertionError(expected_.failed)
-            return expected_.failed
-        for index in expected_.checked_indices:
+                raise AssertionError(result.failed)
+            return result.failed
+        for index in result.checked_indices:
             self.entries[index].checked = True
         return None
 
@@ -1,10 +1,12 @@
 """
 Tools for helping to test applications that use NumPy.
 """
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Sequence
 
 import numpy as numpy
-from numpy import ndarray
+from numpy import (
+    array2string, errstate, flatnonzero, isclose, isnan, isnat, ndarray, unravel_index
+)
 from numpy.ma import MaskedArray, getmaskarray
 from numpy.testing import assert_allclose, assert_array_equal
 
@@ -16,9 +18,23 @@ INEXACT_KINDS = 'fc'
 # assert_allclose's tighter defaults, so float semantics agree across all three:
 RTOL = 1e-5
 ATOL = 1e-8
+# Arrays larger than this, in bytes, are compared a chunk at a time by compare_ndarray,
+# as numpy's test helpers need several temporary arrays the same size as those compared:
+CHUNKED_THRESHOLD = 64 * 1024 * 1024
+# The number of elements compare_ndarray_chunked compares at a time:
+CHUNK_SIZE = 1_000_000
+# The number of mismatched elements compare_ndarray_chunked describes:
+MISMATCHES_SHOWN = 5
 
 
-def compare_ndarray(x: ndarray, y: ndarray, context: 'CompareContext') -> str | None:
+def compare_ndarray(
+        x: ndarray,
+        y: ndarray,
+        context: 'CompareContext',
+        chunk_size: int = CHUNK_SIZE,
+        mismatches: int = MISMATCHES_SHOWN,
+        count: bool = True,
+) -> str | None:
     """
     Returns a textual description of the differences between two
     :class:`numpy.ndarray` instances, as reported by
@@ -33,7 +49,13 @@ def compare_ndarray(x: ndarray, y: ndarray, context: 'CompareContext') -> str |
     When ``strict=True`` is passed to :func:`~testfixtures.compare`,
     float and complex values must be exactly equal; otherwise ``rtol=1e-5``
     and ``atol=1e-8`` apply, matching the pandas and polars comparers.
+
+    Arrays larger than :data:`CHUNKED_THRESHOLD` bytes are compared using
+    :func:`compare_ndarray_chunked` instead, to which ``chunk_size``,
+    ``mismatches`` and ``count`` are passed.
     """
+    if x.nbytes > CHUNKED_THRESHOLD and x.dtype.kind != 'O':
+        return compare_ndarray_chunked(x, y, context, chunk_size, mismatches, count)
     try:
         if x.dtype.kind in INEXACT_KINDS and not context.strict:
             assert_allclose(y, x, rtol=RTOL, atol=ATOL, strict=True)
@@ -44,6 +66,23 @@ def compare_ndarray(x: ndarray, y: ndarray, context: 'CompareContext') -> str |
     return None
 
 
+def _numeric_differences(x: Sequence, y: Sequence) -> ndarray | None:
+    # The positions, up to the length of the shorter sequence, at which two sequences
+    # made up entirely of ints or entirely of floats may differ, or None if they aren't.
+    # NaNs are always included, leaving compare() to decide if they are the same.
+    type_ = type(x[0]) if len(x) else None
+    if type_ not in (int, float) or {type_} != set(map(type, x)) or {type_} != set(map(type, y)):
+        return None
+    length = min(len(x), len(y))
+    try:
+        x_values = numpy.array(x[:length] if len(x) > length else x, dtype=type_)
+        y_values = numpy.array(y[:length] if len(y) > length else y, dtype=type_)
+    except OverflowError:
+        # ints too big for numpy
+        return None
+    return flatnonzero(x_values != y_values)
+
+
 def compare_masked_array(x: MaskedArray, y: MaskedArray, context: 'CompareContext') -> str | None:
     """
     Returns a textual description of the differences between two
@@ -58,3 +97,138 @@ def compare_masked_array(x: MaskedArray, y: MaskedArray, context: 'CompareContex
     if masks is not None:
         return 'masks differ: ' + masks
     return compare_ndarray(x.compressed(), y.compressed(), context)
+
+
+def compare_ndarray_chunked(
+        x: ndarray,
+        y: ndarray,
+        context: 'CompareContext',
+        chunk_size: int = CHUNK_SIZE,
+        mismatches: int = MISMATCHES_SHOWN,
+        count: bool = True,
+) -> str | None:
+    """
+    Returns a textual description of the differences between two
+    :class:`numpy.ndarray` instances, comparing ``chunk_size`` elements at a
+    time so that the memory needed stays bounded, even for :class:`numpy.memmap`
+    instances that are larger than the memory available.
+
+    Values are compared in the same way as :func:`compare_ndarray`, with the
+    fields of structured arrays compared one by one. The number of mismatched
+    elements is given, along with the indices and values of the first
+    ``mismatches`` of them and, for numeric arrays, the largest absolute and
+    relative differences among them all. If ``count`` is ``False``, comparison
+    stops as soon as the first ``mismatches`` have been found.
+    """
+    tolerant = x.dtype.kind in INEXACT_KINDS and not context.strict
+    lines = [
+        f'Not equal to tolerance rtol={RTOL:g}, atol={ATOL:g}' if tolerant
+        else 'Arrays are not equal',
+        '',
+    ]
+    if x.shape != y.shape:
+        return _chunked_message(lines + [f'(shapes {y.shape}, {x.shape} mismatch)'], x, y)
+    if x.dtype != y.dtype:
+        return _chunked_message(lines + [f'(dtypes {y.dtype}, {x.dtype} mismatch)'], x, y)
+
+    numeric = x.dtype.kind in 'iufc'
+    x_flat, y_flat = _flat(x), _flat(y)
+    found = 0
+    shown: list[str] = []
+    fields = set[str]()
+    max_abs: Any = None
+    max_rel: Any = None
+    stopped = False
+    for start in range(0, x.size, chunk_size):
+        x_chunk = x_flat[start:start + chunk_size]
+        y_chunk = y_flat[start:start + chunk_size]
+        positions = flatnonzero(_mismatched(x_chunk, y_chunk, tolerant, fields))
+        if not len(positions):
+            continue
+        found += len(positions)
+        for position in positions[:mismatches - len(shown)]:
+            index = [int(i) for i in unravel_index(start + position, x.shape)]
+            shown.append(f' {index}: {y_chunk[position]} (ACTUAL), '
+                         f'{x_chunk[position]} (DESIRED)')
+        if numeric:
+            chunk_abs, chunk_rel = _max_errors(x_chunk[positions], y_chunk[positions])
+            max_abs = chunk_abs if max_abs is None else max(max_abs, chunk_abs)
+            max_rel = chunk_rel if max_rel is None else max(max_rel, chunk_rel)
+        if not count and len(shown) >= mismatches:
+            stopped = start + chunk_size < x.size
+            break
+
+    if not found:
+        return None
+    if stopped:
+        lines.append(f'Mismatched elements: at least {found} / {x.size}')
+    else:
+        lines.append(f'Mismatched elements: {found} / {x.size} ({100 * found / x.size:.3g}%)')
+    if fields:
+        lines.append('Mismatched fields: ' + ', '.join(repr(name) for name in sorted(fields)))
+    if x.ndim:
+        if found == 1:
+            lines.append('Mismatch at index:')
+        elif found == len(shown):
+            lines.append('Mismatch at indices:')
+        else:
+            lines.append(f'First {len(shown)} mismatches are at indices:')
+        lines.extend(shown)
+    if max_abs is not None:
+        among = 'among the violations found' if stopped else 'among violations'
+        lines.append(f'Max absolute difference {among}: {array2string(max_abs)}')
+        lines.append(f'Max relative difference {among}: {array2string(max_rel)}')
+    return _chunked_message(lines, x, y)
+
+
+def _chunked_message(lines: list[str], x: ndarray, y: ndarray) -> str:
+    # Finish off in the same way as numpy's test helpers, whose summaries of large
+    # arrays are cut short:
+    for name, a in ('ACTUAL', y), ('DESIRED', x):
+        rendered = repr(a).splitlines()
+        lines.append(f' {name}: ' + '\n'.join(rendered[:3]) + ('...' if len(rendered) > 3 else ''))
+    return '\n' + '\n'.join(lines)
+
+
+def _flat(a: ndarray) -> Any:
+    # A flat view when possible, otherwise slicing a flatiter only copies the chunk taken:
+    return a.reshape(-1) if a.flags.c_contiguous else a.flat
+
+
+def _mismatched(x: ndarray, y: ndarray, tolerant: bool, fields: set[str]) -> ndarray:
+    # A boolean array that is True where x and y, both one dimensional, don't match.
+    # The names of any fields of a structured dtype that don't match are added to fields.
+    names = x.dtype.names
+    if names:
+        mismatched = numpy.zeros(len(x), dtype=bool)
+        for name in names:
+            field_mismatched = _mismatched(x[name], y[name], tolerant, set())
+            if field_mismatched.any():
+                fields.add(name)
+                mismatched |= field_mismatched
+        return mismatched
+    with errstate(invalid='ignore'):
+        if tolerant:
+            mismatched = ~isclose(y, x, rtol=RTOL, atol=ATOL, equal_nan=True)
+        else:
+            mismatched = numpy.asarray(x != y, dtype=bool)
+            if x.dtype.kind in INEXACT_KINDS:
+                mismatched &= ~(isnan(x) & isnan(y))
+            elif x.dtype.kind in 'mM':
+                mismatched &= ~(isnat(x) & isnat(y))
+    if mismatched.ndim > 1:
+        # fields with a shape of their own
+        mismatched = mismatched.reshape(len(x), -1).any(axis=1)
+    return mismatched
+
+
+def _max_errors(x: ndarray, y: ndarray) -> tuple[Any, Any]:
+    # The largest absolute and relative differences between the mismatched values,
+    # with the relative difference taken against the expected values in x.
+    with errstate(all='ignore'):
+        error = abs(y - x)
+        if x.dtype.kind == 'u':
+            numpy.minimum(error, abs(x - y), out=error)
+        nonzero = x != 0
+        max_rel = (error[nonzero] / abs(x[nonzero])).max() if nonzero.any() else numpy.inf
+        return error.max(), max_rel
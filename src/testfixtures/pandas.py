@@ -1,18 +1,30 @@
 """
 Tools for helping to test applications that use Pandas.
 """
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Sequence
 
 import pandas as pandas
-from pandas import DataFrame
-from pandas.testing import assert_frame_equal
+from numpy import errstate, flatnonzero, isclose, ndarray, zeros
+from pandas import DataFrame, Index, MultiIndex, Series
+from pandas.testing import assert_frame_equal, assert_index_equal, assert_series_equal
+
+from . import tables
+from .numpy import ATOL, RTOL
+from .tables import _describe_columns, _listing
 
 if TYPE_CHECKING:
     from .comparing import CompareContext
 
+# The number of rows compared at a time when frames are aligned on key columns:
+CHUNK_ROWS = 1_000_000
+
 
 def compare_dataframe(
-        x: DataFrame, y: DataFrame, context: 'CompareContext'
+        x: DataFrame,
+        y: DataFrame,
+        context: 'CompareContext',
+        key_columns: str | Sequence[str] | None = None,
+        count: bool = True,
 ) -> str | None:
     """
     Returns a textual description of the differences between two
@@ -21,9 +33,164 @@ def compare_dataframe(
 
     When ``strict=True`` is passed to :func:`~testfixtures.compare`,
     ``check_exact=True`` is used; otherwise pandas' default tolerances apply.
+
+    :param key_columns:
+
+      The name of a column, or a sequence of names of columns, whose values
+      uniquely identify each row. When passed, rows are matched up using these
+      columns, regardless of their position or index, and compared
+      :data:`CHUNK_ROWS` at a time. The keys of rows that were added, removed
+      or changed are reported, along with the number of changed values in
+      each column.
+
+    :param count:
+
+      When rows are aligned on ``key_columns`` and this is ``False``,
+      comparison stops after the first chunk of rows that contains changes,
+      rather than counting all of them.
     """
+    if key_columns is not None:
+        if isinstance(key_columns, str):
+            key_columns = [key_columns]
+        return _compare_keyed(x, y, context, list(key_columns), count)
     try:
         assert_frame_equal(x, y, check_exact=context.strict)
     except AssertionError as e:
         return str(e)
     return None
+
+
+def compare_series(x: Series, y: Series, context: 'CompareContext') -> str | None:
+    """
+    Returns a textual description of the differences between two
+    :class:`pandas.Series` instances, as reported by
+    :func:`pandas.testing.assert_series_equal`.
+
+    When ``strict=True`` is passed to :func:`~testfixtures.compare`,
+    ``check_exact=True`` is used; otherwise pandas' default tolerances apply.
+    """
+    try:
+        assert_series_equal(x, y, check_exact=context.strict)
+    except AssertionError as e:
+        return str(e)
+    return None
+
+
+def compare_index(x: Index, y: Index, context: 'CompareContext') -> str | None:
+    """
+    Returns a textual description of the differences between two
+    :class:`pandas.Index` instances, as reported by
+    :func:`pandas.testing.assert_index_equal`.
+
+    When ``strict=True`` is passed to :func:`~testfixtures.compare`, the
+    classes of the indexes must match exactly and ``check_exact=True`` is used.
+    """
+    try:
+        assert_index_equal(
+            x, y, exact=True if context.strict else 'equiv', check_exact=context.strict
+        )
+    except AssertionError as e:
+        return str(e)
+    return None
+
+
+def _compare_keyed(
+        x: DataFrame, y: DataFrame, context: 'CompareContext', key_columns: list[str], count: bool
+) -> str | None:
+    x_label = context.x_label or 'first'
+    y_label = context.y_label or 'second'
+    lines = _describe_columns(
+        dict(x.dtypes.items()), dict(y.dtypes.items()), context, key_columns, x_label, y_label
+    )
+    if lines:
+        return '\n'.join(['DataFrame not as expected:', *lines])
+
+    x_keys, y_keys = _keys(x, key_columns), _keys(y, key_columns)
+    for label, keys in (x_label, x_keys), (y_label, y_keys):
+        if not keys.is_unique:
+            duplicated = keys[keys.duplicated()].unique()
+            return f'keys in {label} are not unique: {_listing(duplicated.tolist(), len(duplicated))}'
+
+    # The row in x that each row in y has the same key as, or -1 if there isn't one:
+    positions = x_keys.get_indexer(y_keys)
+    matched = zeros(len(x), dtype=bool)
+    matched[positions[positions >= 0]] = True
+    removed = flatnonzero(~matched)
+    added = flatnonzero(positions < 0)
+
+    value_columns = [column for column in x.columns if column not in key_columns]
+    counts = dict.fromkeys(value_columns, 0)
+    changed = 0
+    compared = 0
+    shown: list[str] = []
+    for start in range(0, len(y), CHUNK_ROWS):
+        chunk_positions = positions[start:start + CHUNK_ROWS]
+        present = chunk_positions >= 0
+        x_rows = chunk_positions[present]
+        y_rows = flatnonzero(present) + start
+        compared += len(x_rows)
+        mismatched = zeros(len(x_rows), dtype=bool)
+        column_mismatched = {}
+        for column in value_columns:
+            column_mismatched[column] = _mismatched(
+                x[column].iloc[x_rows], y[column].iloc[y_rows], context.strict
+            )
+            counts[column] += int(column_mismatched[column].sum())
+            mismatched |= column_mismatched[column]
+        rows = flatnonzero(mismatched)
+        changed += len(rows)
+        for row in rows[:tables.KEYS_SHOWN - len(shown)]:
+            x_row, y_row = x_rows[row], y_rows[row]
+            differences = []
+            for column in value_columns:
+                if column_mismatched[column][row]:
+                    x_value = x[column].iloc[x_row:x_row + 1].tolist()[0]
+                    y_value = y[column].iloc[y_row:y_row + 1].tolist()[0]
+                    labelled_x = context.label('x', context.safe_repr(x_value))
+                    labelled_y = context.label('y', context.safe_repr(y_value))
+                    differences.append(f'{column!r}: {labelled_x} != {labelled_y}')
+            key = y_keys[y_row:y_row + 1].tolist()[0]
+            shown.append(f'{context.safe_repr(key)}: ' + ', '.join(differences))
+        if rows.size and not count:
+            break
+    stopped = compared < len(y) - len(added)
+
+    if not (len(removed) or len(added) or changed):
+        return None
+    lines = ['DataFrame not as expected:']
+    if len(removed):
+        lines.extend(('', f'keys in {x_label} but not {y_label}:',
+                      _listing(x_keys[removed[:tables.KEYS_SHOWN]].tolist(), len(removed))))
+    if len(added):
+        lines.extend(('', f'keys in {y_label} but not {x_label}:',
+                      _listing(y_keys[added[:tables.KEYS_SHOWN]].tolist(), len(added))))
+    if changed:
+        lines.extend((
+            '',
+            f'rows that differ: at least {changed}' if stopped else
+            f'rows that differ: {changed} of {len(y) - len(added)}',
+        ))
+        lines.extend(f'{column!r}: {counts[column]}' for column in value_columns if counts[column])
+        lines.extend(('', 'first rows that differ:', *shown))
+    return '\n'.join(lines)
+
+
+def _keys(frame: DataFrame, key_columns: list[str]) -> Index:
+    if len(key_columns) == 1:
+        return Index(frame[key_columns[0]])
+    return MultiIndex.from_frame(frame[key_columns])
+
+
+def _mismatched(x: Series, y: Series, strict: bool) -> ndarray:
+    # A boolean array that is True where the values in two series with the same dtype
+    # don't match, taking them in order rather than aligning them on their index.
+    x_missing = x.isna().to_numpy()
+    y_missing = y.isna().to_numpy()
+    if not strict and x.dtype.kind in 'fc':
+        with errstate(invalid='ignore'):
+            different = ~isclose(y.to_numpy(), x.to_numpy(), rtol=RTOL, atol=ATOL)
+    else:
+        different = x.reset_index(drop=True).ne(y.reset_index(drop=True)).to_numpy(
+            dtype=bool, na_value=True
+        )
+    return (different & ~(x_missing & y_missing)) | (x_missing ^ y_missing)
@@ -1,15 +1,31 @@
 """
 Tools for helping to test applications that use Polars.
 """
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Sequence
 
 import polars as polars
-from polars import DataFrame
-from polars.testing import assert_frame_equal
+from polars import DataFrame, Expr, LazyFrame, Series, col, collect_all, concat, lit
+from polars.exceptions import ComputeError
+from polars.testing import assert_frame_equal, assert_series_equal
+
+from . import tables
+from .tables import _describe_columns, _listing
 
 if TYPE_CHECKING:
     from .comparing import CompareContext
 
+# The tolerances used for floating point values in lazy frames when not comparing strictly,
+# matching the defaults of polars.testing.assert_frame_equal():
+REL_TOL = 1e-05
+ABS_TOL = 1e-08
+
+# Names for the columns added to lazy frames while comparing them:
+_ROW = '__testfixtures_row__'
+_X_PRESENT = '__testfixtures_x__'
+_Y_PRESENT = '__testfixtures_y__'
+_Y_SUFFIX = '__testfixtures_y__'
+_DIFFERENT_PREFIX = '__testfixtures_different__'
+
 
 def compare_dataframe(
         x: DataFrame, y: DataFrame, context: 'CompareContext'
@@ -27,3 +43,169 @@ def compare_dataframe(
     except AssertionError as e:
         return str(e)
     return None
+
+
+def compare_series(
+        x: Series, y: Series, context: 'CompareContext'
+) -> str | None:
+    """
+    Returns a textual description of the differences between two
+    :class:`polars.Series` instances, as reported by
+    :func:`polars.testing.assert_series_equal`.
+
+    When ``strict=True`` is passed to :func:`~testfixtures.compare`,
+    ``check_exact=True`` is used; otherwise polars' default tolerances apply.
+    """
+    try:
+        assert_series_equal(x, y, check_exact=context.strict)
+    except AssertionError as e:
+        return str(e)
+    return None
+
+
+def compare_lazyframe(
+        x: LazyFrame,
+        y: LazyFrame,
+        context: 'CompareContext',
+        key_columns: str | Sequence[str] | None = None,
+) -> str | None:
+    """
+    Returns a textual description of the differences between two
+    :class:`polars.LazyFrame` instances.
+
+    Rather than collecting both frames, a query that finds the differences between
+    them is run using polars' streaming engine, so only the counts of differences
+    and the first :data:`~testfixtures.tables.KEYS_SHOWN` differing rows are ever held in memory.
+    Columns are matched up by name and must have the same dtypes.
+
+    When ``strict=True`` is passed to :func:`~testfixtures.compare`, floating
+    point values must be exactly equal; otherwise :data:`REL_TOL` and
+    :data:`ABS_TOL` apply.
+
+    :param key_columns:
+
+      The name of a column, or a sequence of names of columns, whose values
+      uniquely identify each row. When passed, rows are matched up using these
+      columns rather than their position, and the keys of rows that were added,
+      removed or changed are reported.
+    """
+    x_label = context.x_label or 'first'
+    y_label = context.y_label or 'second'
+    if isinstance(key_columns, str):
+        key_columns = [key_columns]
+    keys = list(key_columns or ())
+    x_schema, y_schema = x.collect_schema(), y.collect_schema()
+    lines = _describe_columns(x_schema, y_schema, context, keys, x_label, y_label)
+    if lines:
+        return '\n'.join(['LazyFrame not as expected:', *lines])
+
+    value_columns = [column for column in x_schema if column not in keys]
+    renamed = y.rename({column: column + _Y_SUFFIX for column in value_columns})
+    if keys:
+        joined = x.with_columns(lit(True).alias(_X_PRESENT)).join(
+            renamed.with_columns(lit(True).alias(_Y_PRESENT)),
+            on=keys, how='full', coalesce=True, nulls_equal=True, validate='1:1',
+        )
+    else:
+        x_length, y_length = (frame.item() for frame in collect_all(
+            [x.select(polars.len()), y.select(polars.len())], engine='streaming'
+        ))
+        if x_length != y_length:
+            lines.extend(('', 'row counts differ: '
+                              f'{context.label("x", str(x_length))} != '
+                              f'{context.label("y", str(y_length))}'))
+        length = min(x_length, y_length)
+        keys = [_ROW]
+        joined = concat([
+            x.head(length).with_row_index(_ROW),
+            renamed.head(length).with_columns(lit(True).alias(_Y_PRESENT)),
+        ], how='horizontal').with_columns(lit(True).alias(_X_PRESENT))
+
+    in_both = col(_X_PRESENT).is_not_null() & col(_Y_PRESENT).is_not_null()
+    flags = [_DIFFERENT_PREFIX + column for column in value_columns]
+    flagged = joined.with_columns(
+        (in_both & _different(column, x_schema[column].is_float() and not context.strict))
+        .alias(flag)
+        for column, flag in zip(value_columns, flags)
+    )
+    changed = polars.any_horizontal(flags) if flags else lit(False)
+    queries = [
+        flagged.select(
+            col(_Y_PRESENT).is_null().sum(),
+            col(_X_PRESENT).is_null().sum(),
+            in_both.sum().alias('compared'),
+            changed.sum().alias('changed'),
+            *(col(flag).sum() for flag in flags),
+        ),
+        flagged.filter(col(_Y_PRESENT).is_null()).select(keys).bottom_k(tables.KEYS_SHOWN, by=keys),
+        flagged.filter(col(_X_PRESENT).is_null()).select(keys).bottom_k(tables.KEYS_SHOWN, by=keys),
+        flagged.filter(changed).bottom_k(tables.KEYS_SHOWN, by=keys),
+    ]
+    try:
+        counts, removed, added, sample = collect_all(queries, engine='streaming')
+    except ComputeError:
+        duplicated = _duplicated_keys(x, y, keys, x_label, y_label)
+        if duplicated:
+            return duplicated
+        raise
+
+    removed_count, added_count, compared, changed_count, *column_counts = counts.row(0)
+    if not (removed_count or added_count or changed_count):
+        return None if not lines else '\n'.join(['LazyFrame not as expected:', *lines])
+    if removed_count:
+        lines.extend(('', f'keys in {x_label} but not {y_label}:',
+                      _listing(_key_values(removed, keys), removed_count)))
+    if added_count:
+        lines.extend(('', f'keys in {y_label} but not {x_label}:',
+                      _listing(_key_values(added, keys), added_count)))
+    if changed_count:
+        lines.extend(('', f'rows that differ: {changed_count} of {compared}'))
+        lines.extend(f'{column!r}: {count}'
+                     for column, count in zip(value_columns, column_counts) if count)
+        lines.extend(('', 'first rows that differ:'))
+        for row, key in enumerate(_key_values(sample, keys)):
+            differences = []
+            for column, flag in zip(value_columns, flags):
+                if sample[flag][row]:
+                    labelled_x = context.label('x', context.safe_repr(sample[column][row]))
+                    labelled_y = context.label(
+                        'y', context.safe_repr(sample[column + _Y_SUFFIX][row])
+                    )
+                    differences.append(f'{column!r}: {labelled_x} != {labelled_y}')
+            lines.append(f'{context.safe_repr(key)}: ' + ', '.join(differences))
+    return '\n'.join(['LazyFrame not as expected:', *lines])
+
+
+def _different(column: str, tolerant: bool) -> Expr:
+    # An expression that is True where the values in a column differ between the two
+    # frames, treating missing values as equal to each other and NaN as equal to NaN.
+    x_value, y_value = col(column), col(column + _Y_SUFFIX)
+    different = x_value.ne_missing(y_value)
+    if tolerant:
+        close = (
+            ((x_value - y_value).abs() <= ABS_TOL + REL_TOL * y_value.abs())
+            & x_value.is_finite() & y_value.is_finite()
+        )
+        different = different & ~close.fill_null(False)
+    return different
+
+
+def _duplicated_keys(
+        x: LazyFrame, y: LazyFrame, keys: list[str], x_label: str, y_label: str
+) -> str | None:
+    count = '__testfixtures_count__'
+    duplicated = collect_all([
+        frame.group_by(keys).agg(polars.len().alias(count)).filter(col(count) > 1).select(keys)
+        for frame in (x, y)
+    ], engine='streaming')
+    for label, found in zip((x_label, y_label), duplicated):
+        if found.height:
+            values = _key_values(found.sort(keys), keys)
+            return f'keys in {label} are not unique: {_listing(values, found.height)}'
+    return None
+
+
+def _key_values(frame: DataFrame, keys: list[str]) -> list[Any]:
+    if len(keys) == 1:
+        return frame[keys[0]].to_list()
+    return list(frame.select(keys).iter_rows())
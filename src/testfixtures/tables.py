@@ -0,0 +1,50 @@
+"""
+Helpers shared by the comparers for tables of data, such as pandas and polars frames.
+"""
+from typing import TYPE_CHECKING, Any, Iterable, Mapping
+
+if TYPE_CHECKING:
+    from .comparing import CompareContext
+
+# The number of keys listed for each kind of difference found between frames whose
+# rows are aligned on key columns:
+KEYS_SHOWN = 5
+
+
+def _describe_columns(
+        x: Mapping[Any, Any],
+        y: Mapping[Any, Any],
+        context: 'CompareContext',
+        key_columns: list[str],
+        x_label: str,
+        y_label: str,
+) -> list[str]:
+    # Describe any differences in the columns of two frames, given as mappings of column
+    # name to dtype. Rows can only be compared once there are none.
+    lines: list[str] = []
+    for label, frame in (x_label, x), (y_label, y):
+        missing = [column for column in key_columns if column not in frame]
+        if missing:
+            lines.extend(('', f'key columns missing from {label}:', repr(missing)))
+    for first, second, columns in (x_label, y_label, x.keys() - y.keys()), (
+            y_label, x_label, y.keys() - x.keys()
+    ):
+        if columns:
+            lines.extend(('', f'columns in {first} but not {second}:',
+                          context.safe_repr(context.sorted_by_repr(columns))))
+    dtypes = [
+        f'{column!r}: {context.label("x", str(dtype))} != {context.label("y", str(y[column]))}'
+        for column, dtype in x.items()
+        if column in y and dtype != y[column]
+    ]
+    if dtypes:
+        lines.extend(('', 'dtypes differ:', *dtypes))
+    return lines
+
+
+def _listing(keys: Iterable[Any], total: int) -> str:
+    # Render up to KEYS_SHOWN of the keys, noting how many of the total were left out.
+    rendered = [repr(key) for key, _ in zip(keys, range(KEYS_SHOWN))]
+    if total > len(rendered):
+        rendered.append(f'<{total - len(rendered)} more>')
+    return '[' + ', '.join(rendered) + ']'
@@ -0,0 +1,239 @@
+import pytest
+
+pytest.importorskip("pyarrow")
+
+import pyarrow as pa
+
+import testfixtures.arrow
+from testfixtures import Replace, ShouldAssert, compare
+
+
+def test_importable():
+    compare(testfixtures.arrow.pyarrow.__name__, expected="pyarrow")
+
+
+def test_equal_tables():
+    t1 = pa.table({"a": [1, 2], "b": [1.0, float("nan")], "c": [[1], None]})
+    t2 = pa.table({"a": [1, 2], "b": [1.0, float("nan")], "c": [[1], None]})
+    compare(t1, expected=t2)
+
+
+def test_unequal_tables():
+    t1 = pa.table({"a": [1, 2, 3, 4, 5, 6], "b": ["x", "y", None, "z", "z", "z"]})
+    t2 = pa.table({"a": [1, 0, 0, 4, 0, 6], "b": ["x", "y", "z", "z", "z", "z"]})
+    with ShouldAssert(
+        "Table not as expected:\n"
+        "\n"
+        "values differ in 'a' at rows 1-2, 4 (3 of 6):\n"
+        "[1]: 0 (expected) != 2 (actual)\n"
+        "\n"
+        "values differ in 'b' at row 2 (1 of 6):\n"
+        "[2]: 'z' (expected) != None (actual)"
+    ):
+        compare(t1, expected=t2)
+
+
+def test_tables_chunked_differently():
+    t1 = pa.table({"a": [1, 2, 3, 4, 5, 6, 7]})
+    t2 = pa.concat_tables([t1.slice(0, 3), t1.slice(3, 1), t1.slice(4)])
+    compare(t1, t2)
+    t3 = pa.Table.from_batches([
+        pa.record_batch({"a": [1, 2, 0]}),
+        pa.record_batch({"a": [0, 0, 6, 0]}),
+    ])
+    with ShouldAssert(
+        "Table not as expected:\n"
+        "\n"
+        "values differ in 'a' at rows 2-4, 6 (4 of 7):\n"
+        "[2]: 3 != 0"
+    ):
+        compare(t2, t3)
+
+
+def test_many_ranges():
+    t1 = pa.table({"a": list(range(10))})
+    t2 = pa.table({"a": [0, -1, 2, -3, 4, -5, 6, -7, 8, -9]})
+    with Replace("testfixtures.arrow.RANGES_SHOWN", 3):
+        with ShouldAssert(
+            "Table not as expected:\n"
+            "\n"
+            "values differ in 'a' at rows 1, 3, 5, <2 more> (5 of 10):\n"
+            "[1]: 1 != -1"
+        ):
+            compare(t1, t2)
+
+
+def test_row_counts_differ():
+    t1 = pa.table({"a": [1, 2, 3]})
+    t2 = pa.table({"a": [1, 4]})
+    with ShouldAssert(
+        "Table not as expected:\n"
+        "\n"
+        "row counts differ: 3 != 2\n"
+        "\n"
+        "values differ in 'a' at row 1 (1 of 2):\n"
+        "[1]: 2 != 4"
+    ):
+        compare(t1, t2)
+
+
+def test_floats_and_nulls():
+    inf = float("inf")
+    t1 = pa.table({"x": [1.0, float("nan"), None, inf, 2.0]})
+    t2 = pa.table({"x": [1.0, float("nan"), None, -inf, None]})
+    with ShouldAssert(
+        "Table not as expected:\n"
+        "\n"
+        "values differ in 'x' at rows 3-4 (2 of 5):\n"
+        "[3]: inf != -inf"
+    ):
+        compare(t1, t2)
+
+
+def test_float_tolerance():
+    t1 = pa.table({"x": [1.0, 2.0, 1e-9, None]})
+    t2 = pa.table({"x": [1.000001, 2.1, 0.0, None]})
+    with ShouldAssert(
+        "Table not as expected:\n"
+        "\n"
+        "values differ in 'x' at row 1 (1 of 4):\n"
+        "[1]: 2.0 != 2.1"
+    ):
+        compare(t1, t2)
+    with ShouldAssert(
+        "Table not as expected:\n"
+        "\n"
+        "values differ in 'x' at rows 0-2 (3 of 4):\n"
+        "[0]: 1.0 != 1.000001"
+    ):
+        compare(t1, t2, strict=True)
+
+
+def test_float_tolerance_chunked_array():
+    a1 = pa.chunked_array([[1.0], [2.0]])
+    compare(a1, pa.chunked_array([[1.000001, 2.000002]]))
+    with ShouldAssert(
+        "ChunkedArray not as expected:\n"
+        "\n"
+        "values differ at rows 0-1 (2 of 2):\n"
+        "[0]: 1.0 != 1.000001"
+    ):
+        compare(a1, pa.chunked_array([[1.000001, 2.000002]]), strict=True)
+
+
+def test_nested_values():
+    t1 = pa.table({"x": [[1], [2, 3], None, [4]]})
+    t2 = pa.table({"x": [[1], [2], None, None]})
+    with ShouldAssert(
+        "Table not as expected:\n"
+        "\n"
+        "values differ in 'x' at rows 1, 3 (2 of 4):\n"
+        "[1]: [2, 3] != [2]"
+    ):
+        compare(t1, t2)
+
+
+def test_columns_differ():
+    t1 = pa.table({"a": [1], "b": [1]})
+    t2 = pa.table({"a": [1], "c": [1]})
+    with ShouldAssert(
+        "Table not as expected:\n"
+        "\n"
+        "columns in first but not second:\n"
+        "['b']\n"
+        "\n"
+        "columns in second but not first:\n"
+        "['c']"
+    ):
+        compare(t1, t2)
+
+
+def test_column_order_differs():
+    t1 = pa.table({"a": [1], "b": [1]})
+    with ShouldAssert(
+        "Table not as expected:\n"
+        "\n"
+        "column order differs:\n"
+        "['b', 'a'] (expected) != ['a', 'b'] (actual)"
+    ):
+        compare(t1, expected=t1.select(["b", "a"]))
+
+
+def test_types_differ():
+    t1 = pa.table({"a": [1], "b": [1]})
+    t2 = pa.table({"a": [1.0], "b": [1]})
+    with ShouldAssert(
+        "Table not as expected:\n"
+        "\n"
+        "types differ:\n"
+        "'a': int64 != double"
+    ):
+        compare(t1, t2)
+
+
+def test_strict_fields_and_metadata():
+    t1 = pa.table({"a": [1]})
+    t2 = pa.Table.from_pydict(
+        {"a": [1]},
+        schema=pa.schema([pa.field("a", pa.int64(), nullable=False)], metadata={"k": "v"}),
+    )
+    compare(t1, t2)
+    with ShouldAssert(
+        "Table not as expected:\n"
+        "\n"
+        "fields differ:\n"
+        "'a': int64, metadata=None != int64 not null, metadata=None\n"
+        "\n"
+        "schema metadata differs:\n"
+        "None != {b'k': b'v'}"
+    ):
+        compare(t1, t2, strict=True)
+
+
+def test_record_batches():
+    b1 = pa.record_batch({"a": [1, 2, 3]})
+    b2 = pa.record_batch({"a": [1, 2, 4]})
+    compare(b1, pa.record_batch({"a": [1, 2, 3]}))
+    with ShouldAssert(
+        "RecordBatch not as expected:\n"
+        "\n"
+        "values differ in 'a' at row 2 (1 of 3):\n"
+        "[2]: 3 != 4"
+    ):
+        compare(b1, b2)
+
+
+def test_chunked_arrays():
+    a1 = pa.chunked_array([[1, 2], [3]])
+    compare(a1, pa.chunked_array([[1], [2, 3]]))
+    with ShouldAssert(
+        "ChunkedArray not as expected:\n"
+        "\n"
+        "row counts differ: 3 != 4\n"
+        "\n"
+        "values differ at row 1 (1 of 3):\n"
+        "[1]: 2 != 5"
+    ):
+        compare(a1, pa.chunked_array([[1], [5, 3, 4]]))
+
+
+def test_chunked_array_types_differ():
+    with ShouldAssert(
+        "ChunkedArray not as expected:\n"
+        "\n"
+        "types differ: int64 != string"
+    ):
+        compare(pa.chunked_array([[1]]), pa.chunked_array([["1"]]))
+
+
+def test_table_in_dict():
+    t1 = pa.table({"a": [1]})
+    t2 = pa.table({"a": [2]})
+    message = compare({"foo": t1}, expected={"foo": t2}, raises=False)
+    assert message is not None
+    assert message.endswith(
+        "While comparing ['foo']: Table not as expected:\n"
+        "\n"
+        "values differ in 'a' at row 0 (1 of 1):\n"
+        "[0]: 2 (expected) != 1 (actual)"
+    ), message
@@ -1,18 +1,27 @@
 import json
 import re
+import sys
+import tracemalloc
 import uuid
 from abc import ABC
-from collections import namedtuple
+from array import array
+from collections import OrderedDict, defaultdict, namedtuple
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import date, datetime, time
 from decimal import Decimal
 from enum import StrEnum, auto
 from functools import partial
+from mmap import ACCESS_READ, mmap
+from multiprocessing import get_context
 from re import compile
+from time import sleep
 from typing import TypeVar, Generic, Any
 from unittest import TestCase
 from uuid import uuid4
 
+import pytest
+
 from testfixtures import (
     Comparison as C,
     MappingComparison,
@@ -27,12 +36,15 @@ from testfixtures import (
     singleton,
 )
 from testfixtures.comparers import (
+    RenderLimits,
     compare_sequence,
+    compare_dict,
     compare_object,
+    compare_simple,
     compare_text,
     merge_ignored_attributes,
 )
-from testfixtures.comparing import registry
+from testfixtures.comparing import CompareContext, _fingerprint, compare_stats, registry
 from testfixtures.comparison import like
 from testfixtures.compat import PY_312_PLUS
 from testfixtures.mock import Mock, call
@@ -85,6 +97,10 @@ class Sample:
     x: str
 
 
+def compare_item_three(x, y, context):
+    return 'item 3 is special' if x.value == 3 else None
+
+
 class Broken:
     # An object whose __repr__ raises on demand.
     marker = '<unrepresentable tests.test_compare.Broken: ValueError: boom!>'
@@ -271,6 +287,38 @@ class TestCompare(CompareHelper, TestCase):
             y_label='actual'
             )
 
+    def test_string_diff_very_long(self):
+        self.check_raises(
+            'x'*300+'a'+'x'*100, 'x'*300+'b'+'x'*100,
+            "\n<260 characters>'"+'x'*40+"a"+'x'*39+"'<61 more characters>"
+            "\n!=\n"
+            "<260 characters>'"+'x'*40+"b"+'x'*39+"'<61 more characters>"
+            "\n(first difference at character 300)"
+            )
+
+    def test_string_diff_very_long_start(self):
+        self.check_raises(
+            'a'+'x'*300, 'b'+'x'*300,
+            "\n'a"+'x'*39+"'<261 more characters>\n!=\n'b"+'x'*39+"'<261 more characters>"
+            "\n(first difference at character 0)"
+            )
+
+    def test_string_diff_very_long_prefix(self):
+        self.check_raises(
+            'x'*5000, 'x'*5000+'y',
+            "\n<4960 characters>'"+'x'*40+"'\n!=\n<4960 characters>'"+'x'*40+"y'"
+            "\n(first difference at character 5000)"
+            )
+
+    def test_string_diff_long_newlines_differ(self):
+        differ = Mock(return_value=[('replace', 0, 2, 0, 2)])
+        self.check_raises(
+            'x'*5+'\n'+'y'*5, 'x'*5+'\n'+'z'*5,
+            "\n--- first\n+++ second\n@@ -1,2 +1,2 @@\n-xxxxx\n-yyyyy\n+xxxxx\n+zzzzz",
+            differ=differ,
+            )
+        differ.assert_called_with(['xxxxx', 'yyyyy'], ['xxxxx', 'zzzzz'])
+
     def test_exception_same_object(self):
         e = ValueError('some message')
         compare(e, e)
@@ -1557,6 +1605,40 @@ b
             "'y': 2 != 3"
             )
 
+    def test_namedtuple_nested(self):
+        class_ = namedtuple('Foo', 'x y')
+        self.check_raises(
+            [class_(1, {'a': [1]})], [class_(1, {'a': [2]})],
+            "sequence not as expected:\n\n"
+            "same:\n[]\n\n"
+            "first:\n[Foo(x=1, y={'a': [1]})]\n\n"
+            "second:\n[Foo(x=1, y={'a': [2]})]\n\n"
+            "While comparing [0]: Foo not as expected:\n\n"
+            "same:\n['x']\n\n"
+            "values differ:\n"
+            "'y': {'a': [1]} != {'a': [2]}\n\n"
+            "While comparing [0]['y']: dict not as expected:\n\n"
+            "values differ:\n"
+            "'a': [1] != [2]\n\n"
+            "While comparing [0]['y']['a']: sequence not as expected:\n\n"
+            "same:\n[]\n\n"
+            "first:\n[1]\n\n"
+            "second:\n[2]"
+            )
+
+    def test_namedtuple_strict(self):
+        class_ = namedtuple('Foo', 'z y x')
+        compare(class_(1, 2, 3), class_(1, 2, 3), strict=True)
+        self.check_raises(
+            class_(1, 2, 3), class_(1, 2, 4),
+            "Foo not as expected:\n\n"
+            "same:\n"
+            "['y', 'z']\n\n"
+            "values differ:\n"
+            "'x': 3 != 4",
+            strict=True
+            )
+
     def test_namedtuple_different_type(self):
         class_a = namedtuple('Foo', 'x y')
         class_b = namedtuple('Bar', 'x y z')
@@ -2197,6 +2279,149 @@ b
 
         compare(Child(1), Child(1))
 
+    def test_string_slots(self):
+
+        class Parent:
+            __slots__ = 'name'
+
+        class Child(Parent):
+            __slots__ = ('b',)
+
+            def __init__(self, name, b):
+                self.name, self.b = name, b
+
+        self.check_raises(
+            Child(1, 'x'),
+            Child(2, 'x'),
+            'Child not as expected:\n'
+            '\n'
+            'attributes same:\n'
+            "['b']\n"
+            '\n'
+            'attributes differ:\n'
+            "'name': 1 != 2"
+        )
+
+    def test_slots_resolved_once_per_type(self):
+
+        class Parent:
+            __slots__ = ('a',)
+
+        class Child(Parent):
+            __slots__ = ('b',)
+
+            def __init__(self, a, b):
+                self.a, self.b = a, b
+
+        slot_names = {}
+        with Replace('testfixtures.comparers._slot_names', slot_names):
+            compare([Child(i, i) for i in range(3)], [Child(i, i) for i in range(3)],
+                    strict=True)
+            compare([Child(1, 2)], [Child(1, 2)])
+        assert sorted(slot_names[Child]) == ['a', 'b']
+        assert list(slot_names) == [Child]
+
+    def test_dataclass_strict(self):
+
+        @dataclass
+        class Record:
+            name: str
+            id: int
+            score: float
+
+        compare(Record('a', 1, 0.5), Record('a', 1, 0.5), strict=True)
+        self.check_raises(
+            Record('a', 1, 0.5),
+            Record('a', 2, 1.5),
+            'Record not as expected:\n'
+            '\n'
+            'attributes same:\n'
+            "['name']\n"
+            '\n'
+            'attributes differ:\n'
+            "'id': 1 != 2\n"
+            "'score': 0.5 != 1.5",
+            strict=True
+        )
+
+    def test_dataclass_attribute_not_a_field(self):
+
+        @dataclass
+        class Record:
+            id: int
+
+        x, y = Record(1), Record(1)
+        x.extra, y.extra = 1, 2
+        self.check_raises(
+            x, y,
+            'Record not as expected:\n'
+            '\n'
+            'attributes same:\n'
+            "['id']\n"
+            '\n'
+            'attributes differ:\n'
+            "'extra': 1 != 2",
+            strict=True
+        )
+
+    def test_dataclass_slot_not_set(self):
+
+        @dataclass(slots=True)
+        class Record:
+            id: int
+            name: str
+
+        x, y = Record(1, 'a'), Record(1, 'a')
+        del y.name
+        self.check_raises(
+            x, y,
+            'Record not as expected:\n'
+            '\n'
+            'attributes same:\n'
+            "['id']\n"
+            '\n'
+            'attributes in first but not second:\n'
+            "'name': 'a'",
+            strict=True
+        )
+
+    def test_attrs_class(self):
+        attrs = pytest.importorskip('attrs')
+
+        @attrs.define
+        class Record:
+            id: int
+            name: str
+
+        compare(Record(1, 'a'), Record(1, 'a'), strict=True)
+        self.check_raises(
+            Record(1, 'a'),
+            Record(1, 'b'),
+            'Record not as expected:\n'
+            '\n'
+            'attributes same:\n'
+            "['__weakref__', 'id']\n"
+            '\n'
+            'attributes differ:\n'
+            "'name': 'a' != 'b'\n"
+            '\n'
+            "While comparing .name: 'a' != 'b'",
+            strict=True
+        )
+
+    def test_field_plan_cached_per_class(self):
+
+        @dataclass
+        class Record:
+            id: int
+
+        field_plans = {}
+        with Replace('testfixtures.comparers._field_plans', field_plans):
+            compare([Record(i) for i in range(3)], [Record(i) for i in range(3)],
+                    strict=True)
+        assert list(field_plans) == [Record]
+        assert field_plans[Record].names == ('id',)
+
     def test_slots_and_attrs(self):
 
         class Parent:
@@ -2617,6 +2842,32 @@ class TestIgnore(CompareHelper):
             ignore_attributes=ignore
         )
 
+    def test_ignore_attributes_per_type_mixed(self):
+        ignore = {self.Parent: {'id'}}
+        self.check_raises(
+            [self.Parent(1, 3), self.Child(1, 3)],
+            [self.Parent(2, 3), self.Child(2, 3)],
+            'sequence not as expected:\n'
+            '\n'
+            'same:\n'
+            '[<Parent:1>]\n'
+            '\n'
+            'first:\n'
+            '[<Child:1>]\n'
+            '\n'
+            'second:\n'
+            '[<Child:2>]\n'
+            '\n'
+            'While comparing [1]: Child not as expected:\n'
+            '\n'
+            'attributes same:\n'
+            "['other']\n"
+            '\n'
+            'attributes differ:\n'
+            "'id': 1 != 2",
+            ignore_attributes=ignore
+        )
+
 
 class TestCompareObject:
 
@@ -2655,6 +2906,772 @@ class TestCompareObject:
             compare(self.Thing(x=time()), self.Thing(x=time(fold=1)), strict=True)
 
 
+class TestStreaming(CompareHelper):
+
+    @staticmethod
+    def lists(count, different_at=None):
+        for i in range(count):
+            # new objects each time, so ids get re-used once they're discarded:
+            yield [-1 if i == different_at else i]
+
+    def test_same(self):
+        compare(generator(1, 2, 3), generator(1, 2, 3), streaming=2)
+
+    def test_same_iterables(self):
+        compare(iter(range(1000)), range(1000), streaming=2)
+
+    def test_different(self):
+        self.check_raises(
+            generator(*range(10)), generator(0, 1, 2, 3, 4, -5, 6, 7, 8, 9), streaming=2,
+            message=(
+                "sequence not as expected:\n"
+                "\n"
+                "same:\n"
+                "(..., 3, 4)\n"
+                "\n"
+                "first:\n"
+                "(5, 6, ...)\n"
+                "\n"
+                "second:\n"
+                "(-5, 6, ...)"
+            ),
+        )
+
+    def test_different_at_start_and_end(self):
+        self.check_raises(
+            generator(1, 2), generator(3, 2), streaming=5,
+            message=(
+                "sequence not as expected:\n"
+                "\n"
+                "same:\n"
+                "()\n"
+                "\n"
+                "first:\n"
+                "(1, 2)\n"
+                "\n"
+                "second:\n"
+                "(3, 2)"
+            ),
+        )
+
+    def test_first_shorter(self):
+        self.check_raises(
+            generator(1, 2), generator(1, 2, 3, 4), streaming=1,
+            x_label='expected', y_label='actual',
+            message=(
+                "sequence not as expected:\n"
+                "\n"
+                "same:\n"
+                "(..., 2)\n"
+                "\n"
+                "expected:\n"
+                "()\n"
+                "\n"
+                "actual:\n"
+                "(3, ...)"
+            ),
+        )
+
+    def test_second_shorter(self):
+        self.check_raises(
+            generator(1, 2, 3), generator(1, 2), streaming=3,
+            message=(
+                "sequence not as expected:\n"
+                "\n"
+                "same:\n"
+                "(1, 2)\n"
+                "\n"
+                "first:\n"
+                "(3,)\n"
+                "\n"
+                "second:\n"
+                "()"
+            ),
+        )
+
+    def test_stops_at_first_difference(self):
+        def explodes():
+            yield 1
+            yield 2
+            raise AssertionError('consumed too far')
+
+        self.check_raises(
+            explodes(), generator(3), streaming=1,
+            message=(
+                "sequence not as expected:\n"
+                "\n"
+                "same:\n"
+                "()\n"
+                "\n"
+                "first:\n"
+                "(1, ...)\n"
+                "\n"
+                "second:\n"
+                "(3,)"
+            ),
+        )
+
+    def test_discarded_items_not_already_seen(self):
+        self.check_raises(
+            self.lists(100), self.lists(100, different_at=50), streaming=1,
+            message=(
+                "sequence not as expected:\n"
+                "\n"
+                "same:\n"
+                "(..., [49])\n"
+                "\n"
+                "first:\n"
+                "([50], ...)\n"
+                "\n"
+                "second:\n"
+                "([-1], ...)\n"
+                "\n"
+                "While comparing [50]: sequence not as expected:\n"
+                "\n"
+                "same:\n"
+                "[]\n"
+                "\n"
+                "first:\n"
+                "[50]\n"
+                "\n"
+                "second:\n"
+                "[-1]"
+            ),
+        )
+
+    def test_not_streaming_by_default(self):
+        self.check_raises(
+            generator(1, 2), generator(1, 3),
+            message=(
+                "sequence not as expected:\n"
+                "\n"
+                "same:\n"
+                "(1,)\n"
+                "\n"
+                "first:\n"
+                "(2,)\n"
+                "\n"
+                "second:\n"
+                "(3,)"
+            ),
+        )
+
+
+
+class TestDifferent(CompareHelper):
+
+    class Key:
+
+        def __init__(self, name):
+            self.name = name
+            self.reprs = 0
+
+        def __repr__(self):
+            self.reprs += 1
+            return self.name
+
+    class Pair:
+
+        def __init__(self, key, value):
+            self.key = key
+            self.value = value
+
+    @staticmethod
+    def compare_pair(x, y, context):
+        if context.different(x.value, y.value, '[%r]', x.key):
+            return 'pairs differ'
+
+    def test_equal_leaves_no_trace(self):
+        context = CompareContext(None, None)
+        assert context.different(Item(1), Item(1), '[%r]', 0) is False
+        compare(context._seen, expected={})
+        compare(context.breadcrumbs, expected=[])
+        compare(context.message, expected='')
+
+    def test_breadcrumb_not_formatted_when_equal(self):
+        key = self.Key('key')
+        compare(self.Pair(key, 'a'), self.Pair(key, 'a'),
+                comparers={self.Pair: self.compare_pair})
+        compare(key.reprs, expected=0)
+
+    def test_breadcrumb_formatted_when_different(self):
+        key = self.Key('key')
+        self.check_raises(
+            self.Pair(key, {'a': 1}), self.Pair(key, {'a': 2}),
+            comparers={self.Pair: self.compare_pair},
+            message=(
+                "pairs differ\n"
+                "\n"
+                "While comparing [key]: dict not as expected:\n"
+                "\n"
+                "values differ:\n"
+                "'a': 1 != 2"
+            ),
+        )
+        compare(key.reprs, expected=1)
+
+    def test_same_object_strict(self):
+        obj = Item(1)
+        compare([obj, obj], [obj, obj], strict=True)
+
+
+
+class Node:
+
+    def __init__(self, value, next_=None):
+        self.value = value
+        self.next = next_
+
+
+class TestDeepNesting(CompareHelper):
+
+    depth = sys.getrecursionlimit() * 3
+
+    def nested_lists(self, leaf):
+        value = leaf
+        for _ in range(self.depth):
+            value = [value]
+        return value
+
+    def linked_nodes(self, last):
+        node = Node(last)
+        for i in range(self.depth):
+            node = Node(i, node)
+        return node
+
+    def test_lists_equal(self):
+        compare(self.nested_lists(1), self.nested_lists(1), strict=True)
+
+    def test_lists_different(self):
+        self.check_raises(
+            self.nested_lists(1), self.nested_lists(2),
+            recursive=False, render_limits=RenderLimits(max_depth=1),
+            message=(
+                "sequence not as expected:\n"
+                "\n"
+                "same:\n"
+                "[]\n"
+                "\n"
+                "first:\n"
+                "[[...]]\n"
+                "\n"
+                "second:\n"
+                "[[...]]"
+            ),
+        )
+
+    def test_linked_objects_equal(self):
+        compare(self.linked_nodes(1), self.linked_nodes(1))
+
+    def test_linked_objects_different(self):
+        message = compare(
+            self.linked_nodes(1), self.linked_nodes(2), raises=False,
+            render_limits=RenderLimits(max_depth=1),
+        )
+        path = '.next' * self.depth
+        assert message.endswith(
+            f"While comparing {path}: "
+            "Node not as expected:\n"
+            "\n"
+            "attributes same:\n"
+            "['next']\n"
+            "\n"
+            "attributes differ:\n"
+            "'value': 1 != 2"
+        ), message[-500:]
+
+    def test_unrepresentable(self):
+        value = self.nested_lists(1)
+        for _ in range(sys.getrecursionlimit() * 100):
+            value = [value]
+        compare(
+            safe_repr(value),
+            expected='<unrepresentable builtins.list: RecursionError: '
+                     'maximum recursion depth exceeded while getting the repr of an object>',
+        )
+
+
+class TestSteps:
+
+    class Thing:
+        pass
+
+    @staticmethod
+    def compare_thing(x, y, context):
+        raise ValueError('boom')
+
+    def test_exception_in_nested_comparer(self):
+        context = CompareContext(None, None, comparers={self.Thing: self.compare_thing})
+        with ShouldRaise(ValueError('boom')):
+            context.different({'a': [self.Thing()]}, {'a': [self.Thing()]}, '')
+        compare(context.breadcrumbs, expected=[])
+        compare(context.message, expected='')
+
+    def test_comparer_called_directly(self):
+        context = CompareContext('x', 'y')
+        compare(
+            compare_sequence([[1]], [[2]], context),
+            expected=(
+                'sequence not as expected:\n'
+                '\n'
+                'same:\n'
+                '[]\n'
+                '\n'
+                'x:\n'
+                '[[1]]\n'
+                '\n'
+                'y:\n'
+                '[[2]]'
+            )
+        )
+        compare(
+            context.message,
+            expected=(
+                'sequence not as expected:\n'
+                '\n'
+                'same:\n'
+                '[]\n'
+                '\n'
+                'x:\n'
+                '[1]\n'
+                '\n'
+                'y:\n'
+                '[2]'
+            )
+        )
+
+
+
+class TestParallel:
+
+    @pytest.fixture(autouse=True)
+    def threshold(self):
+        with Replace('testfixtures.comparing.PARALLEL_THRESHOLD', 10):
+            yield
+
+    @pytest.fixture()
+    def executor(self):
+        with ThreadPoolExecutor(2) as executor:
+            yield Mock(wraps=executor, spec=Executor)
+
+    @pytest.fixture()
+    def spawned(self):
+        with ProcessPoolExecutor(2, mp_context=get_context('spawn')) as executor:
+            yield executor
+
+    def check(self, x, y, workers, **kw):
+        expected = compare(x, y, raises=False, **kw)
+        assert expected is not None
+        compare(compare(x, y, raises=False, workers=workers, **kw), expected=expected)
+
+    def test_sequence(self, executor):
+        x = [{'id': i} for i in range(100)]
+        y = [{'id': i} for i in range(100)]
+        y[55]['id'] = -1
+        y[75]['id'] = -1
+        self.check(x, y, executor)
+        assert executor.submit.called
+
+    def test_sequence_lengths_differ(self, executor):
+        self.check(list(range(100)), list(range(105)), executor)
+
+    def test_tuple(self, executor):
+        self.check(tuple(range(100)), tuple(range(99)) + (-1,), executor, strict=True)
+
+    def test_mapping(self, executor):
+        x = {i: [i] for i in range(100)}
+        y = {i: [i] for i in range(1, 101)}
+        y[20] = [-1]
+        y[70] = [-1]
+        self.check(x, y, executor)
+
+    def test_processes(self):
+        self.check(list(range(20)), list(range(19)) + [-1], workers=2)
+
+    def test_processes_unpicklable_items(self):
+        class Local:
+            def __init__(self, value):
+                self.value = value
+
+        self.check([Local(i) for i in range(20)], [Local(-i) for i in range(20)], workers=2)
+
+    def test_processes_registered_comparer(self, spawned):
+        with registry():
+            register(Item, compare_item_three, ignore_eq=True)
+            self.check([Item(i) for i in range(20)], [Item(i) for i in range(20)], spawned)
+
+    def test_processes_unpicklable_comparer(self, spawned):
+        with registry():
+            register(Item, lambda x, y, context: compare_item_three(x, y, context),
+                     ignore_eq=True)
+            self.check([Item(i) for i in range(20)], [Item(i) for i in range(20)], spawned)
+
+    def test_equal(self, executor):
+        compare(list(range(100)), list(range(100)), workers=executor, strict=True)
+
+    def test_below_threshold(self, executor):
+        self.check(list(range(9)), list(range(8)) + [-1], executor)
+        executor.submit.assert_not_called()
+
+    def test_comparer_replaced(self, executor):
+        self.check(list(range(100)), list(range(99)) + [-1], executor,
+                   comparers={list: lambda x, y, context: 'custom'})
+        executor.submit.assert_not_called()
+
+    def test_options_passed_to_workers(self, executor):
+        self.check(
+            [Item(i) for i in range(100)], [Item(-1) for i in range(100)], executor,
+            ignore_eq=True, ignore_attributes=['value'], strict=True,
+        )
+
+
+def hexdump_row(offset, hex_, text):
+    return f'{offset:08x}  {hex_:<48}  |{text}|'
+
+
+class TestBuffers(CompareHelper):
+
+    def test_bytearray(self):
+        self.check_raises(
+            bytearray(b'hello world'), bytearray(b'hello wOrld'), '\n'.join([
+                '1 differing region, the first at offset 7',
+                '',
+                '@@ 7-8 @@',
+                'first:',
+                hexdump_row(0, '68 65 6c 6c 6f 20 77 6f  72 6c 64', 'hello world'),
+                'second:',
+                hexdump_row(0, '68 65 6c 6c 6f 20 77 4f  72 6c 64', 'hello wOrld'),
+            ])
+        )
+
+    def test_equal(self):
+        compare(bytearray(b'abc'), expected=bytearray(b'abc'))
+        compare(memoryview(b'abc'), expected=memoryview(bytearray(b'abc')))
+
+    def test_array_labels(self):
+        self.check_raises(
+            array('i', [1, 2]), array('i', [1, 3]), '\n'.join([
+                '1 differing region, the first at offset 4',
+                '',
+                '@@ 4-5 @@',
+                'expected:',
+                hexdump_row(0, '01 00 00 00 02 00 00 00', '........'),
+                'actual:',
+                hexdump_row(0, '01 00 00 00 03 00 00 00', '........'),
+            ]),
+            x_label='expected', y_label='actual',
+        )
+
+    def test_memoryview_lengths_differ(self):
+        self.check_raises(
+            memoryview(b'ab'), memoryview(b'abcd'), '\n'.join([
+                '1 differing region, the first at offset 2',
+                'lengths differ: 2 != 4',
+                '',
+                '@@ 2-4 @@',
+                'first:',
+                hexdump_row(0, '61 62', 'ab'),
+                'second:',
+                hexdump_row(0, '61 62 63 64', 'abcd'),
+            ])
+        )
+
+    def test_empty(self):
+        self.check_raises(
+            bytearray(), bytearray(b'a'), '\n'.join([
+                '1 differing region, the first at offset 0',
+                'lengths differ: 0 != 1',
+                '',
+                '@@ 0-1 @@',
+                'first:',
+                '<no bytes>',
+                'second:',
+                hexdump_row(0, '61', 'a'),
+            ])
+        )
+
+    def test_non_contiguous_memoryview(self):
+        compare(memoryview(b'abcd')[::2], expected=memoryview(b'ac'))
+
+    def test_mmap(self, tmp_path):
+        data = bytearray(100_000)
+        (tmp_path / 'x').write_bytes(data)
+        data[70_000] = 1
+        (tmp_path / 'y').write_bytes(data)
+        with (tmp_path / 'x').open('rb') as x_file, (tmp_path / 'y').open('rb') as y_file:
+            with mmap(x_file.fileno(), 0, access=ACCESS_READ) as x, \
+                    mmap(y_file.fileno(), 0, access=ACCESS_READ) as y:
+                compare(x, expected=x)
+                message = compare(x, y, raises=False)
+        assert message is not None
+        compare(message.split('\n')[0], expected='1 differing region, the first at offset 70000')
+
+    def test_regions_across_chunks(self):
+        x = bytearray(200_000)
+        y = bytearray(200_000)
+        y[65_530:65_540] = b'\x01' * 10
+        y[100_000] = 1
+        y[150_000] = 1
+        y[199_999] = 1
+        message = compare(x, y, raises=False)
+        assert message is not None
+        compare(message.split('\n')[0], expected=(
+            '4 differing regions, the first at offset 65530'
+        ))
+        compare(
+            [line for line in message.split('\n') if line.startswith(('@@', '<'))],
+            expected=['@@ 65530-65540 @@', '@@ 100000-100001 @@', '@@ 150000-150001 @@',
+                      '<1 more regions>'],
+        )
+
+    def test_hexdump_rows_limited(self):
+        message = compare(bytearray(1000), bytearray(b'\x01' * 1000), raises=False)
+        assert message is not None
+        compare(len(message.split('\n')), expected=13)
+
+    def test_long_bytes(self):
+        message = compare(b'x' * 300, b'x' * 299 + b'y', raises=False)
+        assert message is not None
+        compare(message.split('\n')[0], expected='1 differing region, the first at offset 299')
+
+
+class CountedRepr:
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+
+    def __repr__(self):
+        self.calls += 1
+        return f'<{self.name}>'
+
+
+class TestRenderCache:
+
+    def test_safe_repr(self):
+        obj = CountedRepr('obj')
+        context = CompareContext(None, None)
+        compare(context.safe_repr(obj), expected='<obj>')
+        compare(context.safe_repr(obj), expected='<obj>')
+        compare(obj.calls, expected=1)
+
+    def test_safe_pformat(self):
+        obj = CountedRepr('obj')
+        context = CompareContext(None, None)
+        compare(context.safe_pformat(obj), expected='<obj>')
+        compare(context.safe_pformat(obj), expected='<obj>')
+        compare(obj.calls, expected=1)
+
+    def test_not_shared_between_contexts(self):
+        obj = CountedRepr('obj')
+        CompareContext(None, None).safe_repr(obj)
+        CompareContext(None, None).safe_repr(obj)
+        compare(obj.calls, expected=2)
+
+    def test_sorted_by_repr(self):
+        b, a = CountedRepr('b'), CountedRepr('a')
+        context = CompareContext(None, None)
+        compare(context.sorted_by_repr([b, a]), expected=[a, b])
+        compare(context.safe_repr(a), expected='<a>')
+        compare((a.calls, b.calls), expected=(1, 1))
+
+    def test_sorted_by_repr_with_render_limits(self):
+        obj = CountedRepr('obj')
+        context = CompareContext(None, None, render_limits=RenderLimits(max_chars=2))
+        context.sorted_by_repr([obj])
+        context.sorted_by_repr([obj])
+        compare(context.safe_repr(obj), expected='<o<3 more characters>')
+        compare(obj.calls, expected=2)
+
+    def test_mapping_keys(self):
+        same, differs, missing = CountedRepr('same'), CountedRepr('differs'), CountedRepr('missing')
+        with ShouldAssert(
+            "dict not as expected:\n\n"
+            "same:\n[<same>]\n\n"
+            "in first but not second:\n<missing>: 3\n\n"
+            "values differ:\n<differs>: 1 != 2"
+        ):
+            compare({same: 0, differs: 1, missing: 3}, {same: 0, differs: 2})
+        compare((same.calls, differs.calls, missing.calls), expected=(2, 1, 1))
+
+
+class TestCompareStats:
+
+    def test_nodes_and_depth(self):
+        with compare_stats() as stats:
+            compare([{'a': [1]}], [{'a': [2]}], raises=False)
+        compare(stats.nodes, expected=4)
+        compare(stats.max_depth, expected=4)
+        compare(set(stats.comparer_times), expected={
+            compare_sequence, compare_dict, compare_simple
+        })
+        compare(set(stats.type_times), expected={list, dict, int})
+        assert stats.pformat_time > 0
+        compare(stats.peak_memory, expected=None)
+
+    def test_accumulates_across_calls(self):
+        with compare_stats() as stats:
+            compare(1, 2, raises=False)
+            compare(1, 2, raises=False)
+        compare(stats.nodes, expected=2)
+        compare(stats.max_depth, expected=1)
+
+    def test_equal_not_counted(self):
+        with compare_stats() as stats:
+            compare([1, 2], [1, 2])
+        compare(stats.nodes, expected=0)
+
+    def test_not_gathered_outside(self):
+        with compare_stats() as stats:
+            pass
+        compare(1, 2, raises=False)
+        compare(stats.nodes, expected=0)
+
+    def test_already_seen(self):
+        x: dict = {'a': 1}
+        x['b'] = x
+        y: dict = {'a': 2}
+        y['b'] = y
+        with compare_stats() as stats:
+            compare(x, y, raises=False)
+        compare(stats.already_seen, expected=2)
+
+    def test_self_time(self):
+        def slow_comparer(x, y, context):
+            sleep(0.01)
+            return context.different(x.value, y.value, '.value')
+
+        with compare_stats() as stats:
+            compare(Item(1), Item(2), raises=False, comparers={Item: slow_comparer})
+        assert stats.comparer_times[slow_comparer] >= 0.01
+        assert stats.comparer_times[compare_simple] < 0.01
+        compare(stats.max_depth, expected=2)
+
+    def test_exception(self):
+        def broken(x, y, context):
+            raise ValueError('boom')
+
+        with compare_stats() as stats:
+            with ShouldRaise(ValueError('boom')):
+                compare([Item(1)], [Item(2)], comparers={Item: broken})
+            compare(1, 2, raises=False)
+        compare(stats.max_depth, expected=2)
+        compare(stats._stack, expected=[])
+
+    def test_trace_memory(self):
+        with compare_stats(trace_memory=True) as stats:
+            compare(list(range(1000)), list(range(1001)), raises=False)
+        assert stats.peak_memory is not None and stats.peak_memory > 0
+        assert not tracemalloc.is_tracing()
+
+    def test_trace_memory_already_tracing(self):
+        tracemalloc.start()
+        try:
+            peak = bytearray(1_000_000)
+            del peak
+            with compare_stats(trace_memory=True) as stats:
+                compare(list(range(1000)), list(range(1001)), raises=False)
+            # The peak of the existing session is left alone:
+            assert tracemalloc.get_traced_memory()[1] >= 1_000_000
+            assert tracemalloc.is_tracing()
+        finally:
+            tracemalloc.stop()
+        assert stats.peak_memory is not None and stats.peak_memory > 0
+
+    def test_str(self):
+        with compare_stats() as stats:
+            compare(1, 2, raises=False)
+        lines = str(stats).split('\n')
+        compare(lines[:3], expected=['nodes: 1', 'max depth: 1', 'already seen: 0'])
+        compare(lines[5], expected='time by comparer:')
+        assert lines[6].startswith('  testfixtures.comparers.compare_simple: ')
+        compare(lines[7], expected='time by type:')
+        assert lines[8].startswith('  builtins.int: ')
+
+
+class TestFingerprints(CompareHelper):
+
+    @staticmethod
+    def fingerprint(obj):
+        return _fingerprint(obj, {})
+
+    def test_equal_trees(self):
+        x = {'a': [1, 2.5, (None, True)], 'b': {'c': b'd'}}
+        y = {'b': {'c': b'd'}, 'a': [1, 2.5, (None, True)]}
+        assert self.fingerprint(x) is not None
+        compare(self.fingerprint(x), expected=self.fingerprint(y))
+
+    def test_types_distinguished(self):
+        fingerprints = {self.fingerprint(v) for v in (
+            [1], [1.0], [True], ['1'], [b'1'], [(1,)], [[1]], [{1: None}], [1, None],
+        )}
+        compare(len(fingerprints), expected=9)
+
+    def test_boundaries_distinguished(self):
+        assert self.fingerprint(['ab', 'c']) != self.fingerprint(['a', 'bc'])
+        assert self.fingerprint({'a': 'bc'}) != self.fingerprint({'ab': 'c'})
+
+    def test_not_fingerprinted(self):
+        compare(self.fingerprint([float('nan')]), expected=None)
+        compare(self.fingerprint([Item(1)]), expected=None)
+        x: list = [1]
+        x.append(x)
+        compare(self.fingerprint(x), expected=None)
+
+    def test_shared_subtree(self):
+        shared = [1, 2]
+        fingerprints = {}
+        _fingerprint([shared, shared], fingerprints)
+        compare(fingerprints[id(shared)], expected=(shared, self.fingerprint([1, 2])))
+
+    def test_deep(self):
+        x: list = []
+        for _ in range(10_000):
+            x = [x]
+        assert self.fingerprint(x) is not None
+
+    def test_equal_subtrees_skipped(self):
+        x = {'rows': [{'id': i, 'tags': ['a', 'b']} for i in range(100)], 'total': 100}
+        y = {'rows': [{'id': i, 'tags': ['a', 'b']} for i in range(100)], 'total': 101}
+        context = CompareContext(None, None, strict=True)
+        context._enter = enter = Mock(wraps=context._enter)
+        result = context.different(x, y, '')
+        # 'rows' is found to be equal without descending into it:
+        compare(enter.call_count, expected=2)
+        compare(result, expected=(
+            "dict not as expected:\n\n"
+            "same:\n['rows']\n\n"
+            "values differ:\n'total': 100 != 101"
+        ))
+
+    def test_only_when_eq_is_not_used(self):
+        with Replace('testfixtures.comparing._registry.ignore_eq_types', set()):
+            assert CompareContext(None, None)._fingerprints is None
+            assert CompareContext(None, None, strict=True)._fingerprints == {}
+            assert CompareContext(None, None, ignore_eq=True)._fingerprints == {}
+
+    def test_not_used_with_custom_comparer(self):
+        context = CompareContext(None, None, strict=True, comparers={str: compare_simple})
+        assert context._fingerprints is None
+
+    def test_nan(self):
+        self.check_raises(
+            [float('nan')], [float('nan')],
+            'sequence not as expected:\n\n'
+            'same:\n[]\n\n'
+            'first:\n[nan]\n\n'
+            'second:\n[nan]',
+            strict=True,
+        )
+
+    def test_loops(self):
+        x: list = [1]
+        x.append(x)
+        y: list = [1]
+        y.append(y)
+        compare(x, expected=y, strict=True)
+
+
 class BaseClass(ABC):
     pass
 
@@ -2912,6 +3929,159 @@ class TestSafeHelpers:
             safe_pformat(Broken(exc=K()))
 
 
+class TestRenderLimits(CompareHelper):
+
+    class Thing:
+        def __init__(self, value):
+            self.value = value
+        def __repr__(self):
+            return f'<Thing:{self.value}>'
+
+    def test_max_items(self):
+        limits = RenderLimits(max_items=2)
+        compare(safe_repr([1, 2, 3, 4], limits), expected='[1, 2, <2 more>]')
+        compare(safe_repr((1, 2, 3), limits), expected='(1, 2, <1 more>)')
+        compare(safe_repr({3, 2, 1}, limits), expected='{1, 2, <1 more>}')
+        compare(safe_repr(frozenset({4, 3, 2, 1}), limits),
+                expected='frozenset({1, 2, <2 more>})')
+        compare(safe_pformat({3, 2, 1}, limits), expected='{1, 2, <1 more>}')
+        compare(safe_repr({'a': 1, 'b': 2, 'c': 3}, limits),
+                expected="{'a': 1, 'b': 2, <1 more>: ...}")
+
+    def test_max_items_set_independent_of_hashing(self):
+        limits = RenderLimits(max_items=2)
+        compare(safe_repr({'date', 'cherry', 'banana', 'apple'}, limits),
+                expected="{'apple', 'banana', <2 more>}")
+        compare(safe_repr({'b', 2, 'a', 1}, limits),
+                expected="{'a', 'b', <2 more>}")
+
+    def test_max_items_not_reached(self):
+        compare(safe_repr([1, 2], RenderLimits(max_items=2)), expected='[1, 2]')
+
+    def test_max_depth(self):
+        limits = RenderLimits(max_depth=2)
+        compare(safe_repr([1, [2, [3]], {'a': {}}, ((),)], limits),
+                expected="[1, [2, [...]], {'a': {...}}, ((...),)]")
+
+    def test_max_depth_zero(self):
+        compare(safe_repr({'a': 1}, RenderLimits(max_depth=0)), expected='{...}')
+
+    def test_max_chars(self):
+        limits = RenderLimits(max_chars=5)
+        compare(safe_repr('x' * 10, limits), expected="'xxxxx'<5 more characters>")
+        compare(safe_repr(self.Thing('1234567890'), limits), expected='<Thin<13 more characters>')
+
+    def test_max_chars_nested_strings(self):
+        compare(safe_repr(['x' * 1000], RenderLimits(max_chars=5)),
+                expected="['xxx<25 more characters>")
+
+    def test_safe_pformat(self):
+        limits = RenderLimits(max_items=3)
+        compare(safe_pformat({'a': list(range(10)), 'b': 'y' * 80}, limits),
+                expected=(
+                    "{'a': [0, 1, 2, <7 more>],\n"
+                    " 'b': 'yyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyyy'}"
+                ))
+
+    def test_subclasses(self):
+        class MyList(list):
+            pass
+
+        limits = RenderLimits(max_items=1)
+        compare(safe_repr(MyList([1, 2, 3]), limits), expected='[1, <2 more>]')
+        compare(safe_repr(OrderedDict(a=1, b=2), limits), expected="{'a': 1, <1 more>: ...}")
+        compare(safe_repr(defaultdict(list, a=[1, 2]), limits),
+                expected="{'a': [1, <1 more>]}")
+        Pair = namedtuple('Pair', 'x y')
+        compare(safe_repr(Pair(1, 2), limits), expected='(1, <1 more>)')
+
+    def test_subclasses_unchanged_when_within_limits(self):
+        Pair = namedtuple('Pair', 'x y')
+        limits = RenderLimits(max_items=2)
+        compare(safe_repr(Pair(1, [2]), limits), expected='Pair(x=1, y=[2])')
+        ordered = OrderedDict(a=1)
+        compare(safe_repr(ordered, limits), expected=repr(ordered))
+
+    def test_call_not_limited(self):
+        compare(safe_repr(call.method(1, 2, 3), RenderLimits(max_items=1)),
+                expected='call.method(1, 2, 3)')
+
+    def test_broken_item(self):
+        compare(safe_repr([Broken(), 2], RenderLimits(max_items=1)),
+                expected=f'[{Broken.marker}, <1 more>]')
+
+    def test_compare_sequence(self):
+        self.check_raises(
+            list(range(100)), list(range(50)) + [-1] * 50,
+            render_limits=RenderLimits(max_items=2),
+            message=(
+                'sequence not as expected:\n'
+                '\n'
+                'same:\n'
+                '[0, 1, <48 more>]\n'
+                '\n'
+                'first:\n'
+                '[50, 51, <48 more>]\n'
+                '\n'
+                'second:\n'
+                '[-1, -1, <48 more>]'
+            ),
+        )
+
+    def test_compare_dict(self):
+        self.check_raises(
+            {'a': list(range(10)), 'b': 1},
+            {'a': [], 'c': 'x' * 100},
+            render_limits=RenderLimits(max_items=2, max_chars=20),
+            message=(
+                'dict not as expected:\n'
+                '\n'
+                'in first but not second:\n'
+                "'b': 1\n"
+                '\n'
+                'in second but not first:\n'
+                "'c': 'xxxxxxxxxxxxxxxxxxxx'<80 more characters>\n"
+                '\n'
+                'values differ:\n'
+                "'a': [0, 1, <8 more>] != []\n"
+                '\n'
+                "While comparing ['a']: sequence not as expected:\n"
+                '\n'
+                'same:\n'
+                '[]\n'
+                '\n'
+                'first:\n'
+                '[0, 1, <8 more>]\n'
+                '\n'
+                'second:\n'
+                '[]'
+            ),
+        )
+
+    def test_compare_simple_truncated_reprs_match(self):
+        self.check_raises(
+            Decimal('1' * 30), Decimal('1' * 29 + '2'),
+            render_limits=RenderLimits(max_chars=10),
+            message=(
+                'not equal:\n'
+                "Decimal('1<31 more characters>\n"
+                "Decimal('1<31 more characters>"
+            ),
+        )
+
+    def test_compare_text(self):
+        self.check_raises(
+            'x' * 20, 'y' * 20,
+            render_limits=RenderLimits(max_chars=5),
+            message=(
+                '\n'
+                "'xxxxx'<15 more characters>\n"
+                '!=\n'
+                "'yyyyy'<15 more characters>"
+            ),
+        )
+
+
 class TestSafeRenderingInComparers:
 
     def test_compare_simple_broken_x(self):
@@ -1,4 +1,5 @@
 import sys
+from threading import Barrier, Thread
 from unittest import TestCase
 from uuid import UUID, uuid4
 
@@ -8,7 +9,10 @@ from testfixtures import (
     diff,
     Comparison,
     MappingComparison,
+    Match,
     SequenceComparison,
+    ShouldRaise,
+    StatefulComparison,
     compare,
     like,
 )
@@ -770,3 +774,110 @@ class TestSafeRendering:
                 f'{Broken.marker},</>'
             ),
         )
+
+
+class TestMatch:
+
+    def test_matched(self):
+        c = Comparison(ValueError, args=(1,))
+        result = c.match(ValueError(1))
+        assert result
+        compare(result, expected=Match(c), strict=True)
+        compare(repr(result), expected='<C:builtins.ValueError>args: (1,)</>')
+
+    def test_not_matched(self):
+        c = Comparison(ValueError, args=(1,))
+        result = c.match(ValueError(2))
+        assert not result
+        compare(result.failed, expected=(
+            "\nattributes differ:\n"
+            "'args': (1,) (Comparison) != (2,) (actual)"
+        ))
+        compare(repr(result), expected=(
+            '\n<C:builtins.ValueError(failed)>\n'
+            'attributes differ:\n'
+            "'args': (1,) (Comparison) != (2,) (actual)\n"
+            '</C:builtins.ValueError>'
+        ))
+
+    def test_wrong_type(self):
+        result = Comparison(ValueError).match(TypeError())
+        compare(result.failed, expected='wrong type: builtins.TypeError')
+
+    def test_comparison_unchanged(self):
+        c = Comparison(ValueError, args=(1,))
+        assert not c.match(ValueError(2))
+        compare(c.failed, expected='')
+        compare(repr(c), expected='<C:builtins.ValueError>args: (1,)</>')
+
+    def test_sequence_checked_indices(self):
+        s = SequenceComparison(1, 2, partial=True)
+        result = s.match([1, 3, 2])
+        assert result
+        compare(result.checked_indices, expected=frozenset({0, 2}))
+        compare(s.checked_indices, expected=set())
+        assert s == [1, 3, 2]
+        compare(s.checked_indices, expected={0, 2})
+
+    def test_sequence_bad_type(self):
+        compare(SequenceComparison(1).match(1).failed, expected='bad type')
+
+    def test_mapping(self):
+        m = MappingComparison(a=1, partial=True)
+        assert m.match({'a': 1, 'b': 2})
+        result = m.match({'a': 2})
+        compare(result.failed, expected="values differ:\n'a': 1 (expected) != 2 (actual)")
+        compare(m.failed, expected='')
+        compare(m.match('x').failed, expected='bad type')
+
+    def test_subclass_implementing_ne(self):
+        class Odd(StatefulComparison):
+            def __ne__(self, other):
+                self.failed = '' if other % 2 else 'even'
+                return bool(self.failed)
+
+        odd = Odd()
+        assert odd.match(1)
+        result = odd.match(2)
+        assert not result
+        compare(result.failed, expected='even')
+        compare(repr(result), expected='<Odd(failed)>even</>')
+
+    def test_subclass_implementing_ne_without_failed(self):
+        class Odd(StatefulComparison):
+            def __ne__(self, other):
+                return not other % 2
+
+        result = Odd().match(2)
+        assert not result
+        compare(result.failed, expected='not equal')
+
+    def test_subclass_implementing_nothing(self):
+        class Nothing(StatefulComparison):
+            pass
+
+        with ShouldRaise(NotImplementedError('Nothing must implement match()')):
+            Nothing().match(1)
+
+    def test_failed_recorded_per_thread(self):
+        c = Comparison(ValueError, args=(1,))
+        barrier = Barrier(2)
+        failures = {}
+
+        def check(actual):
+            barrier.wait()
+            c == actual
+            barrier.wait()
+            failures[actual.args] = c.failed
+
+        threads = [Thread(target=check, args=(ValueError(i),)) for i in (1, 2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        compare(failures, expected={
+            (1,): '',
+            (2,): "\nattributes differ:\n'args': (1,) (Comparison) != (2,) (actual)",
+        })
+        compare(c.failed, expected='')
@@ -1,6 +1,10 @@
+from difflib import unified_diff
+from random import Random
 from unittest import TestCase
 
-from testfixtures import diff
+from testfixtures import Replace, compare, diff
+from testfixtures.comparers import difflib_differ, patience_differ
+from testfixtures.mock import Mock
 
 
 class TestDiff(TestCase):
@@ -40,3 +44,105 @@ class TestDiff(TestCase):
             actual,
             '\n%r\n!=\n%r' % (expected, actual)
         )
+
+    def test_differ(self):
+        actual = diff('a\nb', 'a\nc', differ=lambda a, b: [('replace', 0, 2, 0, 2)])
+        compare(actual, expected='--- first\n+++ second\n@@ -1,2 +1,2 @@\n-a\n-b\n+a\n+c')
+
+    def test_equal(self):
+        compare(diff('a\nb', 'a\nb'), expected='')
+
+    def test_large_uses_patience(self):
+        x = '\n'.join(['{', '}'] * 5)
+        y = x.replace('}', ']', 1)
+        with Replace('testfixtures.comparers.DIFFLIB_THRESHOLD', 10):
+            with Replace('testfixtures.comparers.patience_differ',
+                         Mock(wraps=patience_differ)) as differ:
+                actual = diff(x, y)
+        differ.assert_called_once()
+        compare(actual, expected='--- first\n+++ second\n@@ -1,5 +1,5 @@\n {\n-}\n+]\n {\n }\n {')
+
+
+def check_opcodes(a, b, opcodes):
+    # Applying the opcodes to a must give b:
+    i = j = 0
+    for tag, i1, i2, j1, j2 in opcodes:
+        compare((i1, j1), expected=(i, j))
+        if tag == 'equal':
+            compare(a[i1:i2], expected=b[j1:j2])
+        i, j = i2, j2
+    compare((i, j), expected=(len(a), len(b)))
+
+
+class TestPatienceDiffer:
+
+    def test_empty(self):
+        compare(patience_differ([], []), expected=[])
+
+    def test_equal(self):
+        compare(patience_differ(['a', 'b'], ['a', 'b']), expected=[('equal', 0, 2, 0, 2)])
+
+    def test_insert_delete(self):
+        compare(patience_differ(['a', 'b', 'c'], ['a', 'c', 'd']), expected=[
+            ('equal', 0, 1, 0, 1),
+            ('delete', 1, 2, 1, 1),
+            ('equal', 2, 3, 1, 2),
+            ('insert', 3, 3, 2, 3),
+        ])
+
+    def test_anchored_on_unique_lines(self):
+        compare(patience_differ(['one', 'two', 'three'], ['three', 'one', 'two']), expected=[
+            ('insert', 0, 0, 0, 1),
+            ('equal', 0, 2, 1, 3),
+            ('delete', 2, 3, 3, 3),
+        ])
+
+    def test_repeated_lines(self):
+        a = ['{', '}'] * 100
+        b = a[:100] + ['x'] + a[101:]
+        compare(patience_differ(a, b), expected=[
+            ('equal', 0, 100, 0, 100),
+            ('replace', 100, 101, 100, 101),
+            ('equal', 101, 200, 101, 200),
+        ])
+
+    def test_no_unique_lines(self):
+        a = ['x', 'y', 'x', 'y']
+        b = ['y', 'x', 'y', 'x']
+        check_opcodes(a, b, patience_differ(a, b))
+
+    def test_region_too_large(self):
+        a = ['x', 'y', 'x', 'y']
+        b = ['y', 'x', 'y', 'x']
+        compare(patience_differ(a, b, max_region=1), expected=[('replace', 0, 4, 0, 4)])
+
+    def test_timeout(self):
+        a = ['a', 'b', 'c']
+        b = ['a', 'c', 'b', 'd']
+        compare(patience_differ(a, b, timeout=-1), expected=[
+            ('equal', 0, 1, 0, 1),
+            ('replace', 1, 3, 1, 4),
+        ])
+
+    def test_random(self):
+        chooser = Random(0)
+        for _ in range(200):
+            a = [chooser.choice('abcdefgh') for _ in range(chooser.randrange(20))]
+            b = [chooser.choice('abcdefgh') for _ in range(chooser.randrange(20))]
+            check_opcodes(a, b, patience_differ(a, b))
+
+    def test_same_diff_as_difflib_when_possible(self):
+        x = 'a\nb\nc\nd\ne\nf\ng\nh\ni\nj'
+        y = 'a\nB\nc\nd\ne\nf\ng\nh\nI\nj'
+        compare(diff(x, y, differ=patience_differ), expected=diff(x, y, differ=difflib_differ))
+
+
+class TestDifflibDiffer:
+
+    def test_same_as_unified_diff(self):
+        chooser = Random(0)
+        for _ in range(200):
+            a = [chooser.choice('abcdefgh') for _ in range(chooser.randrange(1, 20))]
+            b = [chooser.choice('abcdefgh') for _ in range(chooser.randrange(1, 20))]
+            expected = '\n'.join(unified_diff(a, b, 'first', 'second', lineterm=''))
+            compare(diff('\n'.join(a), '\n'.join(b)), expected=expected)
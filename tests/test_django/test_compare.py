@@ -2,6 +2,8 @@ from unittest import TestCase
 
 import pytest
 from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from testfixtures import OutputCapture, Replacer
 from testfixtures.comparing import registry
 from .models import SampleModel
@@ -85,3 +87,151 @@ class CompareTests(CompareHelper, TestCase):
                     is_superuser=False
                 ),
                 ignore_fields=['id', 'date_joined'])
+
+    def test_field_plan_cached(self):
+        plans: dict = {}
+        with Replacer() as r:
+            r.replace('testfixtures.django._field_plans', plans)
+            compare(SampleModel(id=1), SampleModel(id=1))
+            compare(SampleModel(id=2), SampleModel(id=2))
+            compare(SampleModel(id=1), SampleModel(id=1), ignore_fields=['id'])
+            compare(SampleModel(id=1), SampleModel(id=1), ignore_fields=('id',))
+        compare(plans, expected={SampleModel: {
+            (frozenset(), False): (
+                SampleModel._meta.get_field('id'),
+                SampleModel._meta.get_field('value'),
+            ),
+            (frozenset({'id'}), False): (
+                SampleModel._meta.get_field('value'),
+            ),
+        }})
+
+    @pytest.mark.django_db
+    def test_queryset_same(self):
+        SampleModel.objects.create(value=1, not_editable=1)
+        SampleModel.objects.create(value=2, not_editable=2)
+        compare(SampleModel.objects.order_by('value'),
+                expected=SampleModel.objects.order_by('id'))
+
+    @pytest.mark.django_db
+    def test_queryset_different_order(self):
+        SampleModel.objects.create(id=1, value=1, not_editable=1)
+        SampleModel.objects.create(id=2, value=2, not_editable=2)
+        self.check_raises(
+            SampleModel.objects.order_by('value'),
+            SampleModel.objects.order_by('-value'),
+            message=(
+                'QuerySet not as expected:\n'
+                '\n'
+                'ordering differs:\n'
+                'first: [1, 2]\n'
+                'second: [2, 1]'
+            ),
+        )
+
+    @pytest.mark.django_db
+    def test_queryset_different_order_and_values(self):
+        SampleModel.objects.create(id=1, value=1, not_editable=1)
+        SampleModel.objects.create(id=2, value=2, not_editable=2)
+        SampleModel.objects.create(id=3, value=3, not_editable=3)
+        self.check_raises(
+            SampleModel.objects.filter(id__lt=3).order_by('id'),
+            SampleModel.objects.order_by('-id'),
+            message=(
+                'QuerySet not as expected:\n'
+                '\n'
+                'same:\n'
+                '[1, 2]\n'
+                '\n'
+                'in second but not first:\n'
+                "3: {'value': 3}\n"
+                '\n'
+                'ordering differs:\n'
+                'first: [1, 2]\n'
+                'second: [2, 1]'
+            ),
+        )
+
+    @pytest.mark.django_db
+    def test_queryset_duplicate_keys(self):
+        SampleModel.objects.create(id=1, value=1, not_editable=1)
+        SampleModel.objects.create(id=2, value=2, not_editable=2)
+        duplicated = SampleModel.objects.all().union(SampleModel.objects.filter(id=2), all=True)
+        self.check_raises(
+            SampleModel.objects.all(),
+            duplicated,
+            message='keys in second are not unique: [2]',
+        )
+
+    @pytest.mark.django_db
+    def test_queryset_diff(self):
+        SampleModel.objects.create(id=1, value=1, not_editable=1)
+        SampleModel.objects.create(id=2, value=2, not_editable=2)
+        SampleModel.objects.create(id=3, value=3, not_editable=3)
+        self.check_raises(
+            SampleModel.objects.filter(id__lt=3),
+            SampleModel.objects.filter(id__gt=1),
+            message=(
+                'QuerySet not as expected:\n'
+                '\n'
+                'same:\n'
+                '[2]\n'
+                '\n'
+                'in first but not second:\n'
+                "1: {'value': 1}\n"
+                '\n'
+                'in second but not first:\n'
+                "3: {'value': 3}"
+            ),
+        )
+
+    @pytest.mark.django_db
+    def test_queryset_ignore_pk(self):
+        SampleModel.objects.create(value=1, not_editable=1)
+        SampleModel.objects.create(value=2, not_editable=2)
+        SampleModel.objects.create(value=1, not_editable=3)
+        self.check_raises(
+            SampleModel.objects.filter(not_editable__lt=3).order_by('id'),
+            SampleModel.objects.filter(not_editable__gt=1).order_by('id'),
+            message=(
+                'QuerySet not as expected:\n'
+                '\n'
+                'values differ:\n'
+                "0: {'value': 1} != {'value': 2}\n"
+                "1: {'value': 2} != {'value': 1}\n"
+                '\n'
+                "While comparing [0]: dict not as expected:\n"
+                '\n'
+                'values differ:\n'
+                "'value': 1 != 2\n"
+                '\n'
+                "While comparing [1]: dict not as expected:\n"
+                '\n'
+                'values differ:\n'
+                "'value': 2 != 1"
+            ),
+            ignore_fields=['id', 'created'],
+        )
+
+    @pytest.mark.django_db
+    def test_queryset_one_query_each(self):
+        SampleModel.objects.create(value=1, not_editable=1)
+        SampleModel.objects.create(value=2, not_editable=2)
+        with CaptureQueriesContext(connection) as queries:
+            compare(SampleModel.objects.all(), SampleModel.objects.all())
+        compare(len(queries), expected=2)
+        compare(queries[0]['sql'], expected=(
+            'SELECT "test_django_samplemodel"."id" AS "id", '
+            '"test_django_samplemodel"."value" AS "value" '
+            'FROM "test_django_samplemodel"'
+        ))
+
+    def test_queryset_different_models(self):
+        self.check_raises(
+            SampleModel.objects.none(),
+            User.objects.none(),
+            message=(
+                "QuerySet of <class 'tests.test_django.models.SampleModel'> != "
+                "QuerySet of <class 'django.contrib.auth.models.User'>"
+            ),
+        )
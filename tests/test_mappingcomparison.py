@@ -1,4 +1,5 @@
-from collections import OrderedDict
+from collections import OrderedDict, defaultdict
+from collections.abc import Mapping
 from textwrap import dedent
 
 from testfixtures import MappingComparison, ShouldRaise, compare
@@ -295,6 +296,53 @@ class TestMappingComparison:
         assert m != []
         check_repr(m, '<MappingComparison(ordered=False, partial=True)(failed)>bad type</>')
 
+    def test_partial_only_looks_up_expected_keys(self):
+        looked_up = []
+
+        class Lookups(Mapping):
+            def __init__(self, data):
+                self.data = data
+            def __getitem__(self, key):
+                looked_up.append(key)
+                return self.data[key]
+            def __iter__(self):
+                return iter(self.data)
+            def __len__(self):
+                return len(self.data)
+            def items(self):
+                raise AssertionError('items() should not be used')
+
+        m = MappingComparison({'a': 1, 'c': 3}, partial=True)
+        assert m == Lookups({'a': 1, 'b': 2, 'c': 3, 'd': 4})
+        compare(looked_up, expected=['a', 'c'])
+        assert m != Lookups({'a': 1, 'b': 2, 'c': 4, 'd': 4})
+        check_repr(m, expected='''
+            <MappingComparison(ordered=False, partial=True)(failed)>
+            ignored:
+            ['b', 'd']
+            
+            same:
+            ['a']
+            
+            values differ:
+            'c': 3 (expected) != 4 (actual)
+            </MappingComparison(ordered=False, partial=True)>
+        ''')
+
+    def test_partial_defaultdict_not_changed(self):
+        actual = defaultdict(int, a=1)
+        assert MappingComparison({'a': 1, 'b': 0}, partial=True) != actual
+        compare(actual, expected={'a': 1})
+
+    def test_partial_ordered_large(self):
+        actual = {i: i for i in range(100_000)}
+        assert MappingComparison({5: 5, 10: 10}, partial=True, ordered=True) == actual
+        m = MappingComparison({10: 10, 5: 5}, partial=True, ordered=True)
+        assert m != actual
+        compare(repr(m).split('\n')[2:4], expected=[
+            'ignored:', '[0,'
+        ])
+
     def test_boolean_return(self):
         m = MappingComparison({'k': 'v'})
         result = m != {'k': 'v'}
@@ -1,11 +1,15 @@
+import sys
+from operator import getitem
+
 import pytest
 
 pytest.importorskip("numpy")
 
 import numpy as np
 
+import testfixtures.comparers
 import testfixtures.numpy
-from testfixtures import ShouldAssert, compare
+from testfixtures import Replace, ShouldAssert, compare, not_there
 
 NUMPY_2_4 = np.lib.NumpyVersion(np.__version__) >= "2.4.0"
 
@@ -234,3 +238,313 @@ def test_masked_strict_requires_exact_floats():
         " DESIRED: array([1.])"
     ):
         compare(m1, expected=m2, strict=True)
+
+
+chunked = {np.ndarray: testfixtures.numpy.compare_ndarray_chunked}
+
+
+def test_chunked_used_for_large_arrays():
+    a1 = np.array([1.0, 2.0, 3.0])
+    a2 = np.array([1.0, 2.5, 3.0])
+    with Replace('testfixtures.numpy.CHUNKED_THRESHOLD', 0):
+        with ShouldAssert(
+            "\n"
+            "Not equal to tolerance rtol=1e-05, atol=1e-08\n"
+            "\n"
+            "Mismatched elements: 1 / 3 (33.3%)\n"
+            "Mismatch at index:\n"
+            " [1]: 2.0 (ACTUAL), 2.5 (DESIRED)\n"
+            "Max absolute difference among violations: 0.5\n"
+            "Max relative difference among violations: 0.2\n"
+            " ACTUAL: array([1., 2., 3.])\n"
+            " DESIRED: array([1. , 2.5, 3. ])"
+        ):
+            compare(a1, expected=a2)
+
+
+def test_chunked_options_passed_through():
+    a1 = np.arange(10)
+    a2 = np.array([0, -1, 2, 3, 4, 5, 6, 7, -1, 9])
+    with Replace('testfixtures.numpy.CHUNKED_THRESHOLD', 0):
+        message = compare(a1, expected=a2, chunk_size=4, mismatches=1, count=False,
+                          raises=False)
+    assert message is not None
+    assert "Mismatched elements: at least 1 / 10\n" in message, message
+
+
+def test_chunked_nat():
+    for dtype in 'datetime64[s]', 'timedelta64[s]':
+        a1 = np.arange(100_000).astype(dtype)
+        a1[::3] = np.datetime64('NaT') if dtype.startswith('datetime') else np.timedelta64('NaT')
+        a2 = a1.copy()
+        compare(a1[:10], expected=a2[:10])
+        with Replace('testfixtures.numpy.CHUNKED_THRESHOLD', 1024):
+            compare(a1, expected=a2)
+            compare(a1, expected=a2, strict=True)
+            a2[1] = a2[0]
+            message = compare(a1, expected=a2, raises=False)
+        assert message is not None
+        compare(message.split('\n')[3:6], expected=[
+            "Mismatched elements: 1 / 100000 (0.001%)",
+            "Mismatch at index:",
+            f" [1]: {a1[1]} (ACTUAL), NaT (DESIRED)",
+        ])
+
+
+def test_chunked_equal():
+    a1 = np.array([1.0 + 1e-9, np.nan, 3.0])
+    a2 = np.array([1.0, np.nan, 3.0])
+    compare(a1, expected=a2, comparers=chunked, chunk_size=2)
+
+
+def test_chunked_strict():
+    a1 = np.array([1.0 + 1e-9, np.nan, 3.0])
+    a2 = np.array([1.0, np.nan, 3.0])
+    compare(a2, expected=a2.copy(), comparers=chunked, chunk_size=2, strict=True)
+    with ShouldAssert(
+        "\n"
+        "Arrays are not equal\n"
+        "\n"
+        "Mismatched elements: 1 / 3 (33.3%)\n"
+        "Mismatch at index:\n"
+        " [0]: 1.000000001 (ACTUAL), 1.0 (DESIRED)\n"
+        "Max absolute difference among violations: 1.00000008e-09\n"
+        "Max relative difference among violations: 1.00000008e-09\n"
+        " ACTUAL: array([ 1., nan,  3.])\n"
+        " DESIRED: array([ 1., nan,  3.])"
+    ):
+        compare(a1, expected=a2, comparers=chunked, chunk_size=2, strict=True)
+
+
+def test_chunked_many_mismatches_across_chunks():
+    a1 = np.arange(12).reshape(3, 4)
+    a2 = a1.copy()
+    a2[0, 3] = a2[1, 1] = a2[2, 0] = a2[2, 3] = -1
+    with ShouldAssert(
+        "\n"
+        "Arrays are not equal\n"
+        "\n"
+        "Mismatched elements: 4 / 12 (33.3%)\n"
+        "First 3 mismatches are at indices:\n"
+        " [0, 3]: 3 (ACTUAL), -1 (DESIRED)\n"
+        " [1, 1]: 5 (ACTUAL), -1 (DESIRED)\n"
+        " [2, 0]: 8 (ACTUAL), -1 (DESIRED)\n"
+        "Max absolute difference among violations: 12\n"
+        "Max relative difference among violations: 12.\n"
+        " ACTUAL: array([[ 0,  1,  2,  3],\n"
+        "       [ 4,  5,  6,  7],\n"
+        "       [ 8,  9, 10, 11]])\n"
+        " DESIRED: array([[ 0,  1,  2, -1],\n"
+        "       [ 4, -1,  6,  7],\n"
+        "       [-1,  9, 10, -1]])"
+    ):
+        compare(a1, expected=a2, comparers=chunked, chunk_size=5, mismatches=3)
+
+
+def test_chunked_stop_when_mismatches_found():
+    a1 = np.arange(10)
+    a2 = a1.copy()
+    a2[[1, 2, 8]] = -1
+    with ShouldAssert(
+        "\n"
+        "Arrays are not equal\n"
+        "\n"
+        "Mismatched elements: at least 2 / 10\n"
+        "Mismatch at indices:\n"
+        " [1]: 1 (ACTUAL), -1 (DESIRED)\n"
+        " [2]: 2 (ACTUAL), -1 (DESIRED)\n"
+        "Max absolute difference among the violations found: 3\n"
+        "Max relative difference among the violations found: 3.\n"
+        " ACTUAL: array([0, 1, 2, 3, 4, 5, 6, 7, 8, 9])\n"
+        " DESIRED: array([ 0, -1, -1,  3,  4,  5,  6,  7, -1,  9])"
+    ):
+        compare(a1, expected=a2, comparers=chunked, chunk_size=4, mismatches=2, count=False)
+
+
+def test_chunked_not_contiguous():
+    a1 = np.arange(12).reshape(3, 4).T
+    a2 = np.asfortranarray(a1.copy())
+    a2[3, 1] = -1
+    assert not a1.flags.c_contiguous
+    with ShouldAssert(
+        "\n"
+        "Arrays are not equal\n"
+        "\n"
+        "Mismatched elements: 1 / 12 (8.33%)\n"
+        "Mismatch at index:\n"
+        " [3, 1]: 7 (ACTUAL), -1 (DESIRED)\n"
+        "Max absolute difference among violations: 8\n"
+        "Max relative difference among violations: 8.\n"
+        " ACTUAL: array([[ 0,  4,  8],\n"
+        "       [ 1,  5,  9],\n"
+        "       [ 2,  6, 10],...\n"
+        " DESIRED: array([[ 0,  4,  8],\n"
+        "       [ 1,  5,  9],\n"
+        "       [ 2,  6, 10],..."
+    ):
+        compare(a1, expected=a2, comparers=chunked, chunk_size=5)
+
+
+def test_chunked_structured():
+    dtype = [('a', 'i4'), ('b', 'f8', (2,))]
+    a1 = np.zeros(3, dtype=dtype)
+    a2 = a1.copy()
+    a2['b'][1, 1] = 1
+    with ShouldAssert(
+        "\n"
+        "Arrays are not equal\n"
+        "\n"
+        "Mismatched elements: 1 / 3 (33.3%)\n"
+        "Mismatched fields: 'b'\n"
+        "Mismatch at index:\n"
+        " [1]: (0, [0.0, 0.0]) (ACTUAL), (0, [0.0, 1.0]) (DESIRED)\n"
+        " ACTUAL: array([(0, [0., 0.]), (0, [0., 0.]), (0, [0., 0.])],\n"
+        "      dtype=[('a', '<i4'), ('b', '<f8', (2,))])\n"
+        " DESIRED: array([(0, [0., 0.]), (0, [0., 1.]), (0, [0., 0.])],\n"
+        "      dtype=[('a', '<i4'), ('b', '<f8', (2,))])"
+    ):
+        compare(a1, expected=a2, comparers=chunked, chunk_size=2)
+
+
+def test_chunked_shape_mismatch():
+    with ShouldAssert(
+        "\n"
+        "Arrays are not equal\n"
+        "\n"
+        "(shapes (2,), (3,) mismatch)\n"
+        " ACTUAL: array([1, 2])\n"
+        " DESIRED: array([1, 2, 3])"
+    ):
+        compare(np.array([1, 2]), expected=np.array([1, 2, 3]), comparers=chunked)
+
+
+def test_chunked_dtype_mismatch():
+    with ShouldAssert(
+        "\n"
+        "Arrays are not equal\n"
+        "\n"
+        "(dtypes int32, int64 mismatch)\n"
+        " ACTUAL: array([1, 2], dtype=int32)\n"
+        " DESIRED: array([1, 2])"
+    ):
+        compare(np.array([1, 2], dtype=np.int32), expected=np.array([1, 2]),
+                comparers=chunked)
+
+
+def test_chunked_memmap(tmp_path):
+    def memmap(name, values):
+        mapped = np.memmap(tmp_path / name, dtype=np.float64, mode='w+', shape=(len(values),))
+        mapped[:] = values
+        return mapped
+
+    m1 = memmap('x', [1.0, 2.0, 3.0, 4.0])
+    m2 = memmap('y', [1.0, 2.0, 3.0, 4.0])
+    compare(m1, expected=m2, comparers=chunked, chunk_size=3)
+    m2[3] = 5.0
+    with ShouldAssert(
+        "\n"
+        "Not equal to tolerance rtol=1e-05, atol=1e-08\n"
+        "\n"
+        "Mismatched elements: 1 / 4 (25%)\n"
+        "Mismatch at index:\n"
+        " [3]: 4.0 (ACTUAL), 5.0 (DESIRED)\n"
+        "Max absolute difference among violations: 1.\n"
+        "Max relative difference among violations: 0.2\n"
+        " ACTUAL: memmap([1., 2., 3., 4.])\n"
+        " DESIRED: memmap([1., 2., 3., 5.])"
+    ):
+        compare(m1, expected=m2, comparers=chunked, chunk_size=3)
+
+
+def test_vectorised_floats_equal():
+    with Replace('testfixtures.comparers.VECTORISE_THRESHOLD', 2):
+        compare([0.5, 1.5, 2.5], expected=[0.5, 1.5, 2.5], strict=True)
+
+
+def test_vectorised_ints_unequal():
+    with Replace('testfixtures.comparers.VECTORISE_THRESHOLD', 2):
+        with ShouldAssert(
+            "sequence not as expected:\n"
+            "\n"
+            "same:\n"
+            "[1, 2]\n"
+            "\n"
+            "expected:\n"
+            "[3, 4]\n"
+            "\n"
+            "actual:\n"
+            "[-3, 4, 5]"
+        ):
+            compare([1, 2, -3, 4, 5], expected=[1, 2, 3, 4])
+
+
+def test_vectorised_nan():
+    nan = float('nan')
+    with Replace('testfixtures.comparers.VECTORISE_THRESHOLD', 2):
+        with ShouldAssert(
+            "sequence not as expected:\n"
+            "\n"
+            "same:\n"
+            "[1.0]\n"
+            "\n"
+            "expected:\n"
+            "[nan, 2.0]\n"
+            "\n"
+            "actual:\n"
+            "[nan, 2.0]"
+        ):
+            compare([1.0, nan, 2.0], expected=[1.0, nan, 2.0], ignore_eq=True)
+
+
+def test_vectorised_dict_values():
+    with Replace('testfixtures.comparers.VECTORISE_THRESHOLD', 2):
+        compare({'a': 1.0, 'b': 2.0}, expected={'b': 2.0, 'a': 1.0}, strict=True)
+        with ShouldAssert(
+            "dict not as expected:\n"
+            "\n"
+            "same:\n"
+            "['a', 'c']\n"
+            "\n"
+            "values differ:\n"
+            "'b': 2.0 (expected) != 2.5 (actual)"
+        ):
+            compare({'a': 1.0, 'b': 2.5, 'c': 3.0}, expected={'c': 3.0, 'b': 2.0, 'a': 1.0},
+                    strict=True)
+
+
+def test_vectorised_big_ints():
+    with Replace('testfixtures.comparers.VECTORISE_THRESHOLD', 2):
+        compare([2**64, 2**65], expected=[2**64, 2**65], strict=True)
+        with ShouldAssert(
+            "sequence not as expected:\n"
+            "\n"
+            "same:\n"
+            "[18446744073709551616]\n"
+            "\n"
+            "expected:\n"
+            "[36893488147419103232]\n"
+            "\n"
+            "actual:\n"
+            "[1]"
+        ):
+            compare([2**64, 1], expected=[2**64, 2**65], strict=True)
+
+
+def test_numeric_differences():
+    differences = testfixtures.numpy._numeric_differences
+    compare(differences([1, 2, 3], [1, 5, 3, 4]).tolist(), expected=[1])
+    compare(differences([1.0, 2.0], [1.0, 2.0]).tolist(), expected=[])
+    compare(differences([1, 2.0], [1, 2.0]), expected=None)
+    compare(differences([True, False], [True, True]), expected=None)
+    compare(differences([1, 2], [1.0, 2.0]), expected=None)
+    compare(differences([], []), expected=None)
+
+
+def test_common_values():
+    common_values = testfixtures.comparers._common_values
+    with Replace('testfixtures.comparers.VECTORISE_THRESHOLD', 2):
+        compare(common_values({'a': 1, 'b': 2}, {'b': 3, 'a': 4}),
+                expected=(['a', 'b'], (1, 2), (4, 3)))
+        compare(common_values({'a': 'x', 'b': 'y'}, {'a': 'x', 'b': 'y'}), expected=None)
+        with Replace(sys.modules, not_there, name='numpy', accessor=getitem):
+            compare(common_values({'a': 1, 'b': 2}, {'a': 1, 'b': 2}), expected=None)
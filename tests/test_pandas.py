@@ -5,7 +5,7 @@ pytest.importorskip("pandas")
 import pandas as pd
 
 import testfixtures.pandas
-from testfixtures import ShouldAssert, compare
+from testfixtures import Replace, ShouldAssert, compare
 
 
 def test_importable():
@@ -79,3 +79,209 @@ def test_strict_exact_floats_compare_equal():
     df1 = pd.DataFrame({"x": [1.0, 2.0]})
     df2 = pd.DataFrame({"x": [1.0, 2.0]})
     compare(df1, expected=df2, strict=True)
+
+
+def test_equal_series():
+    compare(pd.Series([1, 2], name="a"), expected=pd.Series([1, 2], name="a"))
+
+
+def test_unequal_series():
+    with ShouldAssert(
+        "Series are different\n"
+        "\n"
+        "Series values are different (50.0 %)\n"
+        "[index]: [0, 1]\n"
+        "[left]:  [1, 3]\n"
+        "[right]: [1, 2]\n"
+        "At positional index 1, first diff: 3 != 2"
+    ):
+        compare(pd.Series([1, 2]), expected=pd.Series([1, 3]))
+
+
+def test_series_strict_requires_exact_floats():
+    s1 = pd.Series([1.0 + 1e-9])
+    s2 = pd.Series([1.0])
+    compare(s1, expected=s2)
+    with ShouldAssert(
+        "Series are different\n"
+        "\n"
+        "Series values are different (100.0 %)\n"
+        "[index]: [0]\n"
+        "[left]:  [1.0]\n"
+        "[right]: [1.000000001]"
+    ):
+        compare(s1, expected=s2, strict=True)
+
+
+def test_unequal_index():
+    with ShouldAssert(
+        "Index are different\n"
+        "\n"
+        "Index values are different (50.0 %)\n"
+        "[left]:  Index([1, 3], dtype='int64')\n"
+        "[right]: Index([1, 2], dtype='int64')\n"
+        "At positional index 1, first diff: 3 != 2"
+    ):
+        compare(pd.Index([1, 2]), expected=pd.Index([1, 3]))
+
+
+def test_index_in_dict():
+    compare({"index": pd.Index([1, 2])}, expected={"index": pd.Index([1, 2])})
+
+
+def test_keyed_equal_in_any_order():
+    df1 = pd.DataFrame({"id": [1, 2, 3], "a": [1.0, 2.0, float("nan")]})
+    df2 = pd.DataFrame({"id": [3, 1, 2], "a": [float("nan"), 1.0, 2.0 + 1e-9]}, index=[7, 8, 9])
+    compare(df1, expected=df2, key_columns="id")
+
+
+def test_keyed_differences():
+    df1 = pd.DataFrame({"id": [1, 2, 3, 4], "a": [1, 2, 3, 4], "b": ["w", "x", "y", "z"]})
+    df2 = pd.DataFrame({"id": [5, 3, 2, 1], "a": [5, 3, 20, 10], "b": ["v", "Y", "x", "w"]})
+    with ShouldAssert(
+        "DataFrame not as expected:\n"
+        "\n"
+        "keys in expected but not actual:\n"
+        "[5]\n"
+        "\n"
+        "keys in actual but not expected:\n"
+        "[4]\n"
+        "\n"
+        "rows that differ: 3 of 3\n"
+        "'a': 2\n"
+        "'b': 1\n"
+        "\n"
+        "first rows that differ:\n"
+        "1: 'a': 10 (expected) != 1 (actual)\n"
+        "2: 'a': 20 (expected) != 2 (actual)\n"
+        "3: 'b': 'Y' (expected) != 'y' (actual)"
+    ):
+        compare(df1, expected=df2, key_columns=["id"])
+
+
+def test_keyed_many_differences():
+    df1 = pd.DataFrame({"id": range(10), "a": range(10)})
+    df2 = pd.DataFrame({"id": range(3, 13), "a": range(3, 13)})
+    with Replace("testfixtures.tables.KEYS_SHOWN", 2):
+        with ShouldAssert(
+            "DataFrame not as expected:\n"
+            "\n"
+            "keys in first but not second:\n"
+            "[0, 1, <1 more>]\n"
+            "\n"
+            "keys in second but not first:\n"
+            "[10, 11, <1 more>]"
+        ):
+            compare(df1, df2, key_columns="id")
+
+
+def test_keyed_multiple_columns():
+    df1 = pd.DataFrame({"k1": [1, 1], "k2": ["a", "b"], "v": [1.0, 2.0]})
+    df2 = pd.DataFrame({"k1": [1, 1], "k2": ["b", "a"], "v": [2.5, 1.0]})
+    with ShouldAssert(
+        "DataFrame not as expected:\n"
+        "\n"
+        "rows that differ: 1 of 2\n"
+        "'v': 1\n"
+        "\n"
+        "first rows that differ:\n"
+        "(1, 'b'): 'v': 2.0 != 2.5"
+    ):
+        compare(df1, df2, key_columns=["k1", "k2"])
+
+
+def test_keyed_strict_requires_exact_floats():
+    df1 = pd.DataFrame({"id": [1], "x": [1.0]})
+    df2 = pd.DataFrame({"id": [1], "x": [1.0 + 1e-9]})
+    with ShouldAssert(
+        "DataFrame not as expected:\n"
+        "\n"
+        "rows that differ: 1 of 1\n"
+        "'x': 1\n"
+        "\n"
+        "first rows that differ:\n"
+        "1: 'x': 1.0 != 1.000000001"
+    ):
+        compare(df1, df2, key_columns="id", strict=True)
+
+
+def test_keyed_missing_values():
+    df1 = pd.DataFrame({"id": [1, 2, 3], "a": pd.array([1, None, 3], dtype="Int64")})
+    df2 = pd.DataFrame({"id": [1, 2, 3], "a": pd.array([1, None, None], dtype="Int64")})
+    with ShouldAssert(
+        "DataFrame not as expected:\n"
+        "\n"
+        "rows that differ: 1 of 3\n"
+        "'a': 1\n"
+        "\n"
+        "first rows that differ:\n"
+        "3: 'a': 3 != <NA>"
+    ):
+        compare(df1, df2, key_columns="id")
+
+
+def test_keyed_columns_differ():
+    df1 = pd.DataFrame({"id": [1], "a": [1], "b": [1]})
+    df2 = pd.DataFrame({"id": [1], "a": [1.0], "c": [1]})
+    with ShouldAssert(
+        "DataFrame not as expected:\n"
+        "\n"
+        "columns in first but not second:\n"
+        "['b']\n"
+        "\n"
+        "columns in second but not first:\n"
+        "['c']\n"
+        "\n"
+        "dtypes differ:\n"
+        "'a': int64 != float64"
+    ):
+        compare(df1, df2, key_columns="id")
+
+
+def test_keyed_key_column_missing():
+    df1 = pd.DataFrame({"id": [1], "a": [1]})
+    df2 = pd.DataFrame({"a": [1]})
+    with ShouldAssert(
+        "DataFrame not as expected:\n"
+        "\n"
+        "key columns missing from second:\n"
+        "['id']\n"
+        "\n"
+        "columns in first but not second:\n"
+        "['id']"
+    ):
+        compare(df1, df2, key_columns="id")
+
+
+def test_keyed_keys_not_unique():
+    df1 = pd.DataFrame({"id": [1, 2, 1, 2, 3], "a": range(5)})
+    with ShouldAssert("keys in expected are not unique: [1, 2]"):
+        compare(df1.iloc[:2], expected=df1, key_columns="id")
+
+
+def test_keyed_stop_at_first_chunk_with_differences():
+    df1 = pd.DataFrame({"id": range(6), "a": [0, 1, 2, 3, 4, 5]})
+    df2 = pd.DataFrame({"id": range(6), "a": [0, 0, 2, 3, 0, 0]})
+    with Replace("testfixtures.pandas.CHUNK_ROWS", 3):
+        with ShouldAssert(
+            "DataFrame not as expected:\n"
+            "\n"
+            "rows that differ: at least 1\n"
+            "'a': 1\n"
+            "\n"
+            "first rows that differ:\n"
+            "1: 'a': 1 != 0"
+        ):
+            compare(df1, df2, key_columns="id", count=False)
+        with ShouldAssert(
+            "DataFrame not as expected:\n"
+            "\n"
+            "rows that differ: 3 of 6\n"
+            "'a': 3\n"
+            "\n"
+            "first rows that differ:\n"
+            "1: 'a': 1 != 0\n"
+            "4: 'a': 4 != 0\n"
+            "5: 'a': 5 != 0"
+        ):
+            compare(df1, df2, key_columns="id")
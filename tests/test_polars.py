@@ -5,7 +5,7 @@ pytest.importorskip("polars")
 import polars as pl
 
 import testfixtures.polars
-from testfixtures import ShouldAssert, compare
+from testfixtures import Replace, ShouldAssert, compare
 
 
 def test_importable():
@@ -109,3 +109,222 @@ def test_strict_exact_floats_compare_equal():
     df1 = pl.DataFrame({"x": [1.0, 2.0]})
     df2 = pl.DataFrame({"x": [1.0, 2.0]})
     compare(df1, expected=df2, strict=True)
+
+
+def test_equal_series():
+    compare(pl.Series("a", [1, 2]), expected=pl.Series("a", [1, 2]))
+
+
+def test_unequal_series():
+    with ShouldAssert(
+        "Series are different (exact value mismatch)\n"
+        "[left]: shape: (2,)\n"
+        "Series: 'a' [i64]\n"
+        "[\n"
+        "\t1\n"
+        "\t3\n"
+        "]\n"
+        "[right]: shape: (2,)\n"
+        "Series: 'a' [i64]\n"
+        "[\n"
+        "\t1\n"
+        "\t2\n"
+        "]"
+    ):
+        compare(pl.Series("a", [1, 2]), expected=pl.Series("a", [1, 3]))
+
+
+def test_equal_lazyframes():
+    lf1 = pl.LazyFrame({"a": [1, 2], "b": [1.0, float("nan")]})
+    lf2 = pl.LazyFrame({"a": [1, 2], "b": [1.0 + 1e-9, float("nan")]})
+    compare(lf1, expected=lf2)
+
+
+def test_unequal_lazyframes():
+    lf1 = pl.LazyFrame({"a": [1, 2, 3], "b": ["x", "y", None]})
+    lf2 = pl.LazyFrame({"a": [1, 4, 5], "b": ["x", "y", "z"]})
+    with ShouldAssert(
+        "LazyFrame not as expected:\n"
+        "\n"
+        "rows that differ: 2 of 3\n"
+        "'a': 2\n"
+        "'b': 1\n"
+        "\n"
+        "first rows that differ:\n"
+        "1: 'a': 4 (expected) != 2 (actual)\n"
+        "2: 'a': 5 (expected) != 3 (actual), 'b': 'z' (expected) != None (actual)"
+    ):
+        compare(lf1, expected=lf2)
+
+
+def test_lazyframe_row_counts_differ():
+    lf1 = pl.LazyFrame({"a": [1, 2, 3]})
+    lf2 = pl.LazyFrame({"a": [1, 4]})
+    with ShouldAssert(
+        "LazyFrame not as expected:\n"
+        "\n"
+        "row counts differ: 3 != 2\n"
+        "\n"
+        "rows that differ: 1 of 2\n"
+        "'a': 1\n"
+        "\n"
+        "first rows that differ:\n"
+        "1: 'a': 2 != 4"
+    ):
+        compare(lf1, lf2)
+
+
+def test_lazyframe_columns_differ():
+    lf1 = pl.LazyFrame({"a": [1], "b": [1]})
+    lf2 = pl.LazyFrame({"a": [1.0], "c": [1]})
+    with ShouldAssert(
+        "LazyFrame not as expected:\n"
+        "\n"
+        "columns in first but not second:\n"
+        "['b']\n"
+        "\n"
+        "columns in second but not first:\n"
+        "['c']\n"
+        "\n"
+        "dtypes differ:\n"
+        "'a': Int64 != Float64"
+    ):
+        compare(lf1, lf2)
+
+
+def test_lazyframe_floats():
+    inf = float("inf")
+    lf1 = pl.LazyFrame({"x": [1.0, inf, 1.0, None, 2.0]})
+    lf2 = pl.LazyFrame({"x": [1.0 + 1e-9, -inf, inf, None, None]})
+    with ShouldAssert(
+        "LazyFrame not as expected:\n"
+        "\n"
+        "rows that differ: 3 of 5\n"
+        "'x': 3\n"
+        "\n"
+        "first rows that differ:\n"
+        "1: 'x': inf != -inf\n"
+        "2: 'x': 1.0 != inf\n"
+        "4: 'x': 2.0 != None"
+    ):
+        compare(lf1, lf2)
+
+
+def test_lazyframe_strict_requires_exact_floats():
+    lf1 = pl.LazyFrame({"x": [1.0]})
+    lf2 = pl.LazyFrame({"x": [1.0 + 1e-9]})
+    with ShouldAssert(
+        "LazyFrame not as expected:\n"
+        "\n"
+        "rows that differ: 1 of 1\n"
+        "'x': 1\n"
+        "\n"
+        "first rows that differ:\n"
+        "0: 'x': 1.0 != 1.000000001"
+    ):
+        compare(lf1, lf2, strict=True)
+
+
+def test_lazyframe_keyed_equal_in_any_order():
+    lf1 = pl.LazyFrame({"id": [1, 2, 3], "a": [1.0, 2.0, 3.0]})
+    lf2 = pl.LazyFrame({"id": [3, 1, 2], "a": [3.0, 1.0, 2.0]})
+    compare(lf1, expected=lf2, key_columns="id")
+
+
+def test_lazyframe_keyed_differences():
+    lf1 = pl.LazyFrame({"id": [1, 2, 3, 4], "a": [1, 2, 3, 4], "b": ["w", "x", "y", "z"]})
+    lf2 = pl.LazyFrame({"id": [5, 3, 2, 1], "a": [5, 3, 20, 10], "b": ["v", "Y", "x", "w"]})
+    with ShouldAssert(
+        "LazyFrame not as expected:\n"
+        "\n"
+        "keys in expected but not actual:\n"
+        "[5]\n"
+        "\n"
+        "keys in actual but not expected:\n"
+        "[4]\n"
+        "\n"
+        "rows that differ: 3 of 3\n"
+        "'a': 2\n"
+        "'b': 1\n"
+        "\n"
+        "first rows that differ:\n"
+        "1: 'a': 10 (expected) != 1 (actual)\n"
+        "2: 'a': 20 (expected) != 2 (actual)\n"
+        "3: 'b': 'Y' (expected) != 'y' (actual)"
+    ):
+        compare(lf1, expected=lf2, key_columns=["id"])
+
+
+def test_lazyframe_keyed_many_differences():
+    lf1 = pl.LazyFrame({"id": range(10), "a": range(10)})
+    lf2 = pl.LazyFrame({"id": range(3, 13), "a": [0] + list(range(4, 13))})
+    with Replace("testfixtures.tables.KEYS_SHOWN", 2):
+        with ShouldAssert(
+            "LazyFrame not as expected:\n"
+            "\n"
+            "keys in first but not second:\n"
+            "[0, 1, <1 more>]\n"
+            "\n"
+            "keys in second but not first:\n"
+            "[10, 11, <1 more>]\n"
+            "\n"
+            "rows that differ: 1 of 7\n"
+            "'a': 1\n"
+            "\n"
+            "first rows that differ:\n"
+            "3: 'a': 3 != 0"
+        ):
+            compare(lf1, lf2, key_columns="id")
+
+
+def test_lazyframe_keyed_multiple_columns():
+    lf1 = pl.LazyFrame({"k1": [1, 1], "k2": ["a", None], "v": [1.0, 2.0]})
+    lf2 = pl.LazyFrame({"k1": [1, 1], "k2": [None, "a"], "v": [2.5, 1.0]})
+    with ShouldAssert(
+        "LazyFrame not as expected:\n"
+        "\n"
+        "rows that differ: 1 of 2\n"
+        "'v': 1\n"
+        "\n"
+        "first rows that differ:\n"
+        "(1, None): 'v': 2.0 != 2.5"
+    ):
+        compare(lf1, lf2, key_columns=["k1", "k2"])
+
+
+def test_lazyframe_key_column_missing():
+    lf1 = pl.LazyFrame({"id": [1], "a": [1]})
+    lf2 = pl.LazyFrame({"a": [1]})
+    with ShouldAssert(
+        "LazyFrame not as expected:\n"
+        "\n"
+        "key columns missing from second:\n"
+        "['id']\n"
+        "\n"
+        "columns in first but not second:\n"
+        "['id']"
+    ):
+        compare(lf1, lf2, key_columns="id")
+
+
+def test_lazyframe_keys_not_unique():
+    lf1 = pl.LazyFrame({"id": [1, 2], "a": [1, 2]})
+    lf2 = pl.LazyFrame({"id": [2, 1, 2, 1, 3], "a": range(5)})
+    with ShouldAssert("keys in expected are not unique: [1, 2]"):
+        compare(lf1, expected=lf2, key_columns="id")
+
+
+def test_lazyframes_in_dict():
+    lf1 = pl.LazyFrame({"a": [1]})
+    lf2 = pl.LazyFrame({"a": [2]})
+    message = compare({"foo": lf1}, expected={"foo": lf2}, raises=False)
+    assert message is not None
+    assert message.endswith(
+        "While comparing ['foo']: LazyFrame not as expected:\n"
+        "\n"
+        "rows that differ: 1 of 1\n"
+        "'a': 1\n"
+        "\n"
+        "first rows that differ:\n"
+        "0: 'a': 2 (expected) != 1 (actual)"
+    ), message
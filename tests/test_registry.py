@@ -0,0 +1,195 @@
+import gc
+import sys
+from operator import getitem
+from subprocess import check_output
+from types import ModuleType
+
+from testfixtures import Replace, ShouldAssert, ShouldRaise, ShouldWarn, compare, register
+from testfixtures.comparers import compare_object, compare_with_type
+from testfixtures.comparing import Registry, registry, _register_deferred
+from testfixtures.mock import Mock
+
+
+class Thing:
+    pass
+
+
+def compare_thing(x, y, context):
+    return 'custom'
+
+
+def fake_module(name):
+    return Replace(sys.modules, ModuleType(name), name=name, accessor=getitem, strict=False)
+
+
+class TestDeferredRegistration:
+
+    def test_not_bound_until_imported(self):
+        registrations = []
+        registry_ = Registry.initial()
+        registry_.defer('testfixtures_unimported', registrations.append)
+        registry_.resolve_deferred()
+        compare(registrations, expected=[])
+        with fake_module('testfixtures_unimported'):
+            registry_.resolve_deferred()
+            registry_.resolve_deferred()
+        compare(registrations, expected=[registry_])
+        compare(registry_.deferred, expected={})
+
+    def test_import_error_skipped(self):
+        def registration(registry_):
+            raise ImportError('broken')
+
+        registry_ = Registry.initial()
+        registry_.defer('testfixtures_unimported', registration)
+        with fake_module('testfixtures_unimported'):
+            registry_.resolve_deferred()
+        compare(registry_.deferred, expected={})
+
+    def test_failure_warns(self):
+        def registration(registry_):
+            raise RuntimeError('broken')
+
+        with registry() as registry_:
+            registry_.defer('testfixtures_unimported', registration)
+            with fake_module('testfixtures_unimported'):
+                with ShouldWarn(UserWarning(
+                    "Could not register comparers for testfixtures_unimported: "
+                    "RuntimeError('broken')"
+                )):
+                    compare(1, expected=1)
+                compare(2, expected=2)
+            compare(registry_.deferred, expected={})
+
+    def test_bound_on_first_compare(self):
+        def registration(registry_):
+            _register_deferred(registry_, Thing, compare_thing)
+
+        with registry() as registry_:
+            registry_.defer('testfixtures_unimported', registration)
+            compare(Thing, expected=Thing)
+            assert Thing not in registry_.comparers
+            with fake_module('testfixtures_unimported'):
+                with ShouldAssert('custom'):
+                    compare(Thing(), Thing())
+            assert Thing in registry_.ignore_eq_types
+
+    def test_explicit_registration_not_clobbered(self):
+        def registration(registry_):
+            _register_deferred(registry_, Thing, compare_object)
+
+        with registry() as registry_:
+            registry_.defer('testfixtures_unimported', registration)
+            register(Thing, compare_thing)
+            with fake_module('testfixtures_unimported'):
+                with ShouldAssert('custom'):
+                    compare(Thing(), Thing())
+
+    def test_import_does_not_import_optional_libraries(self):
+        output = check_output([sys.executable, '-c', (
+            'import sys, testfixtures\n'
+            'optional = "numpy", "pandas", "polars", "pyarrow", "django"\n'
+            'print([m for m in optional if m in sys.modules])'
+        )])
+        compare(output.strip(), expected=b'[]')
+
+
+class TestDispatchCache:
+
+    def test_repeat_lookup(self):
+        registry_ = Registry.initial()
+        assert registry_.lookup(Thing(), Thing(), False) is compare_object
+        compare(registry_._dispatch[Thing], expected={Thing: compare_object})
+        assert registry_.lookup(Thing(), Thing(), False) is compare_object
+
+    def test_strict_type_mismatch_not_cached(self):
+        registry_ = Registry.initial()
+        assert registry_.lookup(Thing(), 1, True) is compare_with_type
+        compare(dict(registry_._dispatch), expected={})
+
+    def test_classes_not_kept_alive(self):
+        class Local:
+            pass
+
+        registry_ = Registry.initial()
+        registry_.lookup(Local(), Local(), False)
+        registry_.lookup(Thing(), Local(), False)
+        compare(len(registry_._dispatch), expected=2)
+        del Local
+        gc.collect()
+        compare(list(registry_._dispatch), expected=[Thing])
+        compare(dict(registry_._dispatch[Thing]), expected={})
+
+    def test_setitem_clears(self):
+        registry_ = Registry.initial()
+        registry_.lookup(Thing(), Thing(), False)
+        registry_[Thing] = compare_thing
+        assert registry_.lookup(Thing(), Thing(), False) is compare_thing
+
+    def test_register_clears(self):
+        with registry() as registry_:
+            registry_.lookup(Thing(), Thing(), False)
+            register(Thing, compare_thing)
+            assert registry_.lookup(Thing(), Thing(), False) is compare_thing
+
+    def test_overlay_not_shared(self):
+        registry_ = Registry.initial()
+        registry_.lookup(Thing(), Thing(), False)
+        overlay = registry_.overlay_with({Thing: compare_thing})
+        assert overlay.lookup(Thing(), Thing(), False) is compare_thing
+        assert registry_.lookup(Thing(), Thing(), False) is compare_object
+
+
+class SubThing(Thing):
+    pass
+
+
+def compare_thing_with_option(x, y, context, thing_option=None):
+    return f'option: {thing_option}'
+
+
+class TestOverlay:
+
+    def test_only_holds_overlaid_comparers(self):
+        registry_ = Registry.initial()
+        overlay = registry_.overlay_with({Thing: compare_thing})
+        compare(overlay.comparers, expected={Thing: compare_thing})
+        assert overlay.parent is registry_
+        assert overlay.ignore_eq_types is registry_.ignore_eq_types
+        assert Thing not in registry_.comparers
+
+    def test_reads_through(self):
+        registry_ = Registry.initial()
+        overlay = registry_.overlay_with({Thing: compare_thing})
+        assert overlay.lookup([], [], False) is registry_.comparers[list]
+        assert overlay.option_names(compare_object) == {'ignore_attributes'}
+
+    def test_most_specific_type_wins_across_layers(self):
+        registry_ = Registry.initial({SubThing: compare_thing_with_option})
+        overlay = registry_.overlay_with({Thing: compare_thing})
+        assert overlay.lookup(SubThing(), SubThing(), False) is compare_thing_with_option
+        assert overlay.lookup(Thing(), Thing(), False) is compare_thing
+
+    def test_options(self):
+        registry_ = Registry.initial()
+        overlay = registry_.overlay_with({Thing: compare_thing_with_option})
+        compare(overlay.invalid_options(['thing_option', 'ignore_attributes', 'foo']),
+                expected={'foo'})
+        compare(registry_.invalid_options(['thing_option']), expected={'thing_option'})
+
+    def test_option_passed_through_compare(self):
+        with ShouldAssert('option: 1'):
+            compare(Thing(), Thing(), comparers={Thing: compare_thing_with_option},
+                    thing_option=1)
+
+    def test_invalid_option_through_compare(self):
+        with ShouldRaise(TypeError('The following options are not valid: foo')):
+            compare(Thing(), Thing(), comparers={Thing: compare_thing}, foo=1)
+
+    def test_signature_cached(self):
+        def comparer(x, y, context, an_option=None):
+            pass
+        Registry.initial().overlay_with({Thing: comparer})
+        with Replace('testfixtures.comparing.signature', Mock(side_effect=AssertionError)):
+            overlay = Registry.initial().overlay_with({Thing: comparer})
+        compare(overlay.options_for, expected={comparer: {'an_option'}})
@@ -1,4 +1,6 @@
-from testfixtures import SequenceComparison, generator, compare, Subset, Permutation
+from testfixtures import (
+    Comparison, RangeComparison, SequenceComparison, generator, compare, Subset, Permutation
+)
 
 
 class TestSequenceComparison:
@@ -350,6 +352,62 @@ class TestSequenceComparison:
         s = SequenceComparison(partial=True)
         assert s != object()
 
+    def test_equal_values_of_different_types(self):
+        s = SequenceComparison(1, 1.0, True, ordered=False)
+        assert s == (True, 1, 1.0)
+
+    def test_matches_first_equal_value_of_any_type(self):
+        s = SequenceComparison(1, ordered=False, partial=True)
+        assert s == ('a', True, 1)
+        compare(s.checked_indices, expected={1})
+
+    def test_equal_unhashable_unordered(self):
+        s = SequenceComparison([1, {'a': (2, 3)}], {'x': [1], 'y': {1}}, ordered=False)
+        assert s == ({'y': frozenset([1]), 'x': [1.0]}, [1, {'a': (2, 3)}])
+
+    def test_unequal_containers_of_different_types(self):
+        s = SequenceComparison((1,), [2], {3}, ordered=False, partial=True)
+        assert s != ([1], (2,), frozenset([3]))
+        compare(repr(s), expected=(
+            '\n'
+            '<SequenceComparison(ordered=False, partial=True)(failed)>\n'
+            'ignored:\n'
+            '[[1], (2,)]\n\n'
+            'same:\n'
+            '[frozenset({3})]\n\n'
+            'in expected but not actual:\n'
+            '[(1,), [2]]\n'
+            '</SequenceComparison(ordered=False, partial=True)>'
+        ))
+
+    def test_nan_matches_itself_only(self):
+        nan = float('nan')
+        s = SequenceComparison(nan, float('nan'), ordered=False, partial=True)
+        assert s != [float('nan'), nan]
+        compare(s.checked_indices, expected={1})
+
+    def test_matchers_in_expected(self):
+        s = SequenceComparison(
+            RangeComparison(1, 5), 7, RangeComparison(1, 5), ordered=False
+        )
+        assert s == [7, 3, 4]
+        compare(s.checked_indices, expected={0, 1, 2})
+
+    def test_matchers_in_actual(self):
+        s = SequenceComparison(1, 2, 3)
+        assert s == [1, Comparison(int, partial=True), 3]
+
+    def test_ordered_with_unkeyed_items(self):
+        s = SequenceComparison([1], 2, [1], 2, partial=True)
+        assert s == [2, [1], 2, {1}, [1], 2]
+        compare(s.checked_indices, expected={1, 2, 4, 5})
+
+    def test_large_unordered(self):
+        # each expected item is looked up, rather than searched for:
+        expected = [{'id': i, 'tags': ['x']} for i in range(50_000)]
+        assert SequenceComparison(*expected, ordered=False) == expected[::-1]
+        assert SequenceComparison(*expected[::2], ordered=False, partial=True) == expected
+
 
 class TestSubset:
 